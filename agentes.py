@@ -0,0 +1,152 @@
+# agentes.py
+# População de robôs investidores no mesmo Mercado, guardada como estrutura de arrays:
+# saldos em um vetor e posições em matrizes agente x ação, para que o dia de
+# negociação de todos os agentes seja um punhado de operações NumPy.
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: só a população de agentes depende dele
+    np = None
+
+ESTRATEGIAS_AGENTES = ['aleatoria', 'tendencia', 'reversao', 'comprar_e_segurar']
+
+
+class PopulacaoAgentes:
+    """Milhares de agentes negociando as ações de `mercado` (na ordem de mercado.acoes).
+
+    A listagem de ações deve ficar fixa enquanto a população existir. `impacto` é a
+    variação relativa de preço por ação de saldo líquido (compras - vendas) no dia;
+    com 0 os agentes não movem o mercado.
+    """
+
+    def __init__(self, mercado, num_agentes, saldo_inicial=1000.0, estrategias=None, seed=None, impacto=0.0):
+        if np is None:
+            raise RuntimeError("A população de agentes requer NumPy instalado.")
+        self.mercado = mercado
+        self.rng = np.random.default_rng(seed)
+        self.num_agentes = num_agentes
+        self.num_acoes = len(mercado)
+        self.saldo_inicial = saldo_inicial
+        self.impacto = impacto
+        nomes = ESTRATEGIAS_AGENTES if estrategias is None else list(estrategias)
+        for nome in nomes:
+            if nome not in ESTRATEGIAS_AGENTES:
+                raise ValueError(f"Estratégia desconhecida: {nome}")
+        # Estratégia de cada agente (código em ESTRATEGIAS_AGENTES), distribuída em rodízio
+        codigos = np.array([ESTRATEGIAS_AGENTES.index(n) for n in nomes], dtype=np.int8)
+        self.estrategia = codigos[np.arange(num_agentes) % len(codigos)]
+        self.saldo = np.full(num_agentes, saldo_inicial, dtype=np.float64)
+        self.quantidades = np.zeros((num_agentes, self.num_acoes), dtype=np.int64)
+        self.custo = np.zeros((num_agentes, self.num_acoes), dtype=np.float64)  # Σ qtd x preço pago
+        self.lucro_realizado = np.zeros(num_agentes, dtype=np.float64)
+        self.dias = 0
+        self._precos_anteriores = self.precos().copy()   # No modo vetorizado precos() é a visão do motor
+
+    # --- PREÇOS ---
+    def precos(self):
+        if len(self.mercado) != self.num_acoes:
+            raise RuntimeError("A listagem do mercado mudou depois de criar a população.")
+        if self.mercado.motor is not None:
+            return self.mercado.motor.precos
+        return np.fromiter((acao.preco_atual for acao in self.mercado.acoes), dtype=np.float64, count=self.num_acoes)
+
+    # --- DECISÕES ---
+    # Cada agente escolhe no máximo uma ação e uma quantidade por dia: positiva para
+    # comprar, negativa para vender. Tudo é calculado para a população inteira de uma vez.
+    def _decidir(self, precos):
+        n = self.num_agentes
+        alvo = self.rng.integers(0, self.num_acoes, size=n)
+        ordem = np.zeros(n, dtype=np.int64)
+        retorno = precos / self._precos_anteriores - 1.0
+        retorno_alvo = retorno[alvo]
+        segurando = self.quantidades[np.arange(n), alvo]
+
+        aleatoria = self.estrategia == ESTRATEGIAS_AGENTES.index('aleatoria')
+        lado = np.where(self.rng.random(n) < 0.5, 1, -1)
+        ordem[aleatoria] = lado[aleatoria]
+
+        # Tendência: compra o que subiu no último dia e vende a posição do que caiu
+        tendencia = self.estrategia == ESTRATEGIAS_AGENTES.index('tendencia')
+        ordem[tendencia & (retorno_alvo > 0)] = 1
+        vende = tendencia & (retorno_alvo < 0)
+        ordem[vende] = -segurando[vende]
+
+        # Reversão à média: o contrário da tendência
+        reversao = self.estrategia == ESTRATEGIAS_AGENTES.index('reversao')
+        ordem[reversao & (retorno_alvo < 0)] = 1
+        vende = reversao & (retorno_alvo > 0)
+        ordem[vende] = -segurando[vende]
+
+        # Comprar e segurar: no primeiro dia gasta um terço do saldo numa ação e não mexe mais
+        if self.dias == 0:
+            segurar = self.estrategia == ESTRATEGIAS_AGENTES.index('comprar_e_segurar')
+            ordem[segurar] = (self.saldo[segurar] / 3 // precos[alvo[segurar]]).astype(np.int64)
+        return alvo, ordem
+
+    # --- EXECUÇÃO EM LOTE ---
+    def negociar(self):
+        """Um dia de negociação de todos os agentes ao preço atual; retorna o saldo líquido por ação."""
+        precos = self.precos()
+        alvo, ordem = self._decidir(precos)
+        agentes = np.arange(self.num_agentes)
+        preco_alvo = precos[alvo]
+        segurando = self.quantidades[agentes, alvo]
+
+        # Compras sem saldo e vendas além da posição são cortadas
+        compra = (ordem > 0) & (ordem * preco_alvo <= self.saldo)
+        venda = ordem < 0
+        ordem = np.where(compra, ordem, 0) + np.where(venda, -np.minimum(-ordem, segurando), 0)
+
+        # Cada agente negocia uma única ação por dia, então (agente, ação) não se repete
+        # e a indexação com arrays já aplica todas as operações de uma vez.
+        preco_medio = np.divide(self.custo[agentes, alvo], segurando, out=np.zeros(self.num_agentes), where=segurando > 0)
+        vendidas = np.where(ordem < 0, -ordem, 0)
+        self.lucro_realizado += vendidas * (preco_alvo - preco_medio)
+        self.custo[agentes, alvo] += np.where(ordem > 0, ordem * preco_alvo, -vendidas * preco_medio)
+        self.quantidades[agentes, alvo] += ordem
+        zerada = self.quantidades[agentes, alvo] == 0
+        self.custo[agentes[zerada], alvo[zerada]] = 0.0  # Sem resíduo de arredondamento
+        self.saldo -= ordem * preco_alvo
+
+        liquido = np.bincount(alvo, weights=ordem, minlength=self.num_acoes)
+        self._precos_anteriores = precos.copy()
+        if self.impacto:
+            self._aplicar_impacto(precos, liquido)
+        return liquido
+
+    def _aplicar_impacto(self, precos, liquido):
+        mudou = np.flatnonzero(liquido)
+        novos = np.maximum(np.round(precos[mudou] * (1 + self.impacto * liquido[mudou]), 2), 1.0)
+        self.mercado.aplicar_choque(mudou.tolist(), novos.tolist())
+
+    def dia(self):
+        """Agentes negociam, depois o mercado avança um dia (notícias incluídas)."""
+        liquido = self.negociar()
+        self.mercado.gerar_noticia()
+        self.mercado.avancar_dia()
+        self.dias += 1
+        return liquido
+
+    # --- MÉTRICAS ---
+    def valor_carteiras(self):
+        return self.quantidades @ self.precos()
+
+    def lucro_nao_realizado(self):
+        return self.valor_carteiras() - self.custo.sum(axis=1)
+
+    def patrimonio(self):
+        return self.saldo + self.valor_carteiras()
+
+    def resumo(self):
+        """Patrimônio por estratégia: agentes, média e percentis 5/50/95."""
+        patrimonio = self.patrimonio()
+        resumo = {}
+        for codigo, nome in enumerate(ESTRATEGIAS_AGENTES):
+            valores = patrimonio[self.estrategia == codigo]
+            if len(valores):
+                p5, p50, p95 = np.percentile(valores, [5, 50, 95])
+                resumo[nome] = {'agentes': len(valores), 'media': float(valores.mean()),
+                                'p5': float(p5), 'p50': float(p50), 'p95': float(p95)}
+        return resumo
+
+    def __len__(self):
+        return self.num_agentes
@@ -1,4 +1,8 @@
 # algorithms.py
+import heapq
+from bisect import bisect_right
+
+import perf
 
 
 # Busca Sequencial: percorre a lista do início ao fim procurando o elemento alvo.
@@ -12,29 +16,79 @@ def busca_sequencial(lista, alvo):
 
 # Busca Binária: eficiente para listas ordenadas.
 # Divide a lista ao meio e descarta metade a cada iteração, até encontrar o alvo ou esgotar as opções.
-# Retorna o índice do elemento se encontrado, ou -1 se não estiver na lista.
-def busca_binaria(lista, alvo):
-    inicio, fim = 0, len(lista) - 1
-    while inicio <= fim:
+# chave (opcional) é aplicada a cada item antes de comparar; a lista deve estar ordenada por ela.
+# Retorna o índice do (primeiro) elemento igual ao alvo, ou -1 se não estiver na lista.
+def busca_binaria(lista, alvo, chave=None):
+    i = limite_inferior(lista, alvo, chave)
+    if i < len(lista) and (lista[i] if chave is None else chave(lista[i])) == alvo:
+        return i
+    return -1
+
+
+# Limites inferior e superior: a mesma divisão ao meio, mas sem parar no primeiro igual.
+# limite_inferior é a primeira posição com item >= alvo e limite_superior a primeira com
+# item > alvo (len(lista) se não houver); lista[inferior:superior] são os iguais ao alvo.
+# inicio/fim restringem a busca a lista[inicio:fim].
+def limite_inferior(lista, alvo, chave=None, inicio=0, fim=None):
+    fim = len(lista) if fim is None else fim
+    while inicio < fim:
         meio = (inicio + fim) // 2
-        if lista[meio] == alvo:
-            return meio
-        elif lista[meio] < alvo:
+        if (lista[meio] if chave is None else chave(lista[meio])) < alvo:
             inicio = meio + 1
         else:
-            fim = meio - 1
-    return -1
+            fim = meio
+    return inicio
+
+
+def limite_superior(lista, alvo, chave=None, inicio=0, fim=None):
+    fim = len(lista) if fim is None else fim
+    while inicio < fim:
+        meio = (inicio + fim) // 2
+        if alvo < (lista[meio] if chave is None else chave(lista[meio])):
+            fim = meio
+        else:
+            inicio = meio + 1
+    return inicio
+
+
+# Faixas em O(log n) sobre uma lista ordenada: retornam (inicio, fim) tais que
+# lista[inicio:fim] são os itens com minimo <= valor <= maximo (None = sem limite)
+# ou, para textos, os que começam com o prefixo.
+def faixa_binaria(lista, minimo=None, maximo=None, chave=None):
+    inicio = 0 if minimo is None else limite_inferior(lista, minimo, chave)
+    fim = len(lista) if maximo is None else limite_superior(lista, maximo, chave, inicio)
+    return inicio, max(inicio, fim)
+
+
+def _sucessor_prefixo(prefixo):
+    # Menor texto maior que todos os que começam com `prefixo` (None se não houver)
+    while prefixo and prefixo[-1] == '\U0010ffff':
+        prefixo = prefixo[:-1]
+    return prefixo[:-1] + chr(ord(prefixo[-1]) + 1) if prefixo else None
+
+
+def faixa_prefixo(lista, prefixo, chave=None):
+    inicio = limite_inferior(lista, prefixo, chave)
+    sucessor = _sucessor_prefixo(prefixo)
+    fim = len(lista) if sucessor is None else limite_inferior(lista, sucessor, chave, inicio)
+    return inicio, fim
 
 
 # Rabin-Karp: algoritmo eficiente para busca de substring em texto.
 # Usa hashing para comparar rapidamente o padrão com partes do texto.
 # Retorna o índice inicial da substring encontrada, ou -1 se não encontrar.
-def rabin_karp(texto, padrao):
+# Com todas=True retorna a lista de todas as ocorrências (inclusive sobrepostas).
+def rabin_karp(texto, padrao, todas=False):
     d = 256  # número de caracteres possíveis (ASCII)
-    q = 101  # número primo para módulo do hash
+    q = 1_000_000_007  # primo grande: colisões espúrias de hash ficam raras
     m = len(padrao)
     n = len(texto)
-    h = pow(d, m-1) % q  # valor de d^(m-1) % q
+    ocorrencias = []
+    if m == 0 or m > n:
+        if m == 0:
+            return list(range(n + 1)) if todas else 0
+        return ocorrencias if todas else -1
+    h = pow(d, m-1, q)  # valor de d^(m-1) % q
     p = 0  # hash do padrão
     t = 0  # hash do texto
 
@@ -48,32 +102,284 @@ def rabin_karp(texto, padrao):
         if p == t:
             # Se o hash bate, verifica caractere a caractere
             if texto[s:s+m] == padrao:
-                return s
+                if not todas:
+                    return s
+                ocorrencias.append(s)
         if s < n - m:
             # Atualiza o hash do texto (remove o primeiro caractere e adiciona o próximo)
             t = (d * (t - ord(texto[s]) * h) + ord(texto[s + m])) % q
-            t = (t + q) % q  # garante valor positivo
-    return -1
+    return ocorrencias if todas else -1
+
+
+# Aho-Corasick: busca vários padrões de uma vez só, percorrendo o texto uma única vez.
+# Monta uma trie dos padrões com links de falha (o maior sufixo que também é prefixo
+# de algum padrão), então o custo é O(tamanho do texto + ocorrências) para
+# qualquer número de padrões.
+class AhoCorasick:
+    def __init__(self, padroes):
+        self.transicoes = [{}]              # estado -> {caractere: próximo estado}
+        self.falha = [0]                    # link de falha de cada estado
+        self.saidas = [[]]                  # padrões reconhecidos ao chegar no estado
+        for padrao in padroes:
+            if padrao:
+                self._inserir(padrao)
+        self._construir_falhas()
+
+    def _inserir(self, padrao):
+        estado = 0
+        for c in padrao:
+            proximo = self.transicoes[estado].get(c)
+            if proximo is None:
+                proximo = len(self.transicoes)
+                self.transicoes[estado][c] = proximo
+                self.transicoes.append({})
+                self.falha.append(0)
+                self.saidas.append([])
+            estado = proximo
+        if padrao not in self.saidas[estado]:
+            self.saidas[estado].append(padrao)
+
+    def _construir_falhas(self):
+        # Busca em largura: a falha de um estado depende só de estados mais rasos
+        fila = list(self.transicoes[0].values())
+        for estado in fila:
+            for c, filho in self.transicoes[estado].items():
+                f = self.falha[estado]
+                while f and c not in self.transicoes[f]:
+                    f = self.falha[f]
+                destino = self.transicoes[f].get(c, 0)
+                self.falha[filho] = destino if destino != filho else 0
+                self.saidas[filho] = self.saidas[filho] + self.saidas[self.falha[filho]]
+                fila.append(filho)
 
+    def buscar_todas(self, texto):
+        """Retorna a lista de (posição inicial, padrão) de todas as ocorrências."""
+        ocorrencias = []
+        transicoes, falha, saidas = self.transicoes, self.falha, self.saidas
+        estado = 0
+        for i, c in enumerate(texto):
+            while estado and c not in transicoes[estado]:
+                estado = falha[estado]
+            estado = transicoes[estado].get(c, 0)
+            for padrao in saidas[estado]:
+                ocorrencias.append((i - len(padrao) + 1, padrao))
+        return ocorrencias
+
+
+# Busca vários padrões no texto com Aho-Corasick.
+# Retorna {padrão: [posições]} (padrões sem ocorrência ficam com lista vazia).
+def aho_corasick(texto, padroes):
+    resultado = {padrao: [] for padrao in padroes}
+    for posicao, padrao in AhoCorasick(padroes).buscar_todas(texto):
+        resultado[padrao].append(posicao)
+    return resultado
+
+
+# Marca linhas (histórico, notícias) pelos padrões que aparecem nelas, varrendo o
+# texto inteiro uma única vez. Retorna {padrão: [índices das linhas]}.
+def marcar_linhas(linhas, padroes):
+    inicios = []
+    posicao = 0
+    for linha in linhas:
+        inicios.append(posicao)
+        posicao += len(linha) + 1
+    resultado = {padrao: [] for padrao in padroes}
+    for pos, padrao in AhoCorasick(padroes).buscar_todas('\n'.join(linhas)):
+        indice = bisect_right(inicios, pos) - 1
+        marcadas = resultado[padrao]
+        if not marcadas or marcadas[-1] != indice:
+            marcadas.append(indice)
+    return resultado
+
+
+# Índice de substrings por n-gramas: para cada nome guarda todos os seus pedaços de
+# tamanho 1..n (em minúsculas) numa tabela ngrama -> conjunto de nomes.
+# Padrões com até n caracteres são respondidos direto pela tabela; padrões maiores
+# intersectam as listas dos seus n-gramas (da menor para a maior) e confirmam os
+# candidatos. Inserir/remover um nome custa O(n * tamanho do nome).
+class IndiceSubstring:
+    def __init__(self, n=3):
+        self.n = n
+        self.postings = {}                  # ngrama -> set(nomes)
+        self.normalizados = {}              # nome -> nome em minúsculas
+
+    def _ngramas(self, texto):
+        return {texto[i:i + k] for k in range(1, self.n + 1) for i in range(len(texto) - k + 1)}
+
+    def adicionar(self, nome):
+        if nome in self.normalizados:
+            return
+        normalizado = nome.lower()
+        self.normalizados[nome] = normalizado
+        for g in self._ngramas(normalizado):
+            self.postings.setdefault(g, set()).add(nome)
+
+    def remover(self, nome):
+        normalizado = self.normalizados.pop(nome, None)
+        if normalizado is None:
+            return
+        for g in self._ngramas(normalizado):
+            nomes = self.postings[g]
+            nomes.discard(nome)
+            if not nomes:
+                del self.postings[g]
+
+    def buscar(self, padrao, ignorar_maiusculas=True):
+        """Retorna o conjunto de nomes que contêm `padrao`."""
+        if not padrao:
+            return set(self.normalizados)
+        p = padrao.lower()
+        if len(p) <= self.n:
+            encontrados = set(self.postings.get(p, ()))
+        else:
+            listas = sorted((self.postings.get(p[i:i + self.n], set()) for i in range(len(p) - self.n + 1)), key=len)
+            if not listas[0]:
+                return set()
+            candidatos = listas[0].intersection(*listas[1:])
+            encontrados = {nome for nome in candidatos if p in self.normalizados[nome]}
+        if not ignorar_maiusculas:
+            encontrados = {nome for nome in encontrados if padrao in nome}
+        return encontrados
+
+    def __contains__(self, nome):
+        return nome in self.normalizados
+
+    def __len__(self):
+        return len(self.normalizados)
+
+
+# Índice aproximado (tolerante a erros de digitação): trie dos nomes em minúsculas,
+# percorrida com as linhas da tabela de distância de edição (Damerau-Levenshtein
+# restrita: inserção, remoção, troca e transposição de vizinhos custam 1).
+# Cada nó da trie calcula uma linha a partir da do pai, então prefixos comuns são
+# calculados uma vez só. O menor valor da linha nunca diminui descendo a trie, logo é
+# um limite inferior da distância de qualquer nome abaixo do nó: a busca expande os
+# nós pelo menor limite (heap) e os nomes saem em ordem de distância. Para ao achar
+# os k mais próximos, sem calcular a distância para todos os nomes.
+class IndiceAproximado:
+    def __init__(self, nomes=()):
+        self.raiz = {}                      # caractere -> nó filho; None -> nomes que terminam aqui
+        self.tamanho = 0
+        for nome in nomes:
+            self.adicionar(nome)
+
+    def adicionar(self, nome):
+        no = self.raiz
+        for c in nome.lower():
+            no = no.setdefault(c, {})
+        nomes = no.setdefault(None, set())
+        if nome not in nomes:
+            nomes.add(nome)
+            self.tamanho += 1
+
+    def remover(self, nome):
+        chave = nome.lower()
+        caminho = [self.raiz]
+        for c in chave:
+            no = caminho[-1].get(c)
+            if no is None:
+                return
+            caminho.append(no)
+        nomes = caminho[-1].get(None)
+        if not nomes or nome not in nomes:
+            return
+        nomes.discard(nome)
+        self.tamanho -= 1
+        if not nomes:
+            del caminho[-1][None]
+        # Poda os nós que ficaram vazios, de baixo para cima
+        for i in range(len(chave), 0, -1):
+            if caminho[i]:
+                break
+            del caminho[i - 1][chave[i - 1]]
+
+    def proximos(self, consulta, k=5, max_distancia=None):
+        """Até k pares (distância, nome) mais próximos de `consulta`, do mais perto ao mais longe.
+
+        Ignora maiúsculas; max_distancia descarta nomes mais distantes. Empates saem na
+        ordem em que a busca os encontra.
+        """
+        alvo = consulta.lower()
+        n = len(alvo)
+        limite = float('inf') if max_distancia is None else max_distancia
+        resultado = []
+        if k < 1:
+            return resultado
+        # Entradas: (limite inferior, 0, nome) para nomes e (limite, 1, seq, nó, linha,
+        # linha anterior, caractere) para nós; nomes vêm antes de nós com o mesmo valor
+        heap = [(0, 1, 0, self.raiz, list(range(n + 1)), None, None)]
+        seq = 1
+        while heap:
+            entrada = heapq.heappop(heap)
+            if entrada[0] > limite:
+                break
+            if entrada[1] == 0:
+                resultado.append((entrada[0], entrada[2]))
+                if len(resultado) == k:
+                    break
+                continue
+            _, _, _, no, linha, anterior, letra = entrada
+            for c, filho in no.items():
+                if c is None:
+                    for nome in filho:
+                        if linha[n] <= limite:
+                            heapq.heappush(heap, (linha[n], 0, nome))
+                    continue
+                nova = [linha[0] + 1]
+                for j in range(1, n + 1):
+                    valor = min(linha[j] + 1, nova[j - 1] + 1, linha[j - 1] + (alvo[j - 1] != c))
+                    if j > 1 and letra is not None and c == alvo[j - 2] and letra == alvo[j - 1]:
+                        valor = min(valor, anterior[j - 2] + 1)   # Transposição de vizinhos
+                    nova.append(valor)
+                menor = min(nova)
+                if menor <= limite:
+                    heapq.heappush(heap, (menor, 1, seq, filho, nova, linha, c))
+                    seq += 1
+        return resultado
+
+    def __len__(self):
+        return self.tamanho
 
 
 # Função genérica para buscar usando o algoritmo escolhido.
 # Permite escolher entre busca sequencial, binária ou Rabin-Karp.
-# - Para listas: use 'sequencial' ou 'binaria'.
-# - Para texto: use 'rabin_karp'.
-# Retorna o índice do elemento/padrão encontrado, ou -1 se não encontrar.
+# - Para listas: use 'sequencial' ou 'binaria'; em listas ordenadas, 'prefixo' (itens que
+#   começam com o alvo) e 'faixa' (itens entre alvo = (minimo, maximo)) retornam os itens.
+# - Para nomes com erro de digitação: 'aproximada', com dados = IndiceAproximado (ou lista
+#   de nomes, indexada na hora) e alvo = nome ou (nome, k); retorna [(distância, nome)].
+# - Para texto: use 'rabin_karp' (primeira ocorrência), 'rabin_karp_todas'
+#   (todas as ocorrências) ou 'aho_corasick' (vários padrões de uma vez).
+# Retorna o índice do elemento/padrão encontrado, ou -1 se não encontrar;
+# 'prefixo', 'faixa' e 'rabin_karp_todas' retornam listas e 'aho_corasick' um dicionário {padrão: [posições]}.
+@perf.medido('algorithms.buscar')
 def buscar(algoritmo, dados, alvo):
     """
-    algoritmo: str - 'sequencial', 'binaria' ou 'rabin_karp'
-    dados: lista (para sequencial/binaria) ou texto (para rabin_karp)
-    alvo: valor a ser buscado (ou padrão para rabin_karp)
+    algoritmo: str - 'sequencial', 'binaria', 'prefixo', 'faixa', 'aproximada', 'rabin_karp',
+               'rabin_karp_todas' ou 'aho_corasick'
+    dados: lista (para sequencial/binaria/prefixo/faixa), IndiceAproximado ou lista de nomes
+           (para aproximada) ou texto (para os demais)
+    alvo: valor a ser buscado (prefixo, (minimo, maximo) para faixa, nome ou (nome, k) para
+          aproximada, padrão para rabin_karp, lista de padrões para aho_corasick)
     """
     if algoritmo == 'sequencial':
         return busca_sequencial(dados, alvo)
     elif algoritmo == 'binaria':
         return busca_binaria(dados, alvo)
+    elif algoritmo == 'prefixo':
+        inicio, fim = faixa_prefixo(dados, alvo)
+        return dados[inicio:fim]
+    elif algoritmo == 'faixa':
+        inicio, fim = faixa_binaria(dados, *alvo)
+        return dados[inicio:fim]
+    elif algoritmo == 'aproximada':
+        indice = dados if isinstance(dados, IndiceAproximado) else IndiceAproximado(dados)
+        return indice.proximos(*alvo) if isinstance(alvo, tuple) else indice.proximos(alvo)
     elif algoritmo == 'rabin_karp':
         return rabin_karp(dados, alvo)
+    elif algoritmo == 'rabin_karp_todas':
+        return rabin_karp(dados, alvo, todas=True)
+    elif algoritmo == 'aho_corasick':
+        return aho_corasick(dados, alvo)
     else:
         raise ValueError("Algoritmo de busca desconhecido.")
 
@@ -91,9 +397,20 @@ if __name__ == "__main__":
     lista_ordenada = sorted([10, 20, 30, 40, 50])
     print("Busca Binária - Procurando 30:")
     print("Índice encontrado:", buscar('binaria', lista_ordenada, 30))
+    print("Busca Binária - Entre 20 e 40:", buscar('faixa', lista_ordenada, (20, 40)))
+    print("Busca Binária - Começam com 'B':", buscar('prefixo', sorted(lista), 'B'))
+
+    # Busca aproximada (tolerante a erros de digitação)
+    print("Busca Aproximada - Procurando 'Tehcwave' (2 mais próximos):")
+    print("Encontrados:", buscar('aproximada', lista, ('Tehcwave', 2)))
 
     # Rabin-Karp
     texto = "O mercado financeiro está em alta com a TechWave liderando."
     padrao = "TechWave"
     print("Rabin-Karp - Procurando 'TechWave':")
     print("Posição encontrada:", buscar('rabin_karp', texto, padrao))
+
+    # Aho-Corasick (vários padrões numa só varredura)
+    noticias = "TechWave sobe 5%. BankNow cai. TechWave e BioGen anunciam parceria."
+    print("Aho-Corasick - Procurando TechWave, BankNow e BioGen:")
+    print("Posições encontradas:", buscar('aho_corasick', noticias, ['TechWave', 'BankNow', 'BioGen']))
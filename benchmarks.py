@@ -0,0 +1,402 @@
+# benchmarks.py
+# Benchmarks do simulador.
+# Uso:
+#   python benchmarks.py rodar --saida base.json [--rapido]   suíte completa, resultados em JSON
+#   python benchmarks.py comparar base.json novo.json          aponta regressões entre duas execuções
+#   python benchmarks.py precos [--tamanhos 1000 100000]       laço por objeto x motor vetorizado
+#   python benchmarks.py hash [--chaves 15 80 1000]            tabelas hash x dict
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from agentes import PopulacaoAgentes
+from algorithms import busca_sequencial, busca_binaria, rabin_karp, aho_corasick, IndiceAproximado
+from challenges import DESAFIOS, MotorDesafios, Retrato
+from compressao import huffman_compress
+from estruturas import HashTableExtracao, HashTableExtracaoFixa
+from graficos import baldes_min_max
+from historico import HistoricoPrecos
+from market import Mercado, np
+from player import Jogador
+from telas import montar_tela
+
+
+def medir(funcao, repeticoes=3):
+    # Retorna o melhor tempo (em segundos) entre as repetições
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def bench_avancar_dia(tamanhos, dias):
+    print(f"== Mercado.avancar_dia ({dias} dias) ==")
+    print(f"{'ações':>10} {'laço (s)':>12} {'vetor/dia (s)':>14} {'vetor/bloco (s)':>16} {'ganho':>8}")
+    for n in tamanhos:
+        random.seed(0)
+        m_obj = Mercado(num_acoes=n)
+        m_vet = Mercado(vetorizado=True, num_acoes=n, seed=0)
+        m_bloco = Mercado(vetorizado=True, num_acoes=n, seed=0)
+
+        def laco():
+            for _ in range(dias):
+                m_obj.avancar_dia()
+
+        def vetor_dia():
+            for _ in range(dias):
+                m_vet.avancar_dia()
+
+        t_laco = medir(laco, repeticoes=1)
+        t_vetor = medir(vetor_dia)
+        t_bloco = medir(lambda: m_bloco.avancar_dias(dias))
+        print(f"{n:>10} {t_laco:>12.4f} {t_vetor:>14.4f} {t_bloco:>16.4f} {t_laco / t_bloco:>7.1f}x")
+
+
+def nomes_de_tickers(n, seed=0):
+    # Nomes no estilo do mercado: prefixo de setor + sufixo, muitos com as mesmas
+    # primeira e última letras (o pior caso do hash por extração)
+    rng = random.Random(seed)
+    prefixos = ['Tech', 'Agro', 'Bank', 'Health', 'Green', 'Edu', 'Food', 'Travel', 'Build', 'Bio', 'Cloud', 'Mobi']
+    sufixos = ['Wave', 'Plus', 'Now', 'Max', 'Energy', 'Smart', 'Net', 'Pay', 'Gen', 'X', 'It', 'Drive']
+    nomes = dict.fromkeys(Mercado.NOMES_PADRAO[:n])   # dict, não set: a ordem não depende do PYTHONHASHSEED
+    while len(nomes) < n:
+        nomes.setdefault(f"{rng.choice(prefixos)}{rng.choice(sufixos)}{rng.randrange(10 ** 4) if len(nomes) > 100 else ''}")
+    return list(nomes)
+
+
+def bench_hash(tamanhos, repeticoes=5):
+    print("== Tabelas hash (inserir todos + buscar todos) ==")
+    print(f"{'chaves':>8} {'estrutura':<22} {'tempo (s)':>10} {'sondagem média':>15} {'máxima':>7}")
+    for n in tamanhos:
+        nomes = nomes_de_tickers(n)
+        candidatas = [('dict', dict), ('HashTableExtracao', HashTableExtracao)]
+        if n < 101:  # A versão fixa não cabe (e não termina) com 101 chaves ou mais
+            candidatas.append(('HashTableExtracaoFixa', HashTableExtracaoFixa))
+        for nome_estrutura, classe in candidatas:
+            def rodar():
+                tabela = classe()
+                if classe is dict:
+                    for i, nome in enumerate(nomes):
+                        tabela[nome] = i
+                    for nome in nomes:
+                        tabela.get(nome)
+                else:
+                    for i, nome in enumerate(nomes):
+                        tabela.insert(nome, i)
+                    for nome in nomes:
+                        tabela.get(nome)
+                return tabela
+            tempo = medir(rodar, repeticoes)
+            tabela = rodar()
+            if isinstance(tabela, HashTableExtracao):
+                est = tabela.estatisticas()
+                media, maxima = f"{est['sondagem_media']:.2f}", str(est['sondagem_maxima'])
+            elif isinstance(tabela, HashTableExtracaoFixa):
+                sondagens = [sondagens_fixa(tabela, nome) for nome in nomes]
+                media, maxima = f"{sum(sondagens) / len(sondagens):.2f}", str(max(sondagens))
+            else:
+                media = maxima = '-'
+            print(f"{n:>8} {nome_estrutura:<22} {tempo:>10.5f} {media:>15} {maxima:>7}")
+
+
+def sondagens_fixa(tabela, chave):
+    idx = tabela._hash(chave)
+    sondagens = 1
+    while tabela.table[idx][0] != chave:
+        idx = (idx + 1) % tabela.size
+        sondagens += 1
+    return sondagens
+
+
+# --- SUÍTE DE REGRESSÃO ---
+# Cada caso é registrado com os tamanhos de entrada em que roda; `preparar(n)` monta
+# os dados (fora da medição) e devolve a função medida. Tudo usa seeds fixas.
+CASOS = []
+
+
+def caso(nome, tamanhos):
+    def registrar(preparar):
+        for n in tamanhos:
+            CASOS.append((nome, n, preparar))
+        return preparar
+    return registrar
+
+
+def medir_estatisticas(funcao, repeticoes=5, tempo_minimo=0.02):
+    # Calibra quantas chamadas cabem em `tempo_minimo` e mede `repeticoes` vezes.
+    # Retorna tempos por chamada (em segundos).
+    chamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        if time.perf_counter() - inicio >= tempo_minimo or chamadas >= 1 << 20:
+            break
+        chamadas *= 2
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        tempos.append((time.perf_counter() - inicio) / chamadas)
+    return {'min': min(tempos), 'mediana': statistics.median(tempos), 'repeticoes': repeticoes, 'chamadas': chamadas}
+
+
+@caso('busca_sequencial', (1_000, 10_000, 100_000))
+def _caso_sequencial(n):
+    lista = nomes_de_tickers(n)
+    alvo = lista[-1]                        # Pior caso: último elemento
+    return lambda: busca_sequencial(lista, alvo)
+
+
+@caso('busca_binaria', (1_000, 10_000, 100_000))
+def _caso_binaria(n):
+    lista = sorted(nomes_de_tickers(n))
+    alvos = random.Random(1).sample(lista, min(100, n))
+    return lambda: [busca_binaria(lista, alvo) for alvo in alvos]
+
+
+@caso('mercado_prefixo_e_faixa', (1_000, 10_000, 100_000))
+def _caso_prefixo_e_faixa(n):
+    # Visões ordenadas em cache: só a primeira consulta paga a ordenação
+    mercado = Mercado(num_acoes=n)
+    mercado.ordenadas_por_preco()
+    rng = random.Random(4)
+    consultas = [(f"Acao{rng.randrange(n):07d}"[:-2], rng.uniform(10, 90)) for _ in range(100)]
+    return lambda: [(mercado.buscar_prefixo(prefixo), mercado.faixa_de_preco(preco, preco + 0.5))
+                    for prefixo, preco in consultas]
+
+
+@caso('busca_aproximada', (1_000, 10_000, 100_000))
+def _caso_aproximada(n):
+    # Nomes com dois caracteres vizinhos trocados; 5 mais próximos de cada
+    lista = nomes_de_tickers(n)
+    indice = IndiceAproximado(lista)
+    rng = random.Random(5)
+    consultas = []
+    for nome in rng.sample(lista, min(100, n)):
+        i = rng.randrange(len(nome) - 1)
+        consultas.append(nome[:i] + nome[i + 1] + nome[i] + nome[i + 2:])
+    return lambda: [indice.proximos(consulta, 5) for consulta in consultas]
+
+
+def _texto(n, seed=2):
+    rng = random.Random(seed)
+    return ''.join(rng.choice('abcdefghij ') for _ in range(n))
+
+
+@caso('rabin_karp', (1_000, 10_000, 100_000))
+def _caso_rabin_karp(n):
+    texto = _texto(n) + 'TechWave'
+    return lambda: rabin_karp(texto, 'TechWave')
+
+
+@caso('aho_corasick', (1_000, 10_000, 100_000))
+def _caso_aho_corasick(n):
+    texto = _texto(n) + ' '.join(Mercado.NOMES_PADRAO)
+    return lambda: aho_corasick(texto, Mercado.NOMES_PADRAO)
+
+
+@caso('mercado_avancar_dia', (15, 1_000, 10_000))
+def _caso_avancar_dia(n):
+    random.seed(0)
+    mercado = Mercado(num_acoes=n)
+    return mercado.avancar_dia
+
+
+@caso('mercado_avancar_dia_com_ordens', (1_000, 10_000, 50_000))
+def _caso_avancar_dia_ordens(n):
+    # n ordens limitadas em repouso, longe do preço, espalhadas por 1.000 ações
+    random.seed(0)
+    mercado = Mercado(num_acoes=1_000)
+    jogador = Jogador("Benchmark")
+    jogador.saldo = 1e12
+    rng = random.Random(5)
+    for _ in range(n):
+        acao = rng.choice(mercado.acoes)
+        mercado.ordens.enviar(jogador, acao.nome, 'compra', rng.randint(1, 100), acao.preco_atual * rng.uniform(0.01, 0.1))
+    return mercado.avancar_dia
+
+
+@caso('historico_intervalos', (1_000, 100_000, 1_000_000))
+def _caso_intervalos(n):
+    # Máximo e volatilidade de faixas aleatórias num histórico de n dias já indexado
+    rng = random.Random(6)
+    historico = HistoricoPrecos(100.0)
+    for _ in range(n - 1):
+        historico.append(100.0 * rng.uniform(0.5, 1.5))
+    indice = historico.intervalos()
+    faixas = [sorted(rng.sample(range(n + 1), 2)) for _ in range(100)]
+
+    def consultar():
+        for inicio, fim in faixas:
+            indice.maximo(inicio, fim)
+            indice.volatilidade(inicio, fim)
+    return consultar
+
+
+@caso('graficos_baldes_min_max', (10_000, 100_000, 1_000_000))
+def _caso_baldes(n):
+    # Redução de n dias de histórico a 300 colunas de gráfico
+    historico = HistoricoPrecos(100.0)
+    rng = random.Random(7)
+    for _ in range(n - 1):
+        historico.append(100.0 * rng.uniform(0.5, 1.5))
+    return lambda: baldes_min_max(historico.visao(), -(-n // 300))
+
+
+@caso('desafios_atualizar', (1_000, 10_000, 100_000))
+def _caso_desafios(n):
+    # n desafios simultâneos de um mesmo dono, prazos longos: um retrato por chamada
+    rng = random.Random(8)
+    motor = MotorDesafios()
+    for _ in range(n):
+        meta = rng.choice(DESAFIOS)
+        motor.iniciar(meta._replace(prazo=10 ** 9), Retrato(0, 1000.0, 1000.0))
+    dias = iter(range(1, 10 ** 9))
+    return lambda: motor.atualizar(Retrato(next(dias), 1000.0, 1000.0 * rng.uniform(0.95, 1.05)))
+
+
+if np is not None:
+    @caso('mercado_vetorizado_avancar_dia', (1_000, 10_000, 100_000))
+    def _caso_avancar_dia_vetorizado(n):
+        mercado = Mercado(vetorizado=True, num_acoes=n, seed=0)
+        return mercado.avancar_dia
+
+    @caso('agentes_negociar', (1_000, 10_000, 100_000))
+    def _caso_agentes(n):
+        # n agentes negociando 500 ações em lote
+        mercado = Mercado(vetorizado=True, num_acoes=500, seed=0)
+        return PopulacaoAgentes(mercado, n, seed=0).negociar
+
+
+def _mercado_com_carteira(n, posicoes, linhas_historico=0):
+    random.seed(0)
+    mercado = Mercado(num_acoes=n)
+    jogador = Jogador("Benchmark")
+    jogador.saldo = 1e12
+    for acao in random.Random(3).sample(mercado.acoes, min(posicoes, n)):
+        jogador.comprar_acao(acao, 10)
+    for i in range(linhas_historico):
+        jogador.registrar_noticia(mercado.acoes[i % n], 0.1)
+    return mercado, jogador
+
+
+@caso('jogador_patrimonio_total', (15, 1_000, 10_000))
+def _caso_patrimonio(n):
+    mercado, jogador = _mercado_com_carteira(n, n // 2)
+    return lambda: jogador.get_patrimonio_total(mercado)
+
+
+@caso('huffman_compress', (1_000, 10_000, 100_000))
+def _caso_huffman(n):
+    rng = random.Random(4)
+    linhas = []
+    tamanho = 0
+    while tamanho < n:
+        linhas.append(f"Comprou {rng.randint(1, 9)} de {rng.choice(Mercado.NOMES_PADRAO)} por ${rng.uniform(10, 100):.2f} cada")
+        tamanho += len(linhas[-1]) + 1
+    texto = '\n'.join(linhas)[:n]
+    return lambda: huffman_compress(texto)
+
+
+@caso('atualizar_tela_headless', (15, 1_000, 10_000))
+def _caso_tela(n):
+    mercado, jogador = _mercado_com_carteira(n, min(n, 200), linhas_historico=1_000)
+    return lambda: montar_tela(mercado, jogador, filtro_carteira='e', linhas_historico_exibidas=990)
+
+
+@caso('atualizar_tela_filtrada', (15, 1_000, 10_000))
+def _caso_tela_filtrada(n):
+    mercado, jogador = _mercado_com_carteira(n, min(n, 200), linhas_historico=1_000)
+    return lambda: montar_tela(mercado, jogador, filtro_mercado='ech', linhas_historico_exibidas=1_000)
+
+
+def rodar_suite(rapido=False, filtro=None, repeticoes=5):
+    resultados = {}
+    vistos = set()
+    for nome, n, preparar in CASOS:
+        if filtro and filtro not in nome:
+            continue
+        if rapido and nome in vistos:       # Modo rápido: só o menor tamanho de cada caso
+            continue
+        vistos.add(nome)
+        chave = f"{nome}/n={n}"
+        resultados[chave] = medir_estatisticas(preparar(n), repeticoes)
+        print(f"{chave:<45} min {resultados[chave]['min'] * 1e6:>12.2f} µs   mediana {resultados[chave]['mediana'] * 1e6:>12.2f} µs")
+    return {
+        'meta': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'numpy': getattr(np, '__version__', None),
+        },
+        'casos': resultados,
+    }
+
+
+def comparar(base, novo, limite=0.15):
+    """Compara o tempo mínimo de cada caso; retorna a lista de regressões (razão > 1 + limite)."""
+    regressoes = []
+    print(f"{'caso':<45} {'base (µs)':>12} {'novo (µs)':>12} {'razão':>7}")
+    for chave in sorted(set(base['casos']) | set(novo['casos'])):
+        if chave not in base['casos'] or chave not in novo['casos']:
+            print(f"{chave:<45} (só em {'novo' if chave in novo['casos'] else 'base'})")
+            continue
+        t_base = base['casos'][chave]['min']
+        t_novo = novo['casos'][chave]['min']
+        razao = t_novo / t_base if t_base else float('inf')
+        marca = ''
+        if razao > 1 + limite:
+            marca = '  REGRESSÃO'
+            regressoes.append((chave, razao))
+        elif razao < 1 - limite:
+            marca = '  melhora'
+        print(f"{chave:<45} {t_base * 1e6:>12.2f} {t_novo * 1e6:>12.2f} {razao:>6.2f}x{marca}")
+    return regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do simulador da bolsa")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    p_rodar = sub.add_parser('rodar', help="roda a suíte e grava os resultados em JSON")
+    p_rodar.add_argument('--saida', help="arquivo JSON de saída")
+    p_rodar.add_argument('--rapido', action='store_true', help="só o menor tamanho de cada caso")
+    p_rodar.add_argument('--filtro', help="roda só os casos cujo nome contém este texto")
+    p_rodar.add_argument('--repeticoes', type=int, default=5)
+    p_comparar = sub.add_parser('comparar', help="compara dois JSON e aponta regressões")
+    p_comparar.add_argument('base')
+    p_comparar.add_argument('novo')
+    p_comparar.add_argument('--limite', type=float, default=0.15, help="tolerância relativa (padrão 15%%)")
+    p_precos = sub.add_parser('precos', help="laço por objeto x motor vetorizado")
+    p_precos.add_argument('--tamanhos', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    p_precos.add_argument('--dias', type=int, default=30)
+    p_hash = sub.add_parser('hash', help="tabelas hash x dict")
+    p_hash.add_argument('--chaves', type=int, nargs='+', default=[15, 80, 1_000, 100_000])
+    args = parser.parse_args()
+
+    if args.comando == 'rodar':
+        resultado = rodar_suite(args.rapido, args.filtro, args.repeticoes)
+        if args.saida:
+            with open(args.saida, 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, indent=2, ensure_ascii=False)
+    elif args.comando == 'comparar':
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.novo, encoding='utf-8') as f:
+            novo = json.load(f)
+        regressoes = comparar(base, novo, args.limite)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) acima de {args.limite:.0%}.")
+            sys.exit(1)
+    elif args.comando == 'precos':
+        bench_avancar_dia(args.tamanhos, args.dias)
+    else:
+        bench_hash(args.chaves)
@@ -1,25 +1,199 @@
 # challenges.py
+# Desafios declarativos e o motor que os avalia a cada dia.
+#
+# Cada desafio é uma Meta (tipo, alvo, prazo) e é avaliado só a partir de um Retrato
+# diário (dia, saldo, patrimônio) do seu dono, nunca do histórico. O motor guarda os
+# desafios em andamento de cada dono em heaps, como o livro de ofertas: patrimônio
+# alvo (lucro e múltiplo) e dia limite. Um retrato só olha o topo dos heaps e os
+# desafios de drawdown; milhares de desafios simultâneos custam O(1) por dia cada.
+import heapq
+from collections import namedtuple
+
+# --- TIPOS DE META ---
+LUCRO = 'lucro'                             # alvo: ganho de patrimônio em $ desde o início
+MULTIPLO = 'multiplo'                       # alvo: fator sobre o patrimônio inicial
+SOBREVIVENCIA = 'sobrevivencia'             # alvo: saldo mínimo (exclusivo) no fim do prazo
+DRAWDOWN = 'drawdown'                       # alvo: queda máxima (fração) a partir do pico
+TIPOS = (LUCRO, MULTIPLO, SOBREVIVENCIA, DRAWDOWN)
+
+EM_ANDAMENTO = "em andamento"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+CANCELADO = "cancelado"
+
+Meta = namedtuple('Meta', ['descricao', 'tipo', 'alvo', 'prazo'])
+Retrato = namedtuple('Retrato', ['dia', 'saldo', 'patrimonio'])
+
+# --- CONFIGURAÇÃO DOS DESAFIOS ---
+DESAFIOS = [
+    Meta("Lucre $50 em 10 dias", LUCRO, 50, 10),
+    Meta("Lucre $100 em 8 dias", LUCRO, 100, 8),
+    Meta("Lucre $200 em 7 dias", LUCRO, 200, 7),
+    Meta("Sobreviva 7 dias com saldo positivo", SOBREVIVENCIA, 0, 7),
+    Meta("Multiplique o patrimônio por 1.2 em 10 dias", MULTIPLO, 1.2, 10),
+    Meta("Não perca mais de 10% do pico em 15 dias", DRAWDOWN, 0.10, 15),
+]
+
+
+def retrato_de(jogador, mercado):
+    # Valores O(1) do jogador (patrimônio mantido incrementalmente)
+    return Retrato(mercado.dia, jogador.saldo, jogador.get_patrimonio_total(mercado))
+
+
 class Desafio:
-    def __init__(self, descricao, meta_lucro, dias_max):
-        self.descricao = descricao
-        self.meta_lucro = meta_lucro
-        self.dias_max = dias_max
-        self.dias_passados = 0
-        self.iniciado = False
-
-    def iniciar(self):
-        self.dias_passados = 0
-        self.iniciado = True
-
-    def avancar_dia(self):
-        if self.iniciado:
-            self.dias_passados += 1
-
-    def verificar_conclusao(self, lucro_total):
-        if not self.iniciado:
+    __slots__ = ('id', 'meta', 'dono', 'dia_inicio', 'base', 'pico', 'status', 'dia_fim')
+
+    def __init__(self, id, meta, dono, retrato):
+        if meta.tipo not in TIPOS:
+            raise ValueError(f"Tipo de meta desconhecido: {meta.tipo}")
+        self.id = id
+        self.meta = meta
+        self.dono = dono
+        self.dia_inicio = retrato.dia
+        self.base = retrato.patrimonio      # Patrimônio no início
+        self.pico = retrato.patrimonio      # Maior patrimônio desde o início (drawdown)
+        self.status = EM_ANDAMENTO
+        self.dia_fim = None
+
+    @property
+    def descricao(self):
+        return self.meta.descricao
+
+    @property
+    def ativo(self):
+        return self.status == EM_ANDAMENTO
+
+    @property
+    def dia_limite(self):
+        return self.dia_inicio + self.meta.prazo
+
+    @property
+    def patrimonio_alvo(self):
+        # Patrimônio que conclui o desafio (None para os que só se decidem no prazo)
+        if self.meta.tipo == LUCRO:
+            return self.base + self.meta.alvo
+        if self.meta.tipo == MULTIPLO:
+            return self.base * self.meta.alvo
+        return None
+
+    def resultado_no_prazo(self, retrato):
+        # Lucro e múltiplo não alcançados falham; sobrevivência depende do saldo;
+        # drawdown que chegou ao prazo sem estourar é concluído
+        if self.meta.tipo == SOBREVIVENCIA:
+            return CONCLUIDO if retrato.saldo > self.meta.alvo else FALHOU
+        return CONCLUIDO if self.meta.tipo == DRAWDOWN else FALHOU
+
+    def estado(self):
+        return [self.id, list(self.meta), self.dono, self.dia_inicio, self.base, self.pico]
+
+    @classmethod
+    def restaurar(cls, estado):
+        id, meta, dono, dia_inicio, base, pico = estado
+        desafio = cls(id, Meta(*meta), dono, Retrato(dia_inicio, 0.0, base))
+        desafio.pico = pico
+        return desafio
+
+
+# --- MOTOR ---
+# Por dono: heap (patrimônio alvo, id), heap (dia limite, id) e os desafios de drawdown.
+# Desafios encerrados por outro caminho ficam nos heaps e são descartados ao chegar
+# ao topo (remoção preguiçosa, como em LivroOfertas).
+class _IndiceDono:
+    __slots__ = ('alvos', 'prazos', 'drawdown', 'ativos')
+
+    def __init__(self):
+        self.alvos = []
+        self.prazos = []
+        self.drawdown = {}                  # id -> Desafio
+        self.ativos = 0
+
+
+class MotorDesafios:
+    def __init__(self):
+        self.desafios = {}                  # id -> Desafio em andamento
+        self._donos = {}                    # dono -> _IndiceDono
+        self._proximo_id = 1
+
+    def __len__(self):
+        return len(self.desafios)
+
+    def iniciar(self, meta, retrato, dono=None):
+        """Começa `meta` para `dono` a partir do retrato atual; retorna o Desafio."""
+        desafio = Desafio(self._proximo_id, meta, dono, retrato)
+        self._proximo_id += 1
+        self._registrar(desafio)
+        return desafio
+
+    def _registrar(self, desafio):
+        self.desafios[desafio.id] = desafio
+        indice = self._donos.get(desafio.dono)
+        if indice is None:
+            indice = self._donos[desafio.dono] = _IndiceDono()
+        indice.ativos += 1
+        alvo = desafio.patrimonio_alvo
+        if alvo is not None:
+            heapq.heappush(indice.alvos, (alvo, desafio.id))
+        if desafio.meta.tipo == DRAWDOWN:
+            indice.drawdown[desafio.id] = desafio
+        heapq.heappush(indice.prazos, (desafio.dia_limite, desafio.id))
+
+    def cancelar(self, id):
+        desafio = self.desafios.get(id)
+        if desafio is None:
             return False
-        if self.dias_passados > self.dias_max:
-            return "falhou"
-        if lucro_total >= self.meta_lucro:
-            return "concluido"
-        return "em andamento"
+        self._encerrar(desafio, CANCELADO, None)
+        return True
+
+    def ativos(self, dono=None):
+        return [d for d in self.desafios.values() if d.dono == dono]
+
+    def _encerrar(self, desafio, status, dia):
+        del self.desafios[desafio.id]
+        desafio.status = status
+        desafio.dia_fim = dia
+        indice = self._donos[desafio.dono]
+        indice.drawdown.pop(desafio.id, None)
+        indice.ativos -= 1
+        if indice.ativos == 0:
+            del self._donos[desafio.dono]   # Leva junto as entradas velhas dos heaps
+
+    def atualizar(self, retrato, dono=None):
+        """Avalia os desafios de `dono` com o retrato do dia; retorna os que encerraram."""
+        indice = self._donos.get(dono)
+        if indice is None:
+            return []
+        encerrados = []
+        patrimonio = retrato.patrimonio
+        alvos = indice.alvos
+        while alvos and alvos[0][0] <= patrimonio:
+            desafio = self.desafios.get(heapq.heappop(alvos)[1])
+            if desafio is not None:
+                self._encerrar(desafio, CONCLUIDO, retrato.dia)
+                encerrados.append(desafio)
+        if indice.drawdown:
+            for desafio in list(indice.drawdown.values()):
+                if patrimonio > desafio.pico:
+                    desafio.pico = patrimonio
+                elif patrimonio < desafio.pico * (1 - desafio.meta.alvo):
+                    self._encerrar(desafio, FALHOU, retrato.dia)
+                    encerrados.append(desafio)
+        prazos = indice.prazos
+        while prazos and prazos[0][0] <= retrato.dia and indice.ativos:
+            desafio = self.desafios.get(heapq.heappop(prazos)[1])
+            if desafio is not None:
+                self._encerrar(desafio, desafio.resultado_no_prazo(retrato), retrato.dia)
+                encerrados.append(desafio)
+        return encerrados
+
+    # --- SNAPSHOT (ver sessao.py) ---
+    # Os donos precisam ser serializáveis em JSON e voltar iguais (None, str ou int).
+    def estado(self):
+        return {'proximo_id': self._proximo_id, 'desafios': [d.estado() for d in self.desafios.values()]}
+
+    @classmethod
+    def restaurar(cls, estado):
+        motor = cls()
+        motor._proximo_id = estado['proximo_id']
+        for dados in estado['desafios']:
+            motor._registrar(Desafio.restaurar(dados))
+        return motor
@@ -0,0 +1,217 @@
+# compressao.py
+# Codec de Huffman canônico: códigos empacotados em bytes, cabeçalho serializado,
+# decodificador por tabela e modo em blocos (stream) para históricos longos.
+import heapq
+import struct
+from collections import Counter
+
+import perf
+
+MAGICO = b'HUF1'
+MAX_BITS = 15                               # Tamanho máximo de código (tabela de 2^15 entradas)
+
+
+# --- ÁRVORE DE HUFFMAN ---
+class HuffmanNode:
+    def __init__(self, char, freq):
+        self.char = char                    # Caractere
+        self.freq = freq                    # Frequência
+        self.left = None                    # Filho esquerdo
+        self.right = None                   # Filho direito
+
+    def __lt__(self, other):
+        return self.freq < other.freq       # Para ordenação no heap
+
+def build_huffman_tree(text):
+    freq = Counter(text)                    # Conta frequência dos chars
+    heap = [HuffmanNode(ch, fr) for ch, fr in freq.items()]  # Cria nós
+    heapq.heapify(heap)                     # Min-heap
+
+    while len(heap) > 1:                    # Constrói árvore
+        n1 = heapq.heappop(heap)            # Menor frequência
+        n2 = heapq.heappop(heap)            # Segunda menor
+        merged = HuffmanNode(None, n1.freq + n2.freq)  # Nó pai
+        merged.left = n1
+        merged.right = n2
+        heapq.heappush(heap, merged)        # De volta ao heap
+
+    return heap[0] if heap else None
+
+def build_codes(node, prefix="", codebook=None):
+    if codebook is None:
+        codebook = {}
+    if node:
+        if node.char is not None:           # Folha da árvore
+            codebook[node.char] = prefix or "0"  # Associa char ao código
+        build_codes(node.left, prefix + "0", codebook)   # Esquerda = 0
+        build_codes(node.right, prefix + "1", codebook)  # Direita = 1
+    return codebook
+
+
+# --- CÓDIGOS CANÔNICOS ---
+# Só os tamanhos dos códigos vão no cabeçalho: os códigos em si são reconstruídos
+# em ordem (tamanho, símbolo), então codificador e decodificador chegam aos mesmos bits.
+def tamanhos_de_codigo(dados):
+    tamanhos = {simbolo: len(codigo) for simbolo, codigo in build_codes(build_huffman_tree(dados)).items()}
+    return limitar_tamanhos(tamanhos, MAX_BITS)
+
+def limitar_tamanhos(tamanhos, max_bits):
+    # Corta códigos longos em max_bits e alonga os mais curtos até a desigualdade de
+    # Kraft voltar a valer (soma de 2^-tamanho <= 1), mantendo um código de prefixo.
+    if not tamanhos or max(tamanhos.values()) <= max_bits:
+        return tamanhos
+    tamanhos = {s: min(t, max_bits) for s, t in tamanhos.items()}
+    kraft = sum(1 << (max_bits - t) for t in tamanhos.values())
+    while kraft > (1 << max_bits):
+        simbolo = max((s for s, t in tamanhos.items() if t < max_bits), key=lambda s: tamanhos[s])
+        kraft -= 1 << (max_bits - tamanhos[simbolo] - 1)
+        tamanhos[simbolo] += 1
+    return tamanhos
+
+def codigos_canonicos(tamanhos):
+    """{símbolo: tamanho} -> {símbolo: (código inteiro, tamanho)}"""
+    codigos = {}
+    codigo = 0
+    tamanho_anterior = 0
+    for simbolo, tamanho in sorted(tamanhos.items(), key=lambda x: (x[1], x[0])):
+        codigo <<= tamanho - tamanho_anterior
+        codigos[simbolo] = (codigo, tamanho)
+        codigo += 1
+        tamanho_anterior = tamanho
+    return codigos
+
+
+# --- CODIFICAÇÃO ---
+def _empacotar(dados, codigos):
+    saida = bytearray()
+    acumulador = 0                          # Bits pendentes (mais antigos à esquerda)
+    bits = 0
+    for byte in dados:
+        codigo, tamanho = codigos[byte]
+        acumulador = (acumulador << tamanho) | codigo
+        bits += tamanho
+        while bits >= 8:
+            bits -= 8
+            saida.append((acumulador >> bits) & 0xFF)
+        acumulador &= (1 << bits) - 1
+    if bits:
+        saida.append((acumulador << (8 - bits)) & 0xFF)  # Completa o último byte com zeros
+    return saida
+
+@perf.medido('huffman.comprimir')
+def comprimir(dados):
+    """Comprime texto (UTF-8) ou bytes. Formato: HUF1 | tamanho | nº símbolos | (símbolo, tamanho)* | bits."""
+    if isinstance(dados, str):
+        dados = dados.encode('utf-8')
+    tamanhos = tamanhos_de_codigo(dados)
+    codigos = codigos_canonicos(tamanhos)
+    cabecalho = bytearray(MAGICO)
+    cabecalho += struct.pack('<QH', len(dados), len(tamanhos))
+    for simbolo, tamanho in sorted(tamanhos.items()):
+        cabecalho += bytes((simbolo, tamanho))
+    return bytes(cabecalho + _empacotar(dados, codigos))
+
+
+# --- DECODIFICAÇÃO ---
+def _ler_cabecalho(comprimido):
+    if comprimido[:4] != MAGICO:
+        raise ValueError("Dados não estão no formato Huffman (HUF1).")
+    tamanho_original, num_simbolos = struct.unpack_from('<QH', comprimido, 4)
+    inicio = 4 + struct.calcsize('<QH')
+    tamanhos = {comprimido[inicio + 2 * i]: comprimido[inicio + 2 * i + 1] for i in range(num_simbolos)}
+    return tamanho_original, tamanhos, inicio + 2 * num_simbolos
+
+def tabela_de_decodificacao(codigos):
+    # Tabela indexada pelos próximos `max_bits` bits: cada entrada já diz o símbolo
+    # e quantos bits ele consome, então cada símbolo sai com um único acesso.
+    max_bits = max(tamanho for _, tamanho in codigos.values())
+    tabela = [None] * (1 << max_bits)
+    for simbolo, (codigo, tamanho) in codigos.items():
+        folga = max_bits - tamanho
+        base = codigo << folga
+        for i in range(1 << folga):
+            tabela[base | i] = (simbolo, tamanho)
+    return tabela, max_bits
+
+@perf.medido('huffman.descomprimir')
+def descomprimir(comprimido):
+    """Inverso de comprimir(); retorna bytes (use .decode('utf-8') para texto)."""
+    tamanho_original, tamanhos, inicio = _ler_cabecalho(comprimido)
+    if tamanho_original == 0:
+        return b''
+    tabela, max_bits = tabela_de_decodificacao(codigos_canonicos(tamanhos))
+    mascara = (1 << max_bits) - 1
+    saida = bytearray()
+    acumulador = 0
+    bits = 0
+    dados = memoryview(comprimido)[inicio:]
+    posicao = 0
+    while len(saida) < tamanho_original:
+        while bits < max_bits:              # Mantém pelo menos max_bits no acumulador
+            byte = dados[posicao] if posicao < len(dados) else 0
+            posicao += 1
+            acumulador = ((acumulador << 8) | byte) & ((1 << (max_bits + 8)) - 1)
+            bits += 8
+        simbolo, tamanho = tabela[(acumulador >> (bits - max_bits)) & mascara]
+        saida.append(simbolo)
+        bits -= tamanho
+    return bytes(saida)
+
+
+# --- MODO EM BLOCOS (STREAM) ---
+# O texto é dividido em blocos de até `tamanho_bloco` bytes, cada um comprimido com
+# seu próprio cabeçalho e prefixado pelo tamanho: dá para gravar o histórico aos
+# poucos e ler de volta sem carregar tudo na memória.
+class ComprimidorStream:
+    def __init__(self, arquivo, tamanho_bloco=64 * 1024):
+        self.arquivo = arquivo              # Arquivo binário aberto para escrita
+        self.tamanho_bloco = tamanho_bloco
+        self.buffer = bytearray()
+        self.bytes_originais = 0
+        self.bytes_comprimidos = 0
+
+    def escrever(self, dados):
+        if isinstance(dados, str):
+            dados = dados.encode('utf-8')
+        self.buffer += dados
+        self.bytes_originais += len(dados)
+        while len(self.buffer) >= self.tamanho_bloco:
+            self._gravar_bloco(self.buffer[:self.tamanho_bloco])
+            del self.buffer[:self.tamanho_bloco]
+
+    def _gravar_bloco(self, bloco):
+        comprimido = comprimir(bytes(bloco))
+        self.arquivo.write(struct.pack('<I', len(comprimido)))
+        self.arquivo.write(comprimido)
+        self.bytes_comprimidos += 4 + len(comprimido)
+
+    def fechar(self):
+        if self.buffer:
+            self._gravar_bloco(self.buffer)
+            self.buffer.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+def descomprimir_stream(arquivo):
+    """Gera os blocos originais (bytes), um por vez, de um arquivo do ComprimidorStream."""
+    while True:
+        prefixo = arquivo.read(4)
+        if len(prefixo) < 4:
+            return
+        (tamanho,) = struct.unpack('<I', prefixo)
+        yield descomprimir(arquivo.read(tamanho))
+
+
+# --- COMPATIBILIDADE ---
+def huffman_compress(text):
+    # Retorna (bytes comprimidos, códigos canônicos {byte: (código, tamanho)})
+    comprimido = comprimir(text)
+    _, tamanhos, _ = _ler_cabecalho(comprimido)
+    return comprimido, codigos_canonicos(tamanhos)
+
+def huffman_decompress(comprimido):
+    return descomprimir(comprimido).decode('utf-8')
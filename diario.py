@@ -0,0 +1,267 @@
+# diario.py
+# Diário de operações: registros binários de tamanho fixo, só de acréscimo.
+# O texto em português só é montado na hora de exibir.
+import heapq
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from collections.abc import Sequence
+
+COMPRA = 0
+VENDA = 1
+NOTICIA = 2
+
+# dia, id da ação, lado, (3 bytes de alinhamento), quantidade, preço, valor
+# `valor` é o lucro realizado nas vendas e o impacto (fração) nas notícias.
+FORMATO = struct.Struct('<IIBxxxIdd')       # 32 bytes por registro
+
+Registro = namedtuple('Registro', ['dia', 'acao', 'lado', 'quantidade', 'preco', 'valor'])
+
+
+def formatar(registro):
+    """Texto de exibição de um registro (mesmo formato do histórico antigo)."""
+    if registro.lado == COMPRA:
+        return f"Comprou {registro.quantidade} de {registro.acao} por ${registro.preco:.2f} cada"
+    if registro.lado == VENDA:
+        return f"Vendeu {registro.quantidade} de {registro.acao} por ${registro.preco:.2f} cada (Lucro: ${registro.valor:.2f})"
+    return f"Notícia: {'Boa' if registro.valor > 0 else 'Ruim'} para {registro.acao}! Preço alterado para ${registro.preco:.2f}"
+
+
+# --- DIÁRIO ---
+# Sem caminho, os registros ficam num bytearray; com caminho, vão para um arquivo
+# aberto em modo append e a leitura é feita por mmap (só as páginas lidas entram na
+# memória). Os nomes das ações ficam num arquivo ao lado (<caminho>.nomes), um por
+# linha, e os registros guardam só o id (posição nessa lista).
+class Diario:
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self.nomes = []                     # id -> nome da ação
+        self.ids = {}                       # nome -> id
+        self._ids_minusculas = {}           # nome em minúsculas -> [ids]
+        self.lucro_realizado = 0.0          # Soma corrente dos lucros das vendas
+        self._buffer = None
+        self._arquivo = None
+        self._arquivo_nomes = None
+        self._mapa = None
+        self._tamanho_mapa = 0
+        self._num_registros = 0
+        # Índice invertido mantido a cada registro: posições por ação e por (ação, lado),
+        # mais o dia de cada posição. Como os dias só crescem, faixas de dias viram bisect.
+        self._dias = array('I')             # posição -> dia
+        self._por_acao = {}                 # id da ação -> array('I') de posições
+        self._por_acao_lado = {}            # (id da ação, lado) -> array('I') de posições
+        self._por_lado = {}                 # lado -> array('I') de posições
+        if caminho is None:
+            self._buffer = bytearray(64 * FORMATO.size)
+            return
+        # Um registro (ou nome) pela metade, de uma gravação interrompida, é descartado:
+        # senão todos os acréscimos seguintes ficariam desalinhados
+        if os.path.exists(caminho + '.nomes'):
+            with open(caminho + '.nomes', 'rb') as f:
+                dados = f.read()
+            completos = dados.rfind(b'\n') + 1
+            if completos < len(dados):
+                os.truncate(caminho + '.nomes', completos)
+            for nome in dados[:completos].decode('utf-8').splitlines():
+                self._id_novo(nome)
+        if os.path.exists(caminho):
+            self._num_registros = os.path.getsize(caminho) // FORMATO.size
+            if os.path.getsize(caminho) != self._num_registros * FORMATO.size:
+                os.truncate(caminho, self._num_registros * FORMATO.size)
+        self._arquivo = open(caminho, 'ab')
+        self._arquivo_nomes = open(caminho + '.nomes', 'a', encoding='utf-8')
+        for posicao, campos in enumerate(FORMATO.iter_unpack(self._dados())):
+            self._indexar(posicao, campos[0], campos[1], campos[2])
+            if campos[2] == VENDA:
+                self.lucro_realizado += campos[5]
+
+    def _id_novo(self, nome):
+        self.ids[nome] = len(self.nomes)
+        self._ids_minusculas.setdefault(nome.lower(), []).append(self.ids[nome])
+        self.nomes.append(nome)
+        return self.ids[nome]
+
+    def _id(self, nome):
+        id_acao = self.ids.get(nome)
+        if id_acao is None:
+            id_acao = self._id_novo(nome)
+            if self._arquivo_nomes is not None:
+                self._arquivo_nomes.write(nome + '\n')
+                self._arquivo_nomes.flush()
+        return id_acao
+
+    def registrar(self, dia, nome, lado, quantidade, preco, valor=0.0):
+        # Confere antes de gravar: um registro recusado não pode ficar no arquivo
+        if self._dias and dia < self._dias[-1]:
+            raise ValueError("Os dias do diário devem ser não decrescentes.")
+        id_acao = self._id(nome)
+        if self._buffer is not None:
+            posicao = self._num_registros * FORMATO.size
+            if posicao + FORMATO.size > len(self._buffer):
+                # Novo buffer em vez de redimensionar: leituras em andamento seguem válidas
+                novo = bytearray(max(2 * len(self._buffer), 64 * FORMATO.size))  # O adotado em restaurar pode ser vazio
+                novo[:posicao] = self._buffer[:posicao]
+                self._buffer = novo
+            FORMATO.pack_into(self._buffer, posicao, dia, id_acao, lado, quantidade, preco, valor)
+        else:
+            self._arquivo.write(FORMATO.pack(dia, id_acao, lado, quantidade, preco, valor))
+        self._indexar(self._num_registros, dia, id_acao, lado)
+        self._num_registros += 1
+        if lado == VENDA:
+            self.lucro_realizado += valor
+
+    def _indexar(self, posicao, dia, id_acao, lado):
+        self._dias.append(dia)
+        self._por_acao.setdefault(id_acao, array('I')).append(posicao)
+        self._por_acao_lado.setdefault((id_acao, lado), array('I')).append(posicao)
+        self._por_lado.setdefault(lado, array('I')).append(posicao)
+
+    def ids_por_nome(self, nome):
+        # Ids das ações com esse nome, sem diferenciar maiúsculas
+        return list(self._ids_minusculas.get(nome.lower(), ()))
+
+    def _postings(self, ids, lado):
+        if ids is None:
+            if lado is None:
+                return [range(self._num_registros)]
+            return [self._por_lado.get(lado, ())]
+        if lado is None:
+            return [self._por_acao.get(i, ()) for i in ids]
+        return [self._por_acao_lado.get((i, lado), ()) for i in ids]
+
+    def _fatia_por_dias(self, posicoes, dia_inicio, dia_fim):
+        # Trecho de uma lista de posições cujos dias estão em [dia_inicio, dia_fim]
+        dias = self._dias
+        inicio = 0 if dia_inicio is None else bisect_left(posicoes, dia_inicio, key=dias.__getitem__)
+        fim = len(posicoes) if dia_fim is None else bisect_right(posicoes, dia_fim, key=dias.__getitem__)
+        return posicoes[inicio:fim]
+
+    def buscar(self, acoes=None, lado=None, dia_inicio=None, dia_fim=None, pagina=0, por_pagina=50):
+        """Registros das ações `acoes` (nomes; None = todas), do `lado` e da faixa de dias.
+
+        Retorna (registros da página, total de ocorrências). Custa O(log n) para achar
+        a faixa e O(tamanho da página) para montá-la, sem varrer o diário.
+        """
+        ids = None
+        if acoes is not None:
+            ids = [self.ids[nome] for nome in ([acoes] if isinstance(acoes, str) else acoes) if nome in self.ids]
+        listas = [self._fatia_por_dias(p, dia_inicio, dia_fim) for p in self._postings(ids, lado)]
+        total = sum(len(p) for p in listas)
+        inicio = pagina * por_pagina
+        if len(listas) == 1:
+            posicoes = listas[0][inicio:inicio + por_pagina]
+        else:
+            # Várias ações: intercala as listas já ordenadas por posição
+            mescladas = heapq.merge(*listas)
+            posicoes = [p for _, p in zip(range(inicio + por_pagina), mescladas)][inicio:]
+        return [self[p] for p in posicoes], total
+
+    def _dados(self):
+        # Bytes de todos os registros (memoryview do buffer ou do mmap do arquivo)
+        tamanho = self._num_registros * FORMATO.size
+        if self._buffer is not None:
+            return memoryview(self._buffer)[:tamanho]
+        if tamanho == 0:
+            return memoryview(b'')
+        if self._mapa is None or self._tamanho_mapa < tamanho:
+            self._arquivo.flush()
+            # O mapa antigo não é fechado: visões ainda abertas sobre ele continuam válidas
+            with open(self.caminho, 'rb') as f:
+                self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._tamanho_mapa = len(self._mapa)
+        return memoryview(self._mapa)[:tamanho]
+
+    def _registro(self, campos):
+        dia, id_acao, lado, quantidade, preco, valor = campos
+        return Registro(dia, self.nomes[id_acao], lado, quantidade, preco, valor)
+
+    def __len__(self):
+        return self._num_registros
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._num_registros
+        if not 0 <= i < self._num_registros:
+            raise IndexError("registro fora do diário")
+        dados = self._dados()
+        return self._registro(FORMATO.unpack_from(dados, i * FORMATO.size))
+
+    def registros(self, inicio=0, fim=None):
+        fim = self._num_registros if fim is None else min(fim, self._num_registros)
+        if inicio >= fim:
+            return
+        dados = self._dados()[inicio * FORMATO.size:fim * FORMATO.size]
+        for campos in FORMATO.iter_unpack(dados):
+            yield self._registro(campos)
+
+    def __iter__(self):
+        return self.registros()
+
+    def textos(self):
+        return VisaoTexto(self)
+
+    # --- SNAPSHOT (ver sessao.py) ---
+    # Os registros vão sem cópia (o trecho já escrito nunca muda e o buffer não é
+    # redimensionado no lugar); os arrays do índice crescem com append e são copiados,
+    # com as listas de cada chave concatenadas numa seção só.
+    def estado(self):
+        meta = {'nomes': list(self.nomes), 'num_registros': self._num_registros,
+                'lucro_realizado': self.lucro_realizado}
+        registros = self._dados()
+        secoes = {'registros': (registros, len(self._buffer)) if self._buffer is not None else registros,
+                  'dias': bytes(self._dias)}
+        for nome, indice in (('por_acao', self._por_acao), ('por_acao_lado', self._por_acao_lado), ('por_lado', self._por_lado)):
+            meta[nome] = [[chave, len(posicoes)] for chave, posicoes in indice.items()]
+            secoes[nome] = b''.join(bytes(posicoes) for posicoes in indice.values())
+        return meta, secoes
+
+    @classmethod
+    def restaurar(cls, meta, secoes):
+        """Diário em memória que adota o buffer de registros (memoryview gravável) sem copiar."""
+        diario = cls()
+        for nome in meta['nomes']:
+            diario._id_novo(nome)
+        diario._buffer = secoes['registros']
+        diario._num_registros = meta['num_registros']
+        diario.lucro_realizado = meta['lucro_realizado']
+        diario._dias.frombytes(secoes['dias'])
+        for nome, indice in (('por_acao', diario._por_acao), ('por_acao_lado', diario._por_acao_lado), ('por_lado', diario._por_lado)):
+            dados = secoes[nome]
+            inicio = 0
+            for chave, n in meta[nome]:
+                posicoes = array('I')
+                posicoes.frombytes(dados[inicio:inicio + 4 * n])
+                indice[tuple(chave) if isinstance(chave, list) else chave] = posicoes
+                inicio += 4 * n
+        return diario
+
+    def fechar(self):
+        self._mapa = None
+        for arquivo in (self._arquivo, self._arquivo_nomes):
+            if arquivo is not None:
+                arquivo.close()
+        self._arquivo = self._arquivo_nomes = None
+
+
+# Sequência somente leitura das linhas de texto do diário, montadas sob demanda.
+# Substitui a antiga lista de strings em Jogador.historico.
+class VisaoTexto(Sequence):
+    def __init__(self, diario):
+        self.diario = diario
+
+    def __len__(self):
+        return len(self.diario)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            inicio, fim, passo = i.indices(len(self.diario))
+            if passo == 1:
+                return [formatar(r) for r in self.diario.registros(inicio, fim)]
+            return [formatar(self.diario[j]) for j in range(inicio, fim, passo)]
+        return formatar(self.diario[i])
+
+    def __iter__(self):
+        return (formatar(r) for r in self.diario)
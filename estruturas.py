@@ -0,0 +1,246 @@
+# estruturas.py
+# Estruturas usadas pela interface para registrar ações compradas e vendidas.
+
+_LAPIDE = object()                          # Marca de posição removida (tombstone)
+
+
+# --- ALGORITMO 1: Hash com endereçamento aberto para ações compradas ---
+# Hash da chave inteira (FNV-1a), sondagem linear e redimensionamento automático:
+# quando (itens + lápides) / tamanho passa de fator_carga a tabela dobra e é
+# reconstruída, o que também descarta as lápides. Remoção deixa uma lápide para não
+# quebrar as cadeias de sondagem de outras chaves.
+class HashTableExtracao:
+    def __init__(self, size=101, fator_carga=0.7):
+        if not 0 < fator_carga < 1:
+            raise ValueError("fator_carga deve estar entre 0 e 1.")
+        self.size = size                    # Tamanho da tabela hash
+        self.table = [None] * size          # Slots: None, _LAPIDE ou (chave, valor)
+        self.fator_carga = fator_carga
+        self.count = 0                      # Itens presentes
+        self.lapides = 0                    # Slots marcados como removidos
+        self.colisoes = 0                   # Inserções cuja posição inicial estava ocupada
+        self.redimensionamentos = 0
+
+    def _hash(self, key):
+        # FNV-1a de 64 bits sobre todos os caracteres da chave
+        h = 0xcbf29ce484222325
+        for c in str(key):
+            h = ((h ^ ord(c)) * 0x100000001b3) & 0xFFFFFFFFFFFFFFFF
+        return h % self.size
+
+    def _procurar(self, key):
+        # Retorna (posição da chave ou -1, primeiro slot livre/lápide no caminho, sondagens)
+        idx = self._hash(key)
+        livre = -1
+        for sondagens in range(1, self.size + 1):
+            slot = self.table[idx]
+            if slot is None:
+                return -1, (idx if livre == -1 else livre), sondagens
+            if slot is _LAPIDE:
+                if livre == -1:
+                    livre = idx
+            elif slot[0] == key:
+                return idx, livre, sondagens
+            idx = (idx + 1) % self.size
+        return -1, livre, self.size
+
+    def insert(self, key, value):
+        pos, livre, sondagens = self._procurar(key)
+        if pos != -1:
+            self.table[pos] = (key, value)  # Atualiza (nome, preço): o número de itens não muda
+            return
+        if (self.count + self.lapides + 1) / self.size > self.fator_carga:
+            self._redimensionar()
+            _, livre, sondagens = self._procurar(key)
+        if sondagens > 1:
+            self.colisoes += 1
+        if self.table[livre] is _LAPIDE:
+            self.lapides -= 1
+        self.table[livre] = (key, value)    # Insere (nome, preço)
+        self.count += 1
+
+    def get(self, key, default=None):
+        pos, _, _ = self._procurar(key)
+        return self.table[pos][1] if pos != -1 else default
+
+    def delete(self, key):
+        pos, _, _ = self._procurar(key)
+        if pos == -1:
+            return False
+        self.table[pos] = _LAPIDE
+        self.count -= 1
+        self.lapides += 1
+        return True
+
+    def _redimensionar(self):
+        # Dobra só se os itens vivos pedirem; se o excesso é de lápides, reconstrói no mesmo tamanho
+        itens = self.all_items()
+        novo_tamanho = self.size * 2 + 1 if (self.count + 1) / self.size > self.fator_carga / 2 else self.size
+        self.size = novo_tamanho
+        self.table = [None] * novo_tamanho
+        self.count = 0
+        self.lapides = 0
+        self.redimensionamentos += 1
+        for key, value in itens:
+            _, livre, _ = self._procurar(key)
+            self.table[livre] = (key, value)
+            self.count += 1
+
+    def __contains__(self, key):
+        return self._procurar(key)[0] != -1
+
+    def __len__(self):
+        return self.count
+
+    def all_items(self):
+        return [item for item in self.table if item is not None and item is not _LAPIDE]  # Retorna tudo
+
+    def estatisticas(self):
+        """Fator de carga, lápides, colisões e comprimento de sondagem das chaves presentes."""
+        sondagens = [self._procurar(key)[2] for key, _ in self.all_items()]
+        return {
+            'tamanho': self.size,
+            'itens': self.count,
+            'lapides': self.lapides,
+            'fator_carga': (self.count + self.lapides) / self.size,
+            'colisoes': self.colisoes,
+            'redimensionamentos': self.redimensionamentos,
+            'sondagem_media': sum(sondagens) / len(sondagens) if sondagens else 0.0,
+            'sondagem_maxima': max(sondagens, default=0),
+        }
+
+
+# Versão original (101 posições fixas, hash por extração do primeiro e último
+# caractere). Mantida só para comparação em benchmarks.py: com a tabela cheia o
+# insert não termina.
+class HashTableExtracaoFixa:
+    def __init__(self, size=101):
+        self.size = size                    # Tamanho da tabela hash
+        self.table = [None] * size          # Array de 101 posições
+
+    def _hash(self, key):
+        key_str = str(key)
+        # EXTRAÇÃO: pega primeiro + último caractere
+        extracao = (ord(key_str[0]) + ord(key_str[-1])) % self.size
+        return extracao
+
+    def insert(self, key, value):
+        idx = self._hash(key)               # Calcula posição
+        # Resolve colisão com linear probing
+        while self.table[idx] is not None and self.table[idx][0] != key:
+            idx = (idx + 1) % self.size
+        self.table[idx] = (key, value)      # Insere (nome, preço)
+
+    def get(self, key, default=None):
+        idx = self._hash(key)
+        for _ in range(self.size):
+            if self.table[idx] is None:
+                break
+            if self.table[idx][0] == key:
+                return self.table[idx][1]
+            idx = (idx + 1) % self.size
+        return default
+
+    def all_items(self):
+        return [item for item in self.table if item is not None]  # Retorna tudo
+
+
+# --- ALGORITMO 2: Lista de recentes (LRU) para ações compradas e vendidas ---
+# Dicionário chave -> nó + lista duplamente encadeada em ordem de uso (mais recente
+# na cabeça). Registrar, tocar e descartar o mais antigo são O(1), e a memória fica
+# limitada a `capacidade` entradas não importa quantas operações sejam feitas.
+# Como cada registro vai para a cabeça com o dia atual, os dias decrescem ao longo
+# da lista e consultas por janela de dias param no primeiro dia fora da janela.
+class _NoRecente:
+    __slots__ = ('chave', 'valor', 'dia', 'anterior', 'proximo')
+
+    def __init__(self, chave, valor, dia):
+        self.chave = chave
+        self.valor = valor
+        self.dia = dia
+        self.anterior = None
+        self.proximo = None
+
+
+class RecentesLRU:
+    def __init__(self, capacidade=20):
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser positiva.")
+        self.capacidade = capacidade
+        self.nos = {}                       # chave -> _NoRecente
+        self.cabeca = None                  # Mais recente
+        self.cauda = None                   # Mais antigo
+
+    def _desligar(self, no):
+        if no.anterior is not None:
+            no.anterior.proximo = no.proximo
+        else:
+            self.cabeca = no.proximo
+        if no.proximo is not None:
+            no.proximo.anterior = no.anterior
+        else:
+            self.cauda = no.anterior
+        no.anterior = no.proximo = None
+
+    def _ligar_na_cabeca(self, no):
+        no.proximo = self.cabeca
+        if self.cabeca is not None:
+            self.cabeca.anterior = no
+        self.cabeca = no
+        if self.cauda is None:
+            self.cauda = no
+
+    def registrar(self, chave, valor=None, dia=0):
+        """Insere ou toca `chave`, que passa a ser a mais recente; descarta a mais antiga se passar da capacidade."""
+        no = self.nos.get(chave)
+        if no is not None:
+            self._desligar(no)
+            no.valor = valor
+            no.dia = dia
+        else:
+            no = _NoRecente(chave, valor, dia)
+            self.nos[chave] = no
+            if len(self.nos) > self.capacidade:
+                self.descartar_mais_antigo()
+        self._ligar_na_cabeca(no)
+
+    def descartar_mais_antigo(self):
+        no = self.cauda
+        if no is None:
+            return None
+        self._desligar(no)
+        del self.nos[no.chave]
+        return no.chave, no.valor, no.dia
+
+    def remover(self, chave):
+        no = self.nos.pop(chave, None)
+        if no is None:
+            return False
+        self._desligar(no)
+        return True
+
+    def get(self, chave, default=None):
+        no = self.nos.get(chave)
+        return no.valor if no is not None else default
+
+    def itens(self):
+        """Lista de (chave, valor, dia), do mais recente para o mais antigo."""
+        return self.na_janela()
+
+    def na_janela(self, dia_inicio=None, dia_fim=None):
+        # Entradas com dia_inicio <= dia <= dia_fim (mais recentes primeiro)
+        resultado = []
+        no = self.cabeca
+        while no is not None:
+            if dia_inicio is not None and no.dia < dia_inicio:
+                break
+            if dia_fim is None or no.dia <= dia_fim:
+                resultado.append((no.chave, no.valor, no.dia))
+            no = no.proximo
+        return resultado
+
+    def __contains__(self, chave):
+        return chave in self.nos
+
+    def __len__(self):
+        return len(self.nos)
@@ -0,0 +1,280 @@
+# graficos.py
+# Gráficos de preço num tk.Canvas, desenhados a partir do histórico das ações.
+# O histórico é reduzido à resolução da tela antes de desenhar: cada coluna do
+# gráfico é um "balde" de dias consecutivos, desenhado como um traço do mínimo ao
+# máximo (abertura e fechamento ligam um balde ao outro). Fica igual ao desenho de
+# todos os pontos, com no máximo um segmento por pixel. Um dia novo só mexe no
+# último balde ou cria o próximo; mudanças de escala usam Canvas.scale/move, que
+# transformam os itens já desenhados sem recriá-los.
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: sem ele os baldes são calculados em Python puro
+    np = None
+
+MARGEM = 0.1                                # Folga acima e abaixo da faixa de preços
+MIN_BALDES = 32                             # Colunas iniciais de um histórico curto
+COR_LINHA = 'steelblue'
+COR_MOLDURA = 'gray80'
+
+
+# --- REDUÇÃO (sem Tk) ---
+def _balde(precos):
+    # [abertura, máxima, mínima, fechamento] ignorando NaN (dias antes da listagem)
+    valores = [p for p in precos if p == p]
+    if not valores:
+        return None
+    return [valores[0], max(valores), min(valores), valores[-1]]
+
+
+def _juntar(a, b):
+    # Balde que cobre a seguido de b
+    if a is None or b is None:
+        return b if a is None else a
+    return [a[0], max(a[1], b[1]), min(a[2], b[2]), b[3]]
+
+
+def baldes_min_max(precos, tamanho):
+    """Reduz `precos` a baldes de `tamanho` dias consecutivos (o último pode ser parcial).
+
+    Retorna uma lista de [abertura, máxima, mínima, fechamento]; balde sem preço vira None.
+    """
+    n = len(precos)
+    cheios = n // tamanho * tamanho
+    if np is None or cheios == 0:
+        return [_balde(precos[i:i + tamanho]) for i in range(0, n, tamanho)]
+    blocos = np.asarray(precos, dtype=np.float64)[:cheios].reshape(-1, tamanho)
+    maximas = np.fmax.reduce(blocos, axis=1)   # fmax/fmin ignoram NaN
+    minimas = np.fmin.reduce(blocos, axis=1)
+    abertura = np.where(np.isnan(blocos[:, 0]), minimas, blocos[:, 0])
+    fechamento = np.where(np.isnan(blocos[:, -1]), maximas, blocos[:, -1])
+    baldes = np.column_stack((abertura, maximas, minimas, fechamento)).tolist()
+    for i in np.flatnonzero(np.isnan(maximas)).tolist():
+        baldes[i] = None
+    if cheios < n:
+        baldes.append(_balde(precos[cheios:]))
+    return baldes
+
+
+# --- GRÁFICO DE UMA AÇÃO ---
+# Os baldes são alinhados em dias absolutos (balde k = dias [k * tamanho, (k + 1) * tamanho)),
+# então um dia novo sempre cai no último balde ou no seguinte. O balde k fica na coluna
+# k - primeiro_balde. Quando as colunas acabam, a largura de cada uma cai pela metade
+# (Canvas.scale); já na resolução de um pixel, os baldes são juntados de dois em dois.
+class GraficoPrecos:
+    def __init__(self, canvas, x, y, largura, altura, tag):
+        self.canvas = canvas
+        self.x, self.y = x, y
+        self.largura = max(1, int(largura))
+        self.altura = altura
+        self.tag = tag                      # Todos os itens deste gráfico
+        self._tag_linha = tag + '_linha'    # Só os traços (transformados juntos)
+        self.acao = None
+        self.dias = 0                       # dias_registrados da ação já desenhados
+        self.tamanho_balde = 1
+        self.primeiro_balde = 0
+        self.capacidade = MIN_BALDES        # Colunas disponíveis na largura
+        self.baldes = deque()
+        self.itens = deque()                # Item do Canvas de cada balde (ou None)
+        self.minimo = self.maximo = 0.0     # Faixa de preços mapeada na altura
+        self._texto = None
+
+    @property
+    def passo(self):
+        return self.largura / self.capacidade
+
+    def _x(self, i):
+        return self.x + (i + 0.5) * self.passo
+
+    def _y(self, preco):
+        return self.y + self.altura - (preco - self.minimo) * self.altura / (self.maximo - self.minimo)
+
+    # --- DESENHO COMPLETO ---
+    def mostrar(self, acao):
+        """Desenha do zero o histórico disponível de `acao`."""
+        self.canvas.delete(self.tag)
+        self.acao = acao
+        precos = acao.get_historico()
+        self.dias = acao.dias_registrados
+        n = len(precos)
+        primeiro_dia = self.dias - n
+        self.tamanho_balde = b = max(1, -(-n // self.largura))
+        self.primeiro_balde = primeiro_dia // b
+        # Primeiro balde parcial quando o histórico disponível não começa num múltiplo de b
+        inicio = min(n, -primeiro_dia % b)
+        baldes = [_balde(precos[:inicio])] if inicio else []
+        baldes += baldes_min_max(precos[inicio:], b)
+        self.baldes = deque(baldes)
+        self.capacidade = max(len(baldes), min(self.largura, max(MIN_BALDES, len(baldes) * 5 // 4)))
+        valores = [balde for balde in baldes if balde is not None]
+        self.minimo, self.maximo = self._faixa(min(v[2] for v in valores), max(v[1] for v in valores)) if valores else (0.0, 0.0)
+        self.canvas.create_rectangle(self.x, self.y, self.x + self.largura, self.y + self.altura,
+                                     outline=COR_MOLDURA, tags=(self.tag,))
+        self._texto = self.canvas.create_text(self.x + 3, self.y + 2, anchor='nw', font=('TkDefaultFont', 8),
+                                              tags=(self.tag,))
+        self._desenhar_tudo()
+
+    def _faixa(self, minimo, maximo):
+        # Faixa com folga (e altura mínima para preços constantes)
+        folga = (maximo - minimo) * MARGEM or max(abs(maximo) * MARGEM, 1e-6)
+        return minimo - folga, maximo + folga
+
+    def _desenhar_tudo(self):
+        self.canvas.delete(self._tag_linha)
+        self.itens = deque([None] * len(self.baldes))
+        for i in range(len(self.baldes)):
+            self._desenhar(i)
+        self._atualizar_texto()
+
+    def _desenhar(self, i):
+        balde = self.baldes[i]
+        item = self.itens[i]
+        if balde is None:
+            if item is not None:
+                self.canvas.delete(item)
+                self.itens[i] = None
+            return
+        x = self._x(i)
+        coords = []
+        anterior = self.baldes[i - 1] if i > 0 else None
+        if anterior is not None:            # Liga ao fechamento do balde anterior
+            coords += [self._x(i - 1), self._y(anterior[3])]
+        for preco in balde:
+            coords += [x, self._y(preco)]
+        if item is None:
+            self.itens[i] = self.canvas.create_line(*coords, fill=COR_LINHA, tags=(self.tag, self._tag_linha))
+        else:
+            self.canvas.coords(item, *coords)
+
+    def _atualizar_texto(self):
+        if self._texto is not None:
+            self.canvas.itemconfig(self._texto, text=f"{self.acao.nome}  ${self.acao.preco_atual:.2f}")
+
+    # --- ATUALIZAÇÃO INCREMENTAL ---
+    def atualizar(self, acao):
+        """Acrescenta ao desenho os dias registrados desde a última chamada."""
+        if acao is not self.acao:
+            return self.mostrar(acao)
+        novos = acao.dias_registrados - self.dias
+        if novos == 0:
+            return self._atualizar_texto()
+        precos = acao.get_historico()
+        if novos < 0 or novos > len(precos) // 2 or self.minimo == self.maximo:
+            return self.mostrar(acao)       # Muitos dias (ou outro histórico): sai mais barato redesenhar
+        b = self.tamanho_balde
+        sujo = len(self.baldes)             # Primeiro balde a redesenhar
+        menor, maior = self.minimo, self.maximo
+        for dia, preco in enumerate(precos[len(precos) - novos:].tolist(), start=self.dias):
+            if preco != preco:
+                continue
+            i = dia // b - self.primeiro_balde
+            if i == len(self.baldes):
+                self.baldes.append([preco, preco, preco, preco])
+                self.itens.append(None)
+            elif self.baldes[i] is None:
+                self.baldes[i] = [preco, preco, preco, preco]
+            else:
+                balde = self.baldes[i]
+                balde[1] = max(balde[1], preco)
+                balde[2] = min(balde[2], preco)
+                balde[3] = preco
+            sujo = min(sujo, i)
+            menor = min(menor, preco)
+            maior = max(maior, preco)
+        self.dias = acao.dias_registrados
+
+        # Histórico com buffer circular: os baldes que saíram da janela vão embora
+        descartar = (self.dias - len(precos)) // b - self.primeiro_balde
+        if descartar >= len(self.baldes):
+            return self.mostrar(acao)
+        if descartar > 0:
+            for _ in range(descartar):
+                self.baldes.popleft()
+                item = self.itens.popleft()
+                if item is not None:
+                    self.canvas.delete(item)
+            self.primeiro_balde += descartar
+            self.canvas.move(self._tag_linha, -descartar * self.passo, 0)
+            sujo = max(0, sujo - descartar)
+            self._desenhar(0)               # O novo primeiro balde perde a ligação com o anterior
+
+        if menor < self.minimo or maior > self.maximo:
+            self._reescalar(menor, maior)
+        if len(self.baldes) > self.capacidade and not self._crescer():
+            return self._desenhar_tudo()
+        for i in range(sujo, len(self.baldes)):
+            self._desenhar(i)
+        self._atualizar_texto()
+
+    def _crescer(self):
+        # Abre espaço para mais baldes. Retorna False se foi preciso reagrupar tudo.
+        if self.capacidade < self.largura:
+            nova = min(self.largura, 2 * self.capacidade)
+            self.canvas.scale(self._tag_linha, self.x, 0, self.capacidade / nova, 1)
+            self.capacidade = nova
+            return True
+        # Já num pixel por balde: baldes com o dobro de dias, juntados de dois em dois
+        k0 = self.primeiro_balde
+        baldes = []
+        for j, balde in enumerate(self.baldes):
+            i = (k0 + j) // 2 - k0 // 2
+            if i == len(baldes):
+                baldes.append(balde and list(balde))
+            else:
+                baldes[i] = _juntar(baldes[i], balde)
+        self.primeiro_balde = k0 // 2
+        self.tamanho_balde *= 2
+        self.baldes = deque(baldes)
+        return False
+
+    def _reescalar(self, menor, maior):
+        # Amplia a faixa de preços e leva os traços já desenhados para a nova escala:
+        # y' = base - (base - y) * fator + deslocamento (uma transformação linear)
+        folga = (max(maior, self.maximo) - min(menor, self.minimo)) * MARGEM
+        minimo = menor - folga if menor < self.minimo else self.minimo
+        maximo = maior + folga if maior > self.maximo else self.maximo
+        base = self.y + self.altura
+        fator = (self.maximo - self.minimo) / (maximo - minimo)
+        self.canvas.scale(self._tag_linha, 0, base, 1, fator)
+        self.canvas.move(self._tag_linha, 0, -(self.minimo - minimo) * self.altura / (maximo - minimo))
+        self.minimo, self.maximo = minimo, maximo
+
+    def apagar(self):
+        self.canvas.delete(self.tag)
+        self.acao = None
+
+
+# --- GRADE DE GRÁFICOS ---
+# Vários gráficos num único Canvas (um Canvas por gráfico pesaria mais no Tk).
+# Cada posição da grade guarda o seu gráfico: se a ação da posição não mudou, só
+# os dias novos são desenhados.
+class PainelGraficos:
+    def __init__(self, canvas, largura_grafico=210, altura_grafico=100, espaco=8):
+        self.canvas = canvas
+        self.largura_grafico = largura_grafico
+        self.altura_grafico = altura_grafico
+        self.espaco = espaco
+        self.graficos = []
+        self._colunas = 0
+
+    def exibir(self, acoes):
+        colunas = max(1, (self.canvas.winfo_width() - self.espaco) // (self.largura_grafico + self.espaco))
+        if colunas != self._colunas:        # Outra largura de janela: refaz a grade
+            for grafico in self.graficos:
+                grafico.apagar()
+            self.graficos = []
+            self._colunas = colunas
+        for grafico in self.graficos[len(acoes):]:
+            grafico.apagar()
+        del self.graficos[len(acoes):]
+        for i, acao in enumerate(acoes):
+            if i == len(self.graficos):
+                linha, coluna = divmod(i, colunas)
+                x = self.espaco + coluna * (self.largura_grafico + self.espaco)
+                y = self.espaco + linha * (self.altura_grafico + self.espaco)
+                self.graficos.append(GraficoPrecos(self.canvas, x, y, self.largura_grafico, self.altura_grafico, f'grafico{i}'))
+            self.graficos[i].atualizar(acao)
+        linhas = -(-len(acoes) // colunas)
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(),
+                                            self.espaco + linhas * (self.altura_grafico + self.espaco)))
@@ -1,139 +1,32 @@
+import os
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import perf
 from market import Mercado
 from player import Jogador
 from algorithms import buscar
-import random
-import heapq
-from collections import Counter
-
-# --- ALGORITMO 1: Hash com Extração para ações compradas ---
-class HashTableExtracao:
-    def __init__(self, size=101):
-        self.size = size                    # Tamanho da tabela hash
-        self.table = [None] * size          # Array de 101 posições
-
-    def _hash(self, key):
-        key_str = str(key)
-        # EXTRAÇÃO: pega primeiro + último caractere
-        extracao = (ord(key_str[0]) + ord(key_str[-1])) % self.size
-        return extracao
-
-    def insert(self, key, value):
-        idx = self._hash(key)               # Calcula posição
-        # Resolve colisão com linear probing
-        while self.table[idx] is not None and self.table[idx][0] != key:
-            idx = (idx + 1) % self.size
-        self.table[idx] = (key, value)      # Insere (nome, preço)
-
-    def all_items(self):
-        return [item for item in self.table if item is not None]  # Retorna tudo
-
-# --- ALGORITMO 2: Linear Probing para ações vendidas ---
-class LinearProbingTable:
-    def __init__(self, size=20):
-        self.size = size                    # Tabela menor
-        self.table = [None] * size
-
-    def _hash(self, key):
-        return sum(ord(c) for c in key) % self.size  # Soma ASCII de todos chars
-
-    def insert(self, key):
-        idx = self._hash(key)               # Posição inicial
-        for _ in range(self.size):
-            if self.table[idx] is None or self.table[idx] == key:
-                self.table[idx] = key       # Insere apenas nome
-                return
-            idx = (idx + 1) % self.size     # Próxima posição (linear)
-
-    def get_all(self):
-        return [k for k in self.table if k is not None]
-
-# --- ALGORITMO 3: Huffman para compressão ---
-class HuffmanNode:
-    def __init__(self, char, freq):
-        self.char = char                    # Caractere
-        self.freq = freq                    # Frequência
-        self.left = None                    # Filho esquerdo
-        self.right = None                   # Filho direito
-
-    def __lt__(self, other):
-        return self.freq < other.freq       # Para ordenação no heap
-
-def build_huffman_tree(text):
-    freq = Counter(text)                    # Conta frequência dos chars
-    heap = [HuffmanNode(ch, fr) for ch, fr in freq.items()]  # Cria nós
-    heapq.heapify(heap)                     # Min-heap
-    
-    while len(heap) > 1:                    # Constrói árvore
-        n1 = heapq.heappop(heap)            # Menor frequência
-        n2 = heapq.heappop(heap)            # Segunda menor
-        merged = HuffmanNode(None, n1.freq + n2.freq)  # Nó pai
-        merged.left = n1
-        merged.right = n2
-        heapq.heappush(heap, merged)        # De volta ao heap
-    
-    return heap[0] if heap else None
-
-def build_codes(node, prefix="", codebook=None):
-    if codebook is None:
-        codebook = {}
-    if node:
-        if node.char is not None:           # Folha da árvore
-            codebook[node.char] = prefix    # Associa char ao código
-        build_codes(node.left, prefix + "0", codebook)   # Esquerda = 0
-        build_codes(node.right, prefix + "1", codebook)  # Direita = 1
-    return codebook
-
-def huffman_compress(text):
-    tree = build_huffman_tree(text)         # Constrói árvore
-    codebook = build_codes(tree)            # Gera códigos binários
-    compressed = ''.join(codebook[ch] for ch in text)  # Comprime
-    return compressed, codebook
-
-# --- CONFIGURAÇÃO DOS DESAFIOS ---
-DESAFIOS = [
-    ("Lucre $50 em 10 dias", 50, 10),      # (descrição, meta, prazo)
-    ("Lucre $100 em 8 dias", 100, 8),
-    ("Lucre $200 em 7 dias", 200, 7),
-    ("Sobreviva 7 dias com saldo positivo", 0, 7),
-    ("Multiplique o saldo por 1.2 em 10 dias", 200, 10)
-]
-
-class Desafio:
-    def __init__(self, descricao, lucro_necessario, dias_max):
-        self.descricao = descricao          # Nome do desafio
-        self.lucro_necessario = lucro_necessario  # Meta de lucro
-        self.dias_max = dias_max            # Prazo limite
-        self.dia_atual = 0                  # Contador de dias
-        self.ativo = False                  # Status do desafio
-
-    def iniciar(self):
-        self.ativo = True                   # Ativa desafio
-        self.dia_atual = 0                  # Reseta contador
+from challenges import CONCLUIDO, DESAFIOS, MotorDesafios, retrato_de
+from compressao import huffman_compress, huffman_decompress
+from diario import formatar
+from estruturas import RecentesLRU
+from graficos import GraficoPrecos, PainelGraficos
+from sessao import AutoSalvamento, capturar, carregar_sessao, gravar
+from tempo_real import AvancoAutomatico
+from telas import acoes_listadas, linhas_mercado, linhas_carteira, texto_status
 
-    def avancar_dia(self):
-        if self.ativo:
-            self.dia_atual += 1             # Incrementa dia
-
-    def verificar_conclusao(self, lucro, saldo):
-        if not self.ativo:
-            return "inativo"
-        if "Sobreviva" in self.descricao:   # Desafio especial
-            if self.dia_atual >= self.dias_max:
-                self.ativo = False
-                return "concluido" if saldo > 0 else "falhou"
-        else:
-            if lucro >= self.lucro_necessario:  # Meta atingida
-                self.ativo = False
-                return "concluido"
-            elif self.dia_atual >= self.dias_max:  # Tempo esgotado
-                self.ativo = False
-                return "falhou"
-        return "em andamento"
 
 # --- CLASSE PRINCIPAL DA APLICAÇÃO ---
 class App:
+    ATRASO_FILTRO_MS = 150                  # Debounce dos campos de filtro
+    TAMANHO_PAGINA = 20                     # Resultados por página na busca do histórico
+    MAX_RECENTES = 20                       # Ações guardadas em cada lista de recentes
+    ARQUIVO_SESSAO = 'sessao.bolsa'         # Snapshot do salvamento automático
+    AUTOSALVAR_MS = 60_000                  # Intervalo do salvamento automático
+    DRENAR_MS = 50                          # Intervalo em que a fila do tempo real é esvaziada
+    ALTURA_GRAFICO = 140                    # Gráfico da ação selecionada na aba Mercado
+    MAX_GRAFICOS = 36                       # Gráficos na aba Gráficos (primeiras ações listadas)
+
     def __init__(self, root):
         # Configuração da janela
         self.root = root
@@ -143,16 +36,30 @@ class App:
         # Inicialização dos componentes
         self.mercado = Mercado()            # Sistema de ações
         self.jogador = Jogador("Investidor")  # Jogador com $1000
-        self.desafio_atual = None           # Desafio ativo
-        self.proximo_desafio = 0            # Índice do próximo desafio
+        self.desafios = MotorDesafios()     # Desafios em andamento (vários ao mesmo tempo)
+        self._desafios_encerrados = []      # Encerrados desde a última atualização da tela
+        self.proximo_desafio = 0            # Índice do próximo desafio a liberar
+
+        # Tempo real: uma thread avança os dias; a trava protege mercado, jogador e desafio.
+        # Regra: nunca chamar atualizar_tela() nem parar a thread segurando a trava.
+        self.trava = threading.RLock()
+        self.avanco = AvancoAutomatico(self._passo_dia)
 
         # Estruturas de dados dos algoritmos
-        self.recentes_vendidas = LinearProbingTable()    # Linear probing
-        self.recentes_compradas = HashTableExtracao()    # Hash extração
+        self.recentes_vendidas = RecentesLRU(self.MAX_RECENTES)   # LRU (hash + lista encadeada)
+        self.recentes_compradas = RecentesLRU(self.MAX_RECENTES)
 
-        # Filtro em tempo real (Rabin-Karp)
+        # Filtro em tempo real (índice de substrings), com debounce para não redesenhar a cada tecla
+        self._filtro_pendente = None
         self.busca_var_substring = tk.StringVar()
-        self.busca_var_substring.trace_add('write', lambda *args: self.atualizar_tela())
+        self.busca_var_substring.trace_add('write', self.agendar_filtro)
+
+        # Estado da renderização incremental (o que já está na tela)
+        self._linhas_mercado = {}           # nome -> valores exibidos no Treeview
+        self._ordem_mercado = []            # nomes visíveis, na ordem exibida
+        self._linhas_carteira = {}
+        self._ordem_carteira = []
+        self._linhas_historico = 0          # Linhas do histórico já inseridas no Text
 
         # Criação das abas
         self.tabs = ttk.Notebook(root)
@@ -162,51 +69,110 @@ class App:
         self.tab_carteira = ttk.Frame(self.tabs)
         self.tab_desafios = ttk.Frame(self.tabs)
         self.tab_historico = ttk.Frame(self.tabs)
+        self.tab_graficos = ttk.Frame(self.tabs)
+        self.tab_desempenho = ttk.Frame(self.tabs)
 
         self.tabs.add(self.tab_mercado, text='📈 Mercado')
         self.tabs.add(self.tab_carteira, text='💼 Carteira')
         self.tabs.add(self.tab_desafios, text='🎯 Desafios')
         self.tabs.add(self.tab_historico, text='📜 Histórico')
+        self.tabs.add(self.tab_graficos, text='📊 Gráficos')
+        self.tabs.add(self.tab_desempenho, text='⏱️ Desempenho')
 
         # Barra de status
         self.status_bar = tk.Label(root, text="Dia: 0 | Saldo: $1000.00", bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
-        # Configuração de cada aba
-        self.setup_mercado()
-        self.setup_carteira()
-        self.setup_desafios()
-        self.setup_historico()
+        # Abas: frame -> (montagem, atualização). Cada aba só é montada quando aparece pela
+        # primeira vez; atualizar_tela redesenha só a visível e marca as outras como
+        # desatualizadas, que são redesenhadas ao voltar a aparecer (<<NotebookTabChanged>>).
+        self._abas = {
+            self.tab_mercado: (self.setup_mercado, self.atualizar_aba_mercado),
+            self.tab_carteira: (self.setup_carteira, self.atualizar_carteira),
+            self.tab_desafios: (self.setup_desafios, self.atualizar_desafios_disponiveis),
+            self.tab_historico: (self.setup_historico, self.atualizar_historico),
+            self.tab_graficos: (self.setup_graficos, self.atualizar_graficos),
+            self.tab_desempenho: (self.setup_desempenho, self.atualizar_desempenho),
+        }
+        self._montadas = set()
+        self._desatualizadas = set()
+        self.tabs.bind('<<NotebookTabChanged>>', self.mostrar_aba)
+        self.mostrar_aba()                  # Monta a aba inicial (Mercado)
+        self.setup_menu()
+
+        # Salvamento automático: a captura é feita aqui e a gravação numa thread
+        self.autosalvamento = AutoSalvamento(self.ARQUIVO_SESSAO)
+        self.root.protocol("WM_DELETE_WINDOW", self.fechar)
+        if os.path.exists(self.ARQUIVO_SESSAO) and messagebox.askyesno("Sessão", "Continuar a última sessão salva?"):
+            self.abrir_sessao(self.ARQUIVO_SESSAO)
+        self.root.after(self.AUTOSALVAR_MS, self.autosalvar)
         self.atualizar_tela()
 
+    def setup_menu(self):
+        menu = tk.Menu(self.root)
+        arquivo = tk.Menu(menu, tearoff=0)
+        arquivo.add_command(label="Salvar Sessão...", command=self.salvar_sessao_como)
+        arquivo.add_command(label="Carregar Sessão...", command=self.carregar_sessao_arquivo)
+        arquivo.add_separator()
+        arquivo.add_command(label="Sair", command=self.fechar)
+        menu.add_cascade(label="Arquivo", menu=arquivo)
+        self.root.config(menu=menu)
+
     def setup_mercado(self):
-        # Label do desafio ativo
+        # Label dos desafios ativos
         self.label_desafio_mercado = ttk.Label(self.tab_mercado, text="", foreground="blue")
         self.label_desafio_mercado.pack(pady=5)
 
         # Botões dos algoritmos
         ttk.Button(self.tab_mercado, text="Ver Ações Recentemente Vendidas", command=self.mostrar_recentes_vendidas).pack(pady=2)
         ttk.Button(self.tab_mercado, text="Ver Ações Recentemente Compradas", command=self.mostrar_recentes_compradas).pack(pady=2)
-        ttk.Button(self.tab_mercado, text="Buscar Ação no Histórico (Sequencial)", command=self.buscar_acao_historico_sequencial).pack(pady=2)
+        ttk.Button(self.tab_mercado, text="Buscar Ação no Histórico (Índice)", command=self.buscar_acao_historico).pack(pady=2)
         ttk.Button(self.tab_mercado, text="Buscar Mercado (Binária)", command=self.buscar_mercado_binaria).pack(pady=2)
+        ttk.Button(self.tab_mercado, text="Ações por Faixa de Preço", command=self.buscar_faixa_preco).pack(pady=2)
 
-        # Container com scroll para muitas ações
+        # Lista virtualizada (Treeview só desenha as linhas visíveis)
         frame_acoes_container = ttk.Frame(self.tab_mercado)
         frame_acoes_container.pack(fill='both', expand=True, padx=10, pady=10)
-        canvas = tk.Canvas(frame_acoes_container)
-        scrollbar = ttk.Scrollbar(frame_acoes_container, orient='vertical', command=canvas.yview)
-        self.frame_acoes = ttk.Frame(canvas)
-        self.frame_acoes.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=self.frame_acoes, anchor='nw')
-        canvas.configure(yscrollcommand=scrollbar.set)
-        canvas.pack(side=tk.LEFT, fill='both', expand=True)
+        self.tree_mercado = ttk.Treeview(frame_acoes_container, columns=('acao', 'preco', 'qtde'), show='headings', selectmode='browse')
+        self.tree_mercado.heading('acao', text='Ação')
+        self.tree_mercado.heading('preco', text='Preço')
+        self.tree_mercado.heading('qtde', text='Qtde')
+        scrollbar = ttk.Scrollbar(frame_acoes_container, orient='vertical', command=self.tree_mercado.yview)
+        self.tree_mercado.configure(yscrollcommand=scrollbar.set)
+        self.tree_mercado.pack(side=tk.LEFT, fill='both', expand=True)
         scrollbar.pack(side=tk.RIGHT, fill='y')
 
+        # Gráfico da ação selecionada (histórico reduzido à largura do Canvas)
+        self.canvas_grafico = tk.Canvas(self.tab_mercado, height=self.ALTURA_GRAFICO, background='white', highlightthickness=0)
+        self.canvas_grafico.pack(fill='x', padx=10)
+        self.grafico_mercado = None
+        self.canvas_grafico.bind('<Configure>', self.redimensionar_grafico)
+        self.tree_mercado.bind('<<TreeviewSelect>>', lambda e: self.atualizar_grafico_mercado())
+
+        # Compra/venda da ação selecionada
+        frame_operacoes = ttk.Frame(self.tab_mercado)
+        frame_operacoes.pack(pady=2)
+        ttk.Button(frame_operacoes, text="Comprar", command=lambda: self.operar_selecionada(self.comprar_acao)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_operacoes, text="Vender", command=lambda: self.operar_selecionada(self.vender_acao)).pack(side=tk.LEFT)
+        ttk.Button(frame_operacoes, text="Ordem Limitada", command=lambda: self.operar_selecionada(self.enviar_ordem_limitada)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_operacoes, text="Minhas Ordens", command=self.mostrar_ordens).pack(side=tk.LEFT)
+
         # Botão avançar dia
         self.btn_avancar = ttk.Button(self.tab_mercado, text="⏭️ Avançar 1 Dia", command=self.avancar_dia)
         self.btn_avancar.pack(pady=5)
 
-        # Campo de filtro (usa Rabin-Karp)
+        # Tempo real: avança sozinho no ritmo escolhido (dias por segundo)
+        frame_tempo_real = ttk.Frame(self.tab_mercado)
+        frame_tempo_real.pack(pady=2)
+        self.tempo_real_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frame_tempo_real, text="▶️ Tempo real", variable=self.tempo_real_var,
+                        command=self.alternar_tempo_real).pack(side=tk.LEFT)
+        ttk.Label(frame_tempo_real, text="dias/s:").pack(side=tk.LEFT, padx=(10, 2))
+        self.ritmo_var = tk.StringVar(value="2")
+        self.ritmo_var.trace_add('write', self.ajustar_ritmo)
+        ttk.Spinbox(frame_tempo_real, from_=0.5, to=100, increment=0.5, textvariable=self.ritmo_var, width=6).pack(side=tk.LEFT)
+
+        # Campo de filtro (usa o índice de substrings)
         busca_frame_sub = ttk.Frame(self.tab_mercado)
         busca_frame_sub.pack(pady=5)
         ttk.Label(busca_frame_sub, text="Filtrar ações por substring:").pack(side=tk.LEFT)
@@ -216,12 +182,22 @@ class App:
         # Frame principal da carteira
         self.frame_carteira = ttk.Frame(self.tab_carteira)
         self.frame_carteira.pack(fill='both', expand=True, padx=10, pady=10)
+        colunas = ('acao', 'qtd', 'medio', 'atual', 'lucro')
+        self.tree_carteira = ttk.Treeview(self.frame_carteira, columns=colunas, show='headings')
+        for coluna, titulo in zip(colunas, ('Ação', 'Qtde', 'Preço Médio', 'Atual', 'Lucro')):
+            self.tree_carteira.heading(coluna, text=titulo)
+        self.tree_carteira.tag_configure('lucro', foreground='green')
+        self.tree_carteira.tag_configure('prejuizo', foreground='red')
+        scrollbar = ttk.Scrollbar(self.frame_carteira, orient='vertical', command=self.tree_carteira.yview)
+        self.tree_carteira.configure(yscrollcommand=scrollbar.set)
+        self.tree_carteira.pack(side=tk.LEFT, fill='both', expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill='y')
 
-        # Filtro da carteira (usa Rabin-Karp)
+        # Filtro da carteira (usa o índice de substrings)
         busca_frame = ttk.Frame(self.tab_carteira)
         busca_frame.pack(pady=5)
         self.busca_carteira_var = tk.StringVar()
-        self.busca_carteira_var.trace_add('write', lambda *args: self.atualizar_tela())
+        self.busca_carteira_var.trace_add('write', self.agendar_filtro)
         ttk.Label(busca_frame, text="Filtrar ações na carteira por substring:").pack(side=tk.LEFT)
         ttk.Entry(busca_frame, textvariable=self.busca_carteira_var, width=15).pack(side=tk.LEFT, padx=2)
 
@@ -233,7 +209,6 @@ class App:
         self.label_desafios.pack(pady=5)
         self.lista_desafios = ttk.Frame(self.frame_desafios)
         self.lista_desafios.pack()
-        self.atualizar_desafios_disponiveis()
 
     def setup_historico(self):
         # Frame do histórico
@@ -251,32 +226,116 @@ class App:
         # Botão da compressão Huffman
         ttk.Button(self.frame_historico, text="Ver Compressão Huffman", command=self.mostrar_historico_comprimido).pack(pady=2)
 
+    def setup_graficos(self):
+        # Grade de gráficos das primeiras ações listadas na aba Mercado (segue o filtro)
+        ttk.Label(self.tab_graficos, text=f"Primeiras {self.MAX_GRAFICOS} ações da lista do Mercado").pack(pady=5)
+        frame = ttk.Frame(self.tab_graficos)
+        frame.pack(fill='both', expand=True, padx=10, pady=5)
+        self.canvas_graficos = tk.Canvas(frame, background='white', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(frame, orient='vertical', command=self.canvas_graficos.yview)
+        self.canvas_graficos.configure(yscrollcommand=scrollbar.set)
+        self.canvas_graficos.pack(side=tk.LEFT, fill='both', expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill='y')
+        self.painel_graficos = PainelGraficos(self.canvas_graficos)
+        self.canvas_graficos.bind('<Configure>', lambda e: self.atualizar_graficos())
+
+    def setup_desempenho(self):
+        # Aba de desempenho: liga/desliga a instrumentação e mostra os tempos medidos
+        frame = ttk.Frame(self.tab_desempenho)
+        frame.pack(fill='both', expand=True, padx=10, pady=10)
+
+        controles = ttk.Frame(frame)
+        controles.pack(fill='x', pady=5)
+        self.perf_ativo_var = tk.BooleanVar(value=perf.ativo())
+        ttk.Checkbutton(controles, text="Medir desempenho", variable=self.perf_ativo_var,
+                        command=lambda: perf.ativar(self.perf_ativo_var.get())).pack(side=tk.LEFT)
+        ttk.Button(controles, text="Atualizar", command=self.atualizar_desempenho).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controles, text="Zerar", command=lambda: (perf.zerar(), self.atualizar_desempenho())).pack(side=tk.LEFT)
+        ttk.Button(controles, text="Exportar CSV", command=lambda: self.exportar_desempenho('csv')).pack(side=tk.LEFT, padx=5)
+        ttk.Button(controles, text="Exportar JSON", command=lambda: self.exportar_desempenho('json')).pack(side=tk.LEFT)
+        ttk.Button(controles, text="Perfilar 1 dia (cProfile)", command=self.perfilar_dia).pack(side=tk.LEFT, padx=5)
+
+        colunas = ('nome', 'chamadas', 'media_ms', 'p50_ms', 'p99_ms', 'max_ms', 'total_ms')
+        self.tree_desempenho = ttk.Treeview(frame, columns=colunas, show='headings', height=8)
+        for coluna, titulo in zip(colunas, ('Medição', 'Chamadas', 'Média (ms)', 'p50 (ms)', 'p99 (ms)', 'Máx (ms)', 'Total (ms)')):
+            self.tree_desempenho.heading(coluna, text=titulo)
+            self.tree_desempenho.column(coluna, width=160 if coluna == 'nome' else 90, anchor=tk.W if coluna == 'nome' else tk.E)
+        self.tree_desempenho.pack(fill='x')
+
+        # Relatório do cProfile
+        self.texto_cprofile = tk.Text(frame, height=15, state='disabled', font=('Courier', 9))
+        self.texto_cprofile.pack(fill='both', expand=True, pady=5)
+
+    def atualizar_desempenho(self):
+        self.tree_desempenho.delete(*self.tree_desempenho.get_children())
+        for linha in perf.resumo():
+            self.tree_desempenho.insert('', tk.END, values=(
+                linha['nome'], linha['chamadas'], f"{linha['media_ms']:.3f}", f"{linha['p50_ms']:.3f}",
+                f"{linha['p99_ms']:.3f}", f"{linha['max_ms']:.3f}", f"{linha['total_ms']:.1f}"))
+
+    def exportar_desempenho(self, formato):
+        caminho = filedialog.asksaveasfilename(defaultextension=f".{formato}", filetypes=[(formato.upper(), f"*.{formato}")])
+        if not caminho:
+            return
+        if formato == 'csv':
+            perf.exportar_csv(caminho)
+        else:
+            perf.exportar_json(caminho)
+        messagebox.showinfo("Desempenho", f"Medições exportadas para {caminho}")
+
+    def perfilar_dia(self):
+        # Avança um dia sob o cProfile e mostra as funções mais caras
+        _, relatorio = perf.capturar_cprofile(self.avancar_dia)
+        self.texto_cprofile.config(state='normal')
+        self.texto_cprofile.delete(1.0, tk.END)
+        self.texto_cprofile.insert(tk.END, relatorio)
+        self.texto_cprofile.config(state='disabled')
+        self.atualizar_desempenho()
+
     # --- FUNÇÕES DOS ALGORITMOS ---
 
     def mostrar_recentes_vendidas(self):
-        # ALGORITMO: Linear Probing - mostra ações vendidas
-        vendidas = self.recentes_vendidas.get_all()
-        messagebox.showinfo("Ações Recentemente Vendidas", "\n".join(vendidas) if vendidas else "Nenhuma ação vendida recentemente.")
+        # ALGORITMO: LRU - mostra ações vendidas, da mais recente para a mais antiga
+        vendidas = self.recentes_vendidas.itens()
+        if vendidas:
+            lista = "\n".join([f"{nome}: ${preco:.2f} (dia {dia})" for nome, preco, dia in vendidas])
+            messagebox.showinfo("Ações Recentemente Vendidas", lista)
+        else:
+            messagebox.showinfo("Ações Recentemente Vendidas", "Nenhuma ação vendida recentemente.")
 
     def mostrar_recentes_compradas(self):
-        # ALGORITMO: Hash Extração - mostra ações compradas
-        compradas = self.recentes_compradas.all_items()
+        # ALGORITMO: LRU - mostra ações compradas, da mais recente para a mais antiga
+        compradas = self.recentes_compradas.itens()
         if compradas:
-            lista = "\n".join([f"{nome}: ${preco:.2f}" for nome, preco in compradas])
+            lista = "\n".join([f"{nome}: ${preco:.2f} (dia {dia})" for nome, preco, dia in compradas])
             messagebox.showinfo("Ações Recentemente Compradas", lista)
         else:
             messagebox.showinfo("Ações Recentemente Compradas", "Nenhuma ação comprada recentemente.")
 
-    def buscar_acao_historico_sequencial(self):
-        # ALGORITMO: Busca Sequencial - percorre histórico
-        nome = simpledialog.askstring("Busca Sequencial", "Nome da ação para buscar no histórico:")
+    def buscar_acao_historico(self):
+        # ALGORITMO: Índice invertido do diário - todas as ocorrências da ação, por página
+        nome = simpledialog.askstring("Busca no Histórico", "Nome da ação para buscar no histórico:")
         if not nome:
             return
-        for linha in self.jogador.historico:
-            if nome.lower() in linha.lower():
-                messagebox.showinfo("Busca Sequencial", f"Ação encontrada no histórico:\n{linha}")
+        diario = self.jogador.diario
+        nomes = [diario.nomes[i] for i in diario.ids_por_nome(nome)]
+        if not nomes:  # Sem nome exato: usa as ações que contêm o texto
+            nomes = [n for n in self.mercado.filtrar_por_substring(nome) if n in diario.ids]
+        pagina = 0
+        while True:
+            registros, total = diario.buscar(nomes, pagina=pagina, por_pagina=self.TAMANHO_PAGINA) if nomes else ([], 0)
+            if not total:
+                messagebox.showwarning("Busca no Histórico", "Ação não encontrada no histórico.")
+                return
+            inicio = pagina * self.TAMANHO_PAGINA
+            texto = "\n".join(f"Dia {r.dia}: {formatar(r)}" for r in registros)
+            cabecalho = f"Ocorrências {inicio + 1}-{inicio + len(registros)} de {total}:\n\n"
+            if inicio + len(registros) >= total:
+                messagebox.showinfo("Busca no Histórico", cabecalho + texto)
                 return
-        messagebox.showwarning("Busca Sequencial", "Ação não encontrada no histórico.")
+            if not messagebox.askyesno("Busca no Histórico", cabecalho + texto + "\n\nVer próxima página?"):
+                return
+            pagina += 1
 
     def mostrar_historico_comprimido(self):
         # ALGORITMO: Huffman - comprime histórico
@@ -286,175 +345,452 @@ class App:
             return
         compressed, codebook = huffman_compress(historico_str)
         tamanho_original = len(historico_str.encode('utf-8'))
-        tamanho_comprimido = len(compressed) // 8 + 1
-        messagebox.showinfo("Huffman", f"Tamanho original: {tamanho_original} bytes\nTamanho comprimido: {tamanho_comprimido} bytes")
+        tamanho_comprimido = len(compressed)  # Bytes reais, incluindo o cabeçalho
+        confere = huffman_decompress(compressed) == historico_str
+        messagebox.showinfo("Huffman", f"Tamanho original: {tamanho_original} bytes\nTamanho comprimido: {tamanho_comprimido} bytes\n"
+                                       f"Taxa: {tamanho_comprimido / tamanho_original:.1%} | Símbolos: {len(codebook)}\n"
+                                       f"Descompressão {'confere' if confere else 'NÃO confere'} com o original")
 
     def buscar_mercado_binaria(self):
-        # ALGORITMO: Busca Binária - busca no mercado ordenado
-        nome = simpledialog.askstring("Busca Binária", "Nome da ação no mercado:")
+        # ALGORITMO: Busca Binária - busca exata ou por prefixo na visão ordenada do mercado
+        nome = simpledialog.askstring("Busca Binária", "Nome (ou início do nome) da ação no mercado:")
         if not nome:
             return
-        acoes = sorted(self.mercado.listar_acoes(), key=lambda x: x[0])  # Ordena primeiro
-        nomes = [n for n, _ in acoes]
-        idx = buscar('binaria', nomes, nome)  # Busca binária do algorithms.py
-        if idx != -1:
-            messagebox.showinfo("Busca Binária", f"Ação encontrada: {acoes[idx][0]} - ${acoes[idx][1]:.2f}")
+        with self.trava:
+            nomes = self.mercado.ordenadas_por_nome()  # Ordenada uma vez, refeita só ao listar/deslistar
+            idx = buscar('binaria', nomes, nome)  # Busca binária do algorithms.py
+            acao = self.mercado.get_acao_por_nome(nomes[idx]) if idx != -1 else None
+            preco = acao.preco_atual if acao else None
+            encontrados = [] if acao else buscar('prefixo', nomes, nome)
+            # Nem exata nem prefixo: sugere os nomes mais parecidos (erros de digitação)
+            parecidos = [] if acao or encontrados else self.mercado.buscar_aproximado(nome, 5, max(1, len(nome) // 3))
+        if acao:
+            messagebox.showinfo("Busca Binária", f"Ação encontrada: {acao.nome} - ${preco:.2f}")
+        elif encontrados:
+            self._mostrar_lista("Busca Binária", f"Ações que começam com '{nome}'", encontrados)
+        elif parecidos:
+            self._mostrar_lista("Busca Binária", f"'{nome}' não encontrada. Você quis dizer",
+                                [parecido for _, parecido in parecidos])
         else:
             messagebox.showwarning("Busca Binária", "Ação não encontrada.")
 
+    def buscar_faixa_preco(self):
+        # ALGORITMO: Busca Binária - limites inferior/superior na visão ordenada por preço
+        minimo = simpledialog.askfloat("Faixa de Preço", "Preço mínimo:", minvalue=0.0)
+        if minimo is None:
+            return
+        maximo = simpledialog.askfloat("Faixa de Preço", "Preço máximo:", minvalue=minimo)
+        if maximo is None:
+            return
+        with self.trava:
+            acoes = self.mercado.faixa_de_preco(minimo, maximo)
+        if not acoes:
+            messagebox.showinfo("Faixa de Preço", f"Nenhuma ação entre ${minimo:.2f} e ${maximo:.2f}.")
+            return
+        self._mostrar_lista("Faixa de Preço", f"Ações entre ${minimo:.2f} e ${maximo:.2f}",
+                            [f"{nome} - ${preco:.2f}" for nome, preco in acoes])
+
+    def _mostrar_lista(self, titulo, cabecalho, linhas, limite=30):
+        texto = "\n".join(linhas[:limite])
+        if len(linhas) > limite:
+            texto += f"\n... e mais {len(linhas) - limite}"
+        messagebox.showinfo(titulo, f"{cabecalho} ({len(linhas)}):\n{texto}")
+
     def atualizar_historico(self):
-        # Atualiza texto do histórico e calcula lucro
-        self.historico_text.config(state='normal')
-        self.historico_text.delete(1.0, tk.END)
-        for linha in self.jogador.historico:
-            self.historico_text.insert(tk.END, linha + "\n")
-        self.historico_text.config(state='disabled')
+        # Acrescenta só as linhas novas do histórico e calcula lucro
+        historico = self.jogador.historico
+        if len(historico) != self._linhas_historico:
+            self.historico_text.config(state='normal')
+            if len(historico) < self._linhas_historico:  # Histórico foi trocado: redesenha
+                self.historico_text.delete(1.0, tk.END)
+                self._linhas_historico = 0
+            novas = historico[self._linhas_historico:]
+            self.historico_text.insert(tk.END, "".join(linha + "\n" for linha in novas))
+            self._linhas_historico = len(historico)
+            self.historico_text.config(state='disabled')
         
         lucro = self.jogador.saldo + self.calcular_lucro_total() - 1000.0
         cor = "green" if lucro >= 0 else "red"
         self.label_lucro_total.config(text=f"Lucro/Prejuízo Total: ${lucro:.2f}", foreground=cor)
 
     def atualizar_desafios_disponiveis(self):
-        # Mostra próximo desafio disponível
+        # Desafios já liberados: os em andamento mostram o prazo, os outros podem ser iniciados
         for widget in self.lista_desafios.winfo_children():
             widget.destroy()
 
-        if self.proximo_desafio < len(DESAFIOS):
-            desc, lucro, dias = DESAFIOS[self.proximo_desafio]
+        ativos = {d.meta: d for d in self.desafios.ativos()}
+        for i, meta in enumerate(DESAFIOS[:self.proximo_desafio + 1]):
             frame = ttk.Frame(self.lista_desafios, padding=5)
-            frame.pack()
-            lbl = ttk.Label(frame, text=desc)
-            lbl.pack(side=tk.LEFT, padx=5)
-            btn = ttk.Button(frame, text="Iniciar Desafio", command=self.iniciar_desafio)
-            btn.pack(side=tk.LEFT, padx=5)
-        else:
-            lbl = ttk.Label(self.lista_desafios, text="Todos os desafios foram concluídos! 🎉")
-            lbl.pack()
-
-    def iniciar_desafio(self):
-        # Inicia o próximo desafio
-        desc, lucro, dias = DESAFIOS[self.proximo_desafio]
-        self.desafio_atual = Desafio(desc, lucro, dias)
-        self.desafio_atual.iniciar()
+            frame.pack(fill='x')
+            marca = "✔ " if i < self.proximo_desafio else ""
+            ttk.Label(frame, text=marca + meta.descricao).pack(side=tk.LEFT, padx=5)
+            if meta in ativos:
+                ttk.Label(frame, text=f"em andamento até o dia {ativos[meta].dia_limite}", foreground="blue").pack(side=tk.RIGHT, padx=5)
+            else:
+                ttk.Button(frame, text="Iniciar Desafio", command=lambda i=i: self.iniciar_desafio(i)).pack(side=tk.RIGHT, padx=5)
+        if self.proximo_desafio >= len(DESAFIOS):
+            ttk.Label(self.lista_desafios, text="Todos os desafios foram concluídos! 🎉").pack()
+
+    def iniciar_desafio(self, indice):
+        # Inicia o desafio (os que já estão em andamento continuam)
+        meta = DESAFIOS[indice]
+        with self.trava:
+            self.desafios.iniciar(meta, retrato_de(self.jogador, self.mercado))
+        self.invalidar(self.tab_desafios)
         self.tabs.select(self.tab_mercado)
-        messagebox.showinfo("Desafio Iniciado", f"{desc}")
+        messagebox.showinfo("Desafio Iniciado", meta.descricao)
         self.atualizar_tela()
 
+    @perf.medido('app.atualizar_tela')
     def atualizar_tela(self):
         # FUNÇÃO PRINCIPAL - atualiza toda a interface
-        # Mostra desafio ativo
-        self.label_desafio_mercado.config(text=f"Desafio: {self.desafio_atual.descricao}" if self.desafio_atual and self.desafio_atual.ativo else "")
+        # (segura a trava só enquanto lê o estado: as janelas de aviso ficam de fora)
+        with self.trava:
+            # Barra de status (sempre visível)
+            lucro_total = self.calcular_lucro_total()
+            self.status_bar.config(text=texto_status(self.mercado, self.jogador, lucro_total))
+
+            # Abas que mostram o estado do jogo: só a visível é redesenhada agora
+            self.invalidar(self.tab_mercado, self.tab_carteira, self.tab_historico, self.tab_graficos)
+
+            # Desafios encerrados nos dias avançados desde a última vez
+            encerrados, self._desafios_encerrados = self._desafios_encerrados, []
+        if not encerrados:
+            return
+        if self.avanco.rodando:
+            self.parar_tempo_real()         # Não segue avançando atrás da janela de aviso
+        for desafio in encerrados:
+            if desafio.status == CONCLUIDO:
+                messagebox.showinfo("Desafio", f"Parabéns! Você concluiu o desafio: {desafio.descricao}")
+                if self.proximo_desafio < len(DESAFIOS) and DESAFIOS[self.proximo_desafio] == desafio.meta:
+                    self.proximo_desafio += 1
+            else:
+                messagebox.showwarning("Desafio", f"Você falhou no desafio: {desafio.descricao}")
+        self.invalidar(self.tab_desafios)
+
+    # --- ABAS ---
+    def aba_visivel(self):
+        return self.root.nametowidget(self.tabs.select())
+
+    def mostrar_aba(self, event=None):
+        # Monta a aba na primeira vez que aparece e redesenha se estiver desatualizada
+        aba = self.aba_visivel()
+        if aba not in self._montadas:
+            self._montadas.add(aba)
+            self._abas[aba][0]()
+            self._desatualizadas.add(aba)
+        if aba in self._desatualizadas:
+            self._desatualizadas.discard(aba)
+            with self.trava:
+                self._abas[aba][1]()
+
+    def invalidar(self, *abas):
+        # Redesenha agora a aba visível; as outras (já montadas) ficam para quando aparecerem
+        visivel = self.aba_visivel()
+        for aba in abas:
+            if aba is visivel and aba in self._montadas:
+                with self.trava:
+                    self._abas[aba][1]()
+            elif aba in self._montadas:
+                self._desatualizadas.add(aba)
+
+    def atualizar_aba_mercado(self):
+        ativos = self.desafios.ativos()
+        self.label_desafio_mercado.config(text="Desafios: " + " | ".join(d.descricao for d in ativos) if ativos else "")
+        self.atualizar_mercado()
+        self.atualizar_grafico_mercado()
+
+    # --- SESSÃO (SNAPSHOT) ---
+    def capturar_sessao(self):
+        with self.trava:
+            return capturar(self.mercado, self.jogador, self.desafios, self.capturar_sessao_extras())
+
+    def capturar_sessao_extras(self):
+        return {
+            'proximo_desafio': self.proximo_desafio,
+            'recentes_compradas': self.recentes_compradas.itens(),
+            'recentes_vendidas': self.recentes_vendidas.itens(),
+        }
+
+    def autosalvar(self):
+        # Se a gravação anterior ainda não terminou, esta rodada é pulada
+        if self.autosalvamento.erro is not None:
+            erro, self.autosalvamento.erro = self.autosalvamento.erro, None
+            messagebox.showerror("Salvamento Automático", f"A sessão não foi salva: {erro}")
+        self.autosalvamento.salvar(self.capturar_sessao())
+        self.root.after(self.AUTOSALVAR_MS, self.autosalvar)
+
+    def salvar_sessao_como(self):
+        caminho = filedialog.asksaveasfilename(defaultextension=".bolsa", filetypes=[("Sessão", "*.bolsa")])
+        if not caminho:
+            return
+        try:
+            gravar(self.capturar_sessao(), caminho)
+        except OSError as erro:
+            messagebox.showerror("Salvar Sessão", str(erro))
+
+    def carregar_sessao_arquivo(self):
+        caminho = filedialog.askopenfilename(filetypes=[("Sessão", "*.bolsa"), ("Todos", "*.*")])
+        if caminho:
+            self.abrir_sessao(caminho)
+            self.atualizar_tela()
 
-        # Atualiza lista de ações no mercado
-        for widget in self.frame_acoes.winfo_children():
-            widget.destroy()
-        filtro = self.busca_var_substring.get()
-        acoes = self.mercado.listar_acoes()
-        
-        # ALGORITMO: Rabin-Karp - filtra ações por substring
-        if filtro:
-            acoes = [(nome, preco) for nome, preco in acoes if buscar('rabin_karp', nome, filtro) != -1]
-        
-        # Cria widgets para cada ação
-        for nome, preco in acoes:
-            qtd = self.jogador.carteira.get(nome, (0,))[0]
-            frame = ttk.Frame(self.frame_acoes, relief=tk.RIDGE, padding=10)
-            frame.pack(fill='x', pady=5)
-            lbl = ttk.Label(frame, text=f"{nome} - ${preco:.2f}  |  Qtde: {qtd}")
-            lbl.pack(side=tk.LEFT)
-            ttk.Button(frame, text="Comprar", command=lambda n=nome: self.comprar_acao(n)).pack(side=tk.LEFT, padx=5)
-            ttk.Button(frame, text="Vender", command=lambda n=nome: self.vender_acao(n)).pack(side=tk.LEFT)
-
-        # Atualiza carteira
-        for widget in self.frame_carteira.winfo_children():
-            widget.destroy()
-        filtro_carteira = self.busca_carteira_var.get()
-        carteira_itens = list(self.jogador.carteira.items())
-        
-        # ALGORITMO: Rabin-Karp - filtra carteira
-        if filtro_carteira:
-            carteira_itens = [(nome, v) for nome, v in carteira_itens if buscar('rabin_karp', nome, filtro_carteira) != -1]
-        
-        # Mostra cada ação da carteira com lucro/prejuízo
-        for nome, (qtd, preco_medio) in carteira_itens:
-            acao = self.mercado.get_acao_por_nome(nome)
-            lucro = round((acao.preco_atual - preco_medio) * qtd, 2)
-            cor = "green" if lucro >= 0 else "red"
-            txt = f"{nome}: {qtd} ações | Preço Médio: ${preco_medio:.2f} | Atual: ${acao.preco_atual:.2f} | Lucro: ${lucro:.2f}"
-            lbl = tk.Label(self.frame_carteira, text=txt, fg=cor)
-            lbl.pack(anchor='w', pady=2)
-
-        # Atualiza status bar
-        lucro_total = self.calcular_lucro_total()
-        self.status_bar.config(text=f"Dia: {self.mercado.dia} | Saldo: ${self.jogador.saldo:.2f} | Lucro Total: ${lucro_total:.2f}")
-
-        self.atualizar_historico()
-
-        # Verifica status do desafio
-        if self.desafio_atual:
-            status = self.desafio_atual.verificar_conclusao(lucro_total, self.jogador.saldo)
-            if status == "concluido":
-                messagebox.showinfo("Desafio", "Parabéns! Você concluiu o desafio!")
-                self.proximo_desafio += 1
-                self.desafio_atual = None
-                self.atualizar_desafios_disponiveis()
-            elif status == "falhou":
-                messagebox.showwarning("Desafio", "Você falhou no desafio.")
-                self.desafio_atual = None
-                self.atualizar_desafios_disponiveis()
+    def abrir_sessao(self, caminho):
+        if self.avanco.rodando:
+            self.parar_tempo_real()
+        try:
+            sessao = carregar_sessao(caminho, mapear=False)  # A sessão é regravada no mesmo arquivo
+        except (OSError, ValueError) as erro:
+            messagebox.showerror("Carregar Sessão", f"Não foi possível carregar a sessão: {erro}")
+            return
+        self.mercado = sessao.mercado
+        self.jogador = sessao.jogador
+        self.desafios = sessao.desafios if sessao.desafios is not None else MotorDesafios()
+        self._desafios_encerrados = []
+        self.proximo_desafio = sessao.extras.get('proximo_desafio', 0)
+        for nome, lista in (('recentes_compradas', self.recentes_compradas), ('recentes_vendidas', self.recentes_vendidas)):
+            while lista.descartar_mais_antigo() is not None:
+                pass
+            for chave, valor, dia in reversed(sessao.extras.get(nome, [])):
+                lista.registrar(chave, valor, dia)
+        # O histórico exibido é de outro diário: redesenha do zero
+        if self.tab_historico in self._montadas:
+            self.historico_text.config(state='normal')
+            self.historico_text.delete(1.0, tk.END)
+            self.historico_text.config(state='disabled')
+        self._linhas_historico = 0
+        self.invalidar(self.tab_desafios)
+
+    def fechar(self):
+        # Espera uma gravação em andamento e salva a sessão antes de sair
+        self.avanco.parar()
+        self.autosalvamento.aguardar()
+        try:
+            gravar(self.capturar_sessao(), self.ARQUIVO_SESSAO)
+        except OSError as erro:
+            if not messagebox.askyesno("Sair", f"Não foi possível salvar a sessão ({erro}). Sair mesmo assim?"):
+                return
+        self.root.destroy()
+
+    # --- RENDERIZAÇÃO INCREMENTAL ---
+
+    def agendar_filtro(self, *args):
+        # Debounce: só filtra quando o usuário para de digitar por ATRASO_FILTRO_MS
+        if self._filtro_pendente is not None:
+            self.root.after_cancel(self._filtro_pendente)
+        self._filtro_pendente = self.root.after(self.ATRASO_FILTRO_MS, self._aplicar_filtro)
+
+    def _aplicar_filtro(self):
+        self._filtro_pendente = None
+        self.atualizar_tela()
+
+    def _sincronizar_tree(self, tree, linhas, ordem_atual, novas_linhas, existe):
+        # Aplica em `tree` só a diferença entre o que está na tela e `novas_linhas`
+        # (lista de (iid, valores, tags)). Linhas filtradas ficam desanexadas para
+        # reaproveitamento; as que `existe(iid)` rejeita são apagadas.
+        # Retorna a nova ordem de iids visíveis.
+        ordem = []
+        for iid, valores, tags in novas_linhas:
+            anterior = linhas.get(iid)
+            if anterior is None:
+                tree.insert('', tk.END, iid=iid, values=valores, tags=tags)
+            elif anterior != (valores, tags):
+                tree.item(iid, values=valores, tags=tags)
+            linhas[iid] = (valores, tags)
+            ordem.append(iid)
+        if ordem != ordem_atual:
+            tree.set_children('', *ordem)   # Reordena e desanexa as linhas filtradas
+        if len(linhas) > len(ordem):
+            visiveis = set(ordem)
+            for iid in [i for i in linhas if i not in visiveis and not existe(i)]:
+                tree.delete(iid)
+                del linhas[iid]
+        return ordem
+
+    def atualizar_mercado(self):
+        linhas = linhas_mercado(self.mercado, self.jogador.carteira, self.busca_var_substring.get())
+        self._ordem_mercado = self._sincronizar_tree(self.tree_mercado, self._linhas_mercado, self._ordem_mercado, linhas,
+                                                     self.mercado.__contains__)
+
+    def redimensionar_grafico(self, event):
+        # Nova largura: o gráfico é refeito na próxima atualização
+        self.grafico_mercado = GraficoPrecos(self.canvas_grafico, 0, 0, event.width - 1, self.ALTURA_GRAFICO - 1, 'selecionada')
+        self.canvas_grafico.delete('all')
+        self.atualizar_grafico_mercado()
+
+    def atualizar_grafico_mercado(self):
+        # Ação selecionada (ou a primeira da lista); só os dias novos são desenhados
+        if self.grafico_mercado is None:
+            return
+        selecao = self.tree_mercado.selection()
+        nome = selecao[0] if selecao else (self._ordem_mercado[0] if self._ordem_mercado else None)
+        with self.trava:
+            acao = self.mercado.get_acao_por_nome(nome) if nome else None
+            if acao is None:
+                self.grafico_mercado.apagar()
+            else:
+                self.grafico_mercado.atualizar(acao)
+
+    def atualizar_graficos(self):
+        with self.trava:
+            listadas = acoes_listadas(self.mercado, self.busca_var_substring.get())[:self.MAX_GRAFICOS]
+            self.painel_graficos.exibir([self.mercado.get_acao_por_nome(nome) for nome, _ in listadas])
+
+    def atualizar_carteira(self):
+        linhas = linhas_carteira(self.mercado, self.jogador, self.busca_carteira_var.get())
+        self._ordem_carteira = self._sincronizar_tree(self.tree_carteira, self._linhas_carteira, self._ordem_carteira, linhas,
+                                                      self.jogador.carteira.__contains__)
+
+    def operar_selecionada(self, operacao):
+        selecao = self.tree_mercado.selection()
+        if not selecao:
+            messagebox.showinfo("Operação", "Selecione uma ação na lista.")
+            return
+        operacao(selecao[0])
 
     def avancar_dia(self):
         # Avança um dia no simulador
-        self.gerar_noticia_mercado()        # 30% chance de notícia
-        self.mercado.avancar_dia()          # Atualiza preços
-        if self.desafio_atual:
-            self.desafio_atual.avancar_dia()  # Incrementa contador
+        self.notificar_execucoes(self._passo_dia())
         self.atualizar_tela()
 
+    def _passo_dia(self):
+        # Um dia de simulação sem tocar no Tk (também roda na thread do tempo real).
+        # Retorna as execuções de ordens limitadas do dia.
+        with self.trava:
+            self.mercado.ordens.execucoes = []
+            self.gerar_noticia_mercado()    # 30% chance de notícia (pode executar ordens)
+            execucoes = self.mercado.ordens.execucoes
+            self.mercado.ordens.execucoes = []  # avancar_dia só casa (e troca a lista) se ainda houver ordens
+            self.mercado.avancar_dia()      # Atualiza preços e casa as ordens limitadas
+            # Desafios avaliados todo dia (O(1) cada), mesmo que a tela só seja redesenhada depois
+            self._desafios_encerrados += self.desafios.atualizar(retrato_de(self.jogador, self.mercado))
+            return execucoes + self.mercado.ordens.execucoes
+
+    # --- TEMPO REAL ---
+    def alternar_tempo_real(self):
+        if self.tempo_real_var.get():
+            self.ajustar_ritmo()
+            self.avanco.iniciar()
+            self.btn_avancar.config(state='disabled')
+            self.root.after(self.DRENAR_MS, self.drenar_tempo_real)
+        else:
+            self.parar_tempo_real()
+
+    def parar_tempo_real(self):
+        self.avanco.parar()
+        self.tempo_real_var.set(False)
+        self.btn_avancar.config(state='normal')
+        self.drenar_tempo_real()            # Mostra o que ficou na fila
+
+    def ajustar_ritmo(self, *args):
+        try:
+            ritmo = float(self.ritmo_var.get())
+        except ValueError:
+            return
+        if ritmo > 0:
+            self.avanco.dias_por_segundo = ritmo
+
+    def drenar_tempo_real(self):
+        # Junta tudo o que a thread produziu desde a última vez e redesenha uma única vez
+        atualizacoes = self.avanco.drenar()
+        if atualizacoes:
+            self.notificar_execucoes([e for execucoes in atualizacoes for e in execucoes], avisar=False)
+            self.atualizar_tela()
+        if self.avanco.erro is not None:
+            erro, self.avanco.erro = self.avanco.erro, None
+            self.parar_tempo_real()
+            messagebox.showerror("Tempo Real", f"O avanço automático parou: {erro}")
+        elif self.avanco.rodando:
+            self.root.after(self.DRENAR_MS, self.drenar_tempo_real)
+
     def gerar_noticia_mercado(self):
         # Gera notícia aleatória que afeta preço de ação
-        if random.random() < 0.3:           # 30% de chance
-            acoes = self.mercado.listar_acoes()
-            if not acoes:
-                return
-            nome, _ = random.choice(acoes)   # Escolhe ação aleatória
-            impacto = random.choice([-1, 1]) * random.uniform(0.05, 0.2)  # ±5% a ±20%
-            acao = self.mercado.get_acao_por_nome(nome)
-            acao.preco_atual *= (1 + impacto)
-            acao.preco_atual = max(1, round(acao.preco_atual, 2))
-            noticia = f"Notícia: {'Boa' if impacto > 0 else 'Ruim'} para {nome}! Preço alterado para ${acao.preco_atual:.2f}"
-            self.jogador.historico.append(noticia)
+        noticia = self.mercado.gerar_noticia()  # 30% de chance, ±5% a ±20%
+        if noticia:
+            acao, impacto = noticia
+            self.jogador.registrar_noticia(acao, impacto, self.mercado.dia)
+
+    def enviar_ordem_limitada(self, nome):
+        # Ordem limitada: fica no livro de ofertas até o preço alcançar o limite
+        acao_obj = self.mercado.get_acao_por_nome(nome)
+        lado = simpledialog.askstring("Ordem Limitada", f"{nome} (${acao_obj.preco_atual:.2f}) - compra ou venda?")
+        if not lado or lado.strip().lower() not in ('compra', 'venda'):
+            return
+        lado = lado.strip().lower()
+        quantidade = simpledialog.askinteger("Ordem Limitada", "Quantidade:", minvalue=1)
+        if not quantidade:
+            return
+        limite = simpledialog.askfloat("Ordem Limitada", "Preço limite:", minvalue=0.01, initialvalue=acao_obj.preco_atual)
+        if not limite:
+            return
+        with self.trava:
+            ordem = self.mercado.ordens.enviar(self.jogador, nome, lado, quantidade, limite)
+            execucoes = self.mercado.ordens.execucoes
+        self.notificar_execucoes(execucoes)
+        if ordem.status == 'rejeitada':
+            messagebox.showerror("Ordem Limitada", "Ordem rejeitada: saldo ou ações insuficientes.")
+        elif ordem.ativa:
+            messagebox.showinfo("Ordem Limitada", f"Ordem #{ordem.id} no livro: {ordem.restante} a ${limite:.2f}.")
+
+    def mostrar_ordens(self):
+        with self.trava:
+            ordens = self.mercado.ordens.ordens_de(self.jogador)
+        if not ordens:
+            messagebox.showinfo("Minhas Ordens", "Nenhuma ordem aberta.")
+            return
+        texto = '\n'.join(f"#{o.id} {o.lado} {o.restante}/{o.quantidade} {o.acao} @ ${o.preco_limite:.2f} (dia {o.dia})" for o in ordens[:30])
+        if len(ordens) > 30:
+            texto += f"\n... e mais {len(ordens) - 30}"
+        id_ordem = simpledialog.askinteger("Minhas Ordens", texto + "\n\nNúmero da ordem a cancelar (ou Cancelar):")
+        with self.trava:
+            cancelada = bool(id_ordem) and self.mercado.ordens.cancelar(id_ordem)
+        if id_ordem and not cancelada:
+            messagebox.showerror("Minhas Ordens", "Ordem não encontrada.")
+
+    def notificar_execucoes(self, execucoes, avisar=True):
+        # Registra nas listas de recentes as ordens limitadas executadas
+        # (avisar=False no tempo real: as execuções aparecem no histórico, sem janela)
+        minhas = [(o, qtd, preco, dia) for o, qtd, preco, dia in execucoes if o.dono is self.jogador]
+        for ordem, qtd, preco, dia in minhas:
+            recentes = self.recentes_compradas if ordem.lado == 'compra' else self.recentes_vendidas
+            recentes.registrar(ordem.acao, preco, dia)
+        if minhas and avisar:
+            self.atualizar_tela()
+            messagebox.showinfo("Ordens Executadas", '\n'.join(f"{o.lado.capitalize()} {qtd} {o.acao} a ${preco:.2f} (ordem #{o.id})"
+                                                              for o, qtd, preco, _ in minhas))
 
     def calcular_lucro_total(self):
         # Calcula lucro/prejuízo total da carteira
-        total = 0
-        for nome, (qtd, preco_medio) in self.jogador.carteira.items():
-            acao = self.mercado.get_acao_por_nome(nome)
-            total += (acao.preco_atual - preco_medio) * qtd
-        return total
+        return self.jogador.get_lucro_nao_realizado(self.mercado)
 
     def comprar_acao(self, nome):
-        # Compra 1 ação - usa Hash Extração para registrar
+        # Compra 1 ação - usa a lista de recentes (LRU) para registrar
         acao_obj = self.mercado.get_acao_por_nome(nome)
         if not acao_obj:
             messagebox.showerror("Erro", "Ação não encontrada.")
             return
-        if self.jogador.comprar_acao(acao_obj, 1):
-            # ALGORITMO: Hash Extração - registra compra
-            self.recentes_compradas.insert(nome, acao_obj.preco_atual)
+        with self.trava:
+            preco, dia = acao_obj.preco_atual, self.mercado.dia  # Preço da execução (a thread do tempo real pode mudá-lo depois)
+            comprou = self.jogador.comprar_acao(acao_obj, 1, dia, preco=preco)
+        if comprou:
+            # ALGORITMO: LRU - registra compra
+            self.recentes_compradas.registrar(nome, preco, dia)
             self.atualizar_tela()
         else:
             messagebox.showerror("Erro", "Saldo insuficiente para comprar.")
 
     def vender_acao(self, nome):
-        # Vende 1 ação - usa Linear Probing para registrar
+        # Vende 1 ação - usa a lista de recentes (LRU) para registrar
         acao_obj = self.mercado.get_acao_por_nome(nome)
         if not acao_obj:
             messagebox.showerror("Erro", "Ação não encontrada.")
             return
-        if self.jogador.vender_acao(acao_obj, 1):
-            # ALGORITMO: Linear Probing - registra venda
-            self.recentes_vendidas.insert(nome)
+        with self.trava:
+            preco, dia = acao_obj.preco_atual, self.mercado.dia  # Preço da execução (a thread do tempo real pode mudá-lo depois)
+            vendeu = self.jogador.vender_acao(acao_obj, 1, dia, preco=preco)
+        if vendeu:
+            # ALGORITMO: LRU - registra venda
+            self.recentes_vendidas.registrar(nome, preco, dia)
             self.atualizar_tela()
         else:
             messagebox.showerror("Erro", "Você não possui essa ação ou quantidade insuficiente.")
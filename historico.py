@@ -0,0 +1,192 @@
+# historico.py
+# Armazenamento colunar e compacto do histórico de preços de uma ação.
+from array import array
+
+from indicadores import INDICADORES, IndiceIntervalos
+
+
+# --- HISTÓRICO DE PREÇOS ---
+# Os preços ficam em um array('d') contíguo (8 bytes por dia, sem objetos float).
+# Com max_dias definido vira um buffer circular de memória limitada: cada valor é
+# escrito duas vezes (posição p e p + max_dias), assim qualquer janela dos últimos
+# N dias é sempre um trecho contíguo e pode ser devolvida como memoryview sem cópia.
+class HistoricoPrecos:
+    def __init__(self, preco_inicial=None, max_dias=None, niveis=None):
+        if max_dias is not None and max_dias < 1:
+            raise ValueError("max_dias deve ser positivo.")
+        self.max_dias = max_dias
+        self._capacidade = 2 * max_dias if max_dias else 16
+        self._dados = array('d', bytes(8 * self._capacidade))
+        self._tamanho = 0                   # Dias disponíveis
+        self.total_dias = 0                 # Dias já registrados (inclui os descartados)
+        # Níveis reduzidos: {nome: NivelOHLC}, ex.: {'semanal': 5, 'mensal': 21}
+        self.niveis = {nome: NivelOHLC(periodo) for nome, periodo in (niveis or {}).items()}
+        # Índices de análise, criados na primeira consulta e mantidos a cada append
+        self._intervalos = None             # IndiceIntervalos
+        self._indicadores = {}              # (tipo, periodo) -> indicador móvel
+        if preco_inicial is not None:
+            self.append(preco_inicial)
+
+    def append(self, preco):
+        if self.max_dias:
+            p = self.total_dias % self.max_dias
+            self._dados[p] = preco
+            self._dados[p + self.max_dias] = preco
+            self._tamanho = min(self._tamanho + 1, self.max_dias)
+        else:
+            if self._tamanho == self._capacidade:
+                self._crescer()
+            self._dados[self._tamanho] = preco
+            self._tamanho += 1
+        self.total_dias += 1
+        for nivel in self.niveis.values():
+            nivel.adicionar(preco)
+        if self._intervalos is not None:
+            self._intervalos.adicionar(preco)
+        for indicador in self._indicadores.values():
+            indicador.adicionar(preco)
+
+    def _crescer(self):
+        # Cria um novo buffer em vez de redimensionar: visões antigas continuam válidas
+        self._capacidade *= 2
+        novo = array('d', bytes(8 * self._capacidade))
+        memoryview(novo)[:self._tamanho] = self._dados[:self._tamanho]  # _dados pode ser array ou memoryview
+        self._dados = novo
+
+    def _limites(self, n):
+        n = self._tamanho if n is None else max(0, min(n, self._tamanho))
+        if self.max_dias:
+            fim = (self.total_dias - 1) % self.max_dias + self.max_dias + 1 if self.total_dias else 0
+        else:
+            fim = self._tamanho
+        return fim - n, fim
+
+    def ultimos(self, n=None):
+        """Retorna os últimos n preços (todos se n for None) como memoryview, sem cópia."""
+        inicio, fim = self._limites(n)
+        return memoryview(self._dados)[inicio:fim]
+
+    def visao(self):
+        return self.ultimos()
+
+    def ohlc(self, nivel):
+        return self.niveis[nivel].barras()
+
+    # --- ANÁLISE ---
+    # Só as ações consultadas pagam pelos índices: a primeira chamada percorre o
+    # histórico disponível uma vez (O(n)) e daí em diante cada append os atualiza.
+    def intervalos(self):
+        """IndiceIntervalos deste histórico: mínimo/máximo em O(log n), soma/média em O(1), volatilidade em O(log n)."""
+        if self._intervalos is None:
+            self._intervalos = IndiceIntervalos(self.max_dias, primeiro_dia=self.total_dias - self._tamanho)
+            self._intervalos.carregar(self.visao())
+        return self._intervalos
+
+    def indicador(self, tipo, periodo):
+        """Indicador móvel ('media', 'exponencial' ou 'volatilidade'); o valor atual está em .valor."""
+        chave = (tipo, periodo)
+        indicador = self._indicadores.get(chave)
+        if indicador is None:
+            if tipo not in INDICADORES:
+                raise ValueError(f"Indicador desconhecido: {tipo}")
+            indicador = INDICADORES[tipo](periodo)
+            # Média e volatilidade só olham a janela; a exponencial usa todo o histórico
+            for preco in self.ultimos(None if tipo == 'exponencial' else periodo + 1):
+                indicador.adicionar(preco)
+            self._indicadores[chave] = indicador
+        return indicador
+
+    def __len__(self):
+        return self._tamanho
+
+    def __getitem__(self, indice):
+        return self.visao()[indice]
+
+    def __iter__(self):
+        return iter(self.visao())
+
+    def tolist(self):
+        return self.visao().tolist()
+
+    def __repr__(self):
+        return f"HistoricoPrecos({self.tolist()!r})"
+
+    # --- SNAPSHOT (ver sessao.py) ---
+    def estado(self):
+        """(meta, seções) para gravar. Sem max_dias o trecho usado nunca é reescrito,
+        então vai sem cópia; o buffer circular é reescrito no lugar e é copiado.
+        """
+        meta = {'max_dias': self.max_dias, 'tamanho': self._tamanho, 'total_dias': self.total_dias,
+                'niveis': {nome: nivel.estado() for nome, nivel in self.niveis.items()}}
+        if self.max_dias:
+            dados = bytes(memoryview(self._dados))
+        else:
+            dados = (memoryview(self._dados)[:self._tamanho], 8 * self._capacidade)  # Reserva a capacidade
+        secoes = {'precos': dados}
+        for nome, nivel in self.niveis.items():
+            secoes['ohlc/' + nome] = nivel.dados()
+        return meta, secoes
+
+    @classmethod
+    def restaurar(cls, meta, secoes):
+        # Adota o buffer (memoryview gravável, normalmente de um mmap) sem copiar
+        historico = cls(max_dias=meta['max_dias'])
+        historico._dados = secoes['precos'].cast('d')
+        historico._capacidade = len(historico._dados)
+        historico._tamanho = meta['tamanho']
+        historico.total_dias = meta['total_dias']
+        for nome, estado in meta['niveis'].items():
+            historico.niveis[nome] = NivelOHLC.restaurar(estado, secoes['ohlc/' + nome])
+        return historico
+
+
+# --- NÍVEL REDUZIDO (OHLC) ---
+# Agrupa cada `periodo` dias em uma barra (abertura, máxima, mínima, fechamento).
+class NivelOHLC:
+    def __init__(self, periodo):
+        self.periodo = periodo
+        self.abertura = array('d')
+        self.maxima = array('d')
+        self.minima = array('d')
+        self.fechamento = array('d')
+        self._parcial = None                # Barra em formação [o, h, l, c, dias]
+
+    def adicionar(self, preco):
+        if self._parcial is None:
+            self._parcial = [preco, preco, preco, preco, 0]
+        barra = self._parcial
+        barra[1] = max(barra[1], preco)
+        barra[2] = min(barra[2], preco)
+        barra[3] = preco
+        barra[4] += 1
+        if barra[4] == self.periodo:
+            self.abertura.append(barra[0])
+            self.maxima.append(barra[1])
+            self.minima.append(barra[2])
+            self.fechamento.append(barra[3])
+            self._parcial = None
+
+    def barras(self, incluir_parcial=False):
+        barras = list(zip(self.abertura, self.maxima, self.minima, self.fechamento))
+        if incluir_parcial and self._parcial is not None:
+            barras.append(tuple(self._parcial[:4]))
+        return barras
+
+    def __len__(self):
+        return len(self.fechamento)
+
+    def estado(self):
+        return {'periodo': self.periodo, 'barras': len(self), 'parcial': self._parcial}
+
+    def dados(self):
+        # Cópia das quatro colunas em sequência (os arrays crescem com append)
+        return b''.join(bytes(coluna) for coluna in (self.abertura, self.maxima, self.minima, self.fechamento))
+
+    @classmethod
+    def restaurar(cls, estado, dados):
+        nivel = cls(estado['periodo'])
+        n = 8 * estado['barras']
+        for i, coluna in enumerate((nivel.abertura, nivel.maxima, nivel.minima, nivel.fechamento)):
+            coluna.frombytes(dados[i * n:(i + 1) * n])
+        nivel._parcial = estado['parcial']
+        return nivel
@@ -0,0 +1,332 @@
+# indicadores.py
+# Consultas por faixa de dias e indicadores móveis sobre o histórico de preços,
+# mantidos a cada novo preço em vez de varrer o histórico a cada pergunta.
+import math
+from array import array
+from itertools import accumulate, islice
+
+INFINITO = float('inf')
+
+
+def _potencia_de_2(n):
+    return 1 << max(0, n - 1).bit_length()
+
+
+def _juntar_momentos(na, ma, sa, nb, mb, sb):
+    # Junta (quantidade, média, soma dos quadrados dos desvios) de dois grupos (Chan et al.)
+    if not nb:
+        return na, ma, sa
+    if not na:
+        return nb, mb, sb
+    n = na + nb
+    delta = mb - ma
+    return n, ma + delta * nb / n, sa + sb + delta * delta * na * nb / n
+
+
+# --- ÍNDICE DE INTERVALOS ---
+# Mínimo e máximo: árvore de segmentos (folhas no fim do array, pai de i em i // 2),
+# O(log n) para acrescentar e para consultar. Soma e média: somas prefixadas dos
+# preços, O(1). Volatilidade: outra árvore com (quantidade, média, desvios²) dos
+# retornos diários de cada nó, O(log n); juntar médias e desvios em vez de subtrair
+# E[x²] - E[x]² de somas prefixadas evita o cancelamento em faixas de pouca variação.
+# Os dias são absolutos (0 = primeiro preço do histórico) e as faixas são [inicio, fim).
+# Com max_dias o índice acompanha o buffer circular do histórico: só os últimos
+# max_dias dias podem ser consultados e a memória fica limitada.
+class IndiceIntervalos:
+    def __init__(self, max_dias=None, primeiro_dia=0):
+        self.max_dias = max_dias
+        self.primeiro_dia = primeiro_dia    # Dia absoluto do primeiro preço indexado
+        self.dias = 0                       # Preços indexados
+        self._folhas = _potencia_de_2(max_dias or 16)
+        self._min = array('d', [INFINITO]) * (2 * self._folhas)
+        self._max = array('d', [-INFINITO]) * (2 * self._folhas)
+        # Momentos dos retornos por nó (a folha do primeiro dia não tem retorno: quantidade 0)
+        self._qtd = array('d', bytes(16 * self._folhas))
+        self._media = array('d', bytes(16 * self._folhas))
+        self._desvios = array('d', bytes(16 * self._folhas))
+        # Somas prefixadas: posição k = soma dos k primeiros dias indexados
+        # (buffer circular de max_dias + 1 posições quando há limite)
+        tamanho = max_dias + 1 if max_dias else 1
+        self._somas = array('d', bytes(8 * tamanho))
+        self._ultimo_preco = None
+
+    def __len__(self):
+        return self.dias
+
+    # --- ATUALIZAÇÃO ---
+    def adicionar(self, preco):
+        k = self.dias
+        if not self.max_dias and k == self._folhas:
+            self._crescer()
+        i = (k % self.max_dias if self.max_dias else k) + self._folhas
+        self._min[i] = self._max[i] = preco
+        i >>= 1
+        while i:
+            menor = min(self._min[2 * i], self._min[2 * i + 1])
+            maior = max(self._max[2 * i], self._max[2 * i + 1])
+            if menor == self._min[i] and maior == self._max[i]:
+                break                       # Nada muda daqui para cima
+            self._min[i] = menor
+            self._max[i] = maior
+            i >>= 1
+
+        i = (k % self.max_dias if self.max_dias else k) + self._folhas
+        if self._ultimo_preco:
+            self._qtd[i], self._media[i], self._desvios[i] = 1.0, preco / self._ultimo_preco - 1.0, 0.0
+        else:
+            self._qtd[i] = self._media[i] = self._desvios[i] = 0.0
+        i >>= 1
+        while i:
+            self._momentos_do_no(i)
+            i >>= 1
+
+        total = self._somas[self._p(k)] + preco
+        if self.max_dias:
+            self._somas[self._p(k + 1)] = total
+        else:
+            self._somas.append(total)
+        self._ultimo_preco = preco
+        self.dias += 1
+
+    def carregar(self, precos):
+        """Indexa de uma vez os preços de um histórico existente (índice vazio): O(n)."""
+        precos = array('d', precos)
+        if self.dias or not precos:
+            for preco in precos:
+                self.adicionar(preco)
+            return
+        if self.max_dias and len(precos) > self.max_dias:
+            raise ValueError("mais preços do que max_dias")
+        n = len(precos)
+        if not self.max_dias:
+            self._folhas = max(self._folhas, _potencia_de_2(n + 1))
+        for nome, neutro, operacao in (('_min', INFINITO, min), ('_max', -INFINITO, max)):
+            arvore = array('d', [neutro]) * (2 * self._folhas)
+            arvore[self._folhas:self._folhas + n] = precos
+            for i in range(self._folhas - 1, 0, -1):
+                arvore[i] = operacao(arvore[2 * i], arvore[2 * i + 1])
+            setattr(self, nome, arvore)
+        anteriores = zip(precos, islice(precos, 1, None))
+        retornos = array('d', [0.0]) + array('d', (b / a - 1.0 if a else 0.0 for a, b in anteriores))
+        self._qtd = array('d', bytes(16 * self._folhas))
+        self._media = array('d', bytes(16 * self._folhas))
+        self._desvios = array('d', bytes(16 * self._folhas))
+        self._media[self._folhas:self._folhas + n] = retornos
+        self._qtd[self._folhas:self._folhas + n] = array('d', [0.0] + [1.0 if a else 0.0 for a in islice(precos, n - 1)])
+        for i in range(self._folhas - 1, 0, -1):
+            self._momentos_do_no(i)
+        prefixos = array('d', accumulate(precos, initial=0.0))
+        if self.max_dias:
+            self._somas[:n + 1] = prefixos
+        else:
+            self._somas = prefixos
+        self._ultimo_preco = precos[-1]
+        self.dias = n
+
+    def _crescer(self):
+        # Dobra o número de folhas e reconstrói os nós internos (O(n), amortizado O(1))
+        antigas = self._folhas
+        self._folhas *= 2
+        for nome, neutro, operacao in (('_min', INFINITO, min), ('_max', -INFINITO, max)):
+            arvore = array('d', [neutro]) * (2 * self._folhas)
+            arvore[self._folhas:self._folhas + antigas] = getattr(self, nome)[antigas:2 * antigas]
+            for i in range(self._folhas - 1, 0, -1):
+                arvore[i] = operacao(arvore[2 * i], arvore[2 * i + 1])
+            setattr(self, nome, arvore)
+        for nome in ('_qtd', '_media', '_desvios'):
+            arvore = array('d', bytes(16 * self._folhas))
+            arvore[self._folhas:self._folhas + antigas] = getattr(self, nome)[antigas:2 * antigas]
+            setattr(self, nome, arvore)
+        for i in range(self._folhas - 1, 0, -1):
+            self._momentos_do_no(i)
+
+    def _momentos_do_no(self, i):
+        qtd, media, desvios = self._qtd, self._media, self._desvios
+        e, d = 2 * i, 2 * i + 1
+        qtd[i], media[i], desvios[i] = _juntar_momentos(qtd[e], media[e], desvios[e], qtd[d], media[d], desvios[d])
+
+    def _p(self, k):
+        # Posição da soma prefixada k no array
+        return k % (self.max_dias + 1) if self.max_dias else k
+
+    # --- CONSULTAS ---
+    def faixa(self):
+        """(primeiro dia consultável, fim exclusivo) em dias absolutos."""
+        inicio = self.dias - self.max_dias if self.max_dias and self.dias > self.max_dias else 0
+        return self.primeiro_dia + inicio, self.primeiro_dia + self.dias
+
+    def _local(self, inicio, fim):
+        primeiro, ultimo = self.faixa()
+        inicio = primeiro if inicio is None else inicio
+        fim = ultimo if fim is None else fim
+        if not primeiro <= inicio < fim <= ultimo:
+            raise IndexError(f"faixa de dias [{inicio}, {fim}) fora de [{primeiro}, {ultimo})")
+        return inicio - self.primeiro_dia, fim - self.primeiro_dia
+
+    def _arvore(self, arvore, operacao, neutro, a, b):
+        # Consulta [a, b) em posições de folha, sem volta no buffer
+        resultado = neutro
+        a += self._folhas
+        b += self._folhas
+        while a < b:
+            if a & 1:
+                resultado = operacao(resultado, arvore[a])
+                a += 1
+            if b & 1:
+                b -= 1
+                resultado = operacao(resultado, arvore[b])
+            a >>= 1
+            b >>= 1
+        return resultado
+
+    def _consultar(self, arvore, operacao, neutro, inicio, fim):
+        a, b = self._local(inicio, fim)
+        return self._nas_folhas(lambda pa, pb: self._arvore(arvore, operacao, neutro, pa, pb), operacao, a, b)
+
+    def _nas_folhas(self, consulta, juntar, a, b):
+        # Aplica consulta(pa, pb) às posições de folha de [a, b) (dias locais)
+        if not self.max_dias:
+            return consulta(a, b)
+        m = self.max_dias
+        pa = a % m
+        pb = pa + (b - a)
+        if pb <= m:
+            return consulta(pa, pb)
+        # A faixa dá a volta no buffer circular: junta as duas partes
+        return juntar(consulta(pa, m), consulta(0, pb - m))
+
+    def _momentos(self, a, b):
+        # (quantidade, média, desvios²) dos retornos nas folhas [a, b), sem volta no buffer
+        qtd, media, desvios = self._qtd, self._media, self._desvios
+        resultado = (0.0, 0.0, 0.0)
+        a += self._folhas
+        b += self._folhas
+        while a < b:
+            if a & 1:
+                resultado = _juntar_momentos(*resultado, qtd[a], media[a], desvios[a])
+                a += 1
+            if b & 1:
+                b -= 1
+                resultado = _juntar_momentos(*resultado, qtd[b], media[b], desvios[b])
+            a >>= 1
+            b >>= 1
+        return resultado
+
+    def minimo(self, inicio=None, fim=None):
+        return self._consultar(self._min, min, INFINITO, inicio, fim)
+
+    def maximo(self, inicio=None, fim=None):
+        return self._consultar(self._max, max, -INFINITO, inicio, fim)
+
+    def soma(self, inicio=None, fim=None):
+        a, b = self._local(inicio, fim)
+        return self._somas[self._p(b)] - self._somas[self._p(a)]
+
+    def media(self, inicio=None, fim=None):
+        a, b = self._local(inicio, fim)
+        return (self._somas[self._p(b)] - self._somas[self._p(a)]) / (b - a)
+
+    def volatilidade(self, inicio=None, fim=None):
+        """Desvio padrão dos retornos diários dentro da faixa (0.0 com menos de 2 dias)."""
+        a, b = self._local(inicio, fim)
+        if b - a < 2:
+            return 0.0
+        # Retornos dos dias a+1 .. b-1
+        n, _, desvios = self._nas_folhas(self._momentos, lambda x, y: _juntar_momentos(*x, *y), a + 1, b)
+        return math.sqrt(max(desvios / n, 0.0)) if n else 0.0
+
+
+# --- INDICADORES MÓVEIS ---
+# Cada indicador guarda só a janela de que precisa e atualiza o valor em O(1) por
+# preço. As somas correntes são refeitas a cada volta completa da janela, para o
+# erro de arredondamento de somar e subtrair não se acumular.
+class MediaMovel:
+    def __init__(self, periodo):
+        if periodo < 1:
+            raise ValueError("periodo deve ser positivo.")
+        self.periodo = periodo
+        self._janela = array('d', bytes(8 * periodo))
+        self._pos = 0
+        self._n = 0
+        self._soma = 0.0
+
+    def adicionar(self, preco):
+        if self._n == self.periodo:
+            self._soma -= self._janela[self._pos]
+        else:
+            self._n += 1
+        self._janela[self._pos] = preco
+        self._soma += preco
+        self._pos = (self._pos + 1) % self.periodo
+        if self._pos == 0:
+            self._soma = sum(self._janela)
+
+    @property
+    def valor(self):
+        # Média dos últimos `periodo` preços (ou dos que houver); None sem preços
+        return self._soma / self._n if self._n else None
+
+
+class MediaExponencial:
+    def __init__(self, periodo):
+        if periodo < 1:
+            raise ValueError("periodo deve ser positivo.")
+        self.periodo = periodo
+        self.alfa = 2.0 / (periodo + 1)
+        self.valor = None
+
+    def adicionar(self, preco):
+        self.valor = preco if self.valor is None else self.valor + self.alfa * (preco - self.valor)
+
+
+class VolatilidadeMovel:
+    """Desvio padrão dos últimos `periodo` retornos diários."""
+
+    def __init__(self, periodo):
+        if periodo < 1:
+            raise ValueError("periodo deve ser positivo.")
+        self.periodo = periodo
+        # Welford com janela: média e soma dos quadrados dos desvios dos retornos na
+        # janela, atualizadas ao entrar um retorno e sair o mais antigo (sem E[x²] - E[x]²)
+        self._janela = array('d', bytes(8 * periodo))
+        self._pos = 0
+        self._n = 0
+        self._media = 0.0
+        self._desvios = 0.0
+        self._ultimo_preco = None
+
+    def adicionar(self, preco):
+        if self._ultimo_preco:
+            self._adicionar_retorno(preco / self._ultimo_preco - 1.0)
+        self._ultimo_preco = preco
+
+    def _adicionar_retorno(self, retorno):
+        if self._n == self.periodo:
+            saiu = self._janela[self._pos]
+            media = self._media + (retorno - saiu) / self._n
+            self._desvios += (retorno - saiu) * (retorno - media + saiu - self._media)
+            self._media = media
+        else:
+            self._n += 1
+            delta = retorno - self._media
+            self._media += delta / self._n
+            self._desvios += delta * (retorno - self._media)
+        self._janela[self._pos] = retorno
+        self._pos = (self._pos + 1) % self.periodo
+        if self._pos == 0:
+            # Volta completa: refaz média e desvios a partir da janela
+            self._media = sum(self._janela) / self._n
+            self._desvios = sum((r - self._media) ** 2 for r in self._janela)
+
+    @property
+    def valor(self):
+        if not self._n:
+            return None
+        return math.sqrt(max(self._desvios / self._n, 0.0))
+
+
+INDICADORES = {
+    'media': MediaMovel,
+    'exponencial': MediaExponencial,
+    'volatilidade': VolatilidadeMovel,
+}
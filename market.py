@@ -1,12 +1,26 @@
 # market.py
 import random
 
+import perf
+from algorithms import IndiceAproximado, IndiceSubstring, faixa_binaria, faixa_prefixo
+from historico import HistoricoPrecos
+from ordens import MotorOrdens
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: só o modo vetorizado depende dele
+    np = None
+
+TENDENCIAS = ['alta', 'baixa', 'estavel']
+DERIVA_TENDENCIA = {'alta': 0.02, 'baixa': -0.02, 'estavel': 0.0}
+PRECO_MINIMO = 1.0
+
 class Acao:
-    def __init__(self, nome, preco_inicial):
+    def __init__(self, nome, preco_inicial, max_historico=None, niveis=None):
         self.nome = nome
         self.preco_atual = preco_inicial
-        self.historico = [preco_inicial]
-        self.tendencia = random.choice(['alta', 'baixa', 'estavel'])
+        self.historico = HistoricoPrecos(preco_inicial, max_dias=max_historico, niveis=niveis)
+        self.tendencia = random.choice(TENDENCIAS)
 
     def atualizar_preco(self):
         variacao = random.uniform(-0.05, 0.05)
@@ -15,38 +29,474 @@ class Acao:
         elif self.tendencia == 'baixa':
             variacao -= 0.02
         novo_preco = round(self.preco_atual * (1 + variacao), 2)
-        self.preco_atual = max(novo_preco, 1.0)
+        self.preco_atual = max(novo_preco, PRECO_MINIMO)
         self.historico.append(self.preco_atual)
 
-    def get_historico(self):
-        return self.historico
+    def get_historico(self, n=None):
+        # Visão sem cópia dos últimos n dias (todos se n for None)
+        return self.historico.ultimos(n)
+
+    @property
+    def dias_registrados(self):
+        # Dias já gravados no histórico, inclusive os que o buffer circular descartou
+        return self.historico.total_dias
+
+
+# --- MOTOR VETORIZADO DE PREÇOS ---
+# Guarda preços, derivas (tendências) e histórico em arrays NumPy e avança
+# todas as ações de uma vez, um dia ou um bloco de dias por chamada.
+class MotorPrecos:
+    def __init__(self, precos_iniciais, tendencias, seed=None, capacidade_dias=64, max_dias=None):
+        if np is None:
+            raise RuntimeError("O modo vetorizado requer NumPy instalado.")
+        self.rng = np.random.default_rng(seed)
+        # Colunas por ação com capacidade reservada (dobra quando enche, como os
+        # históricos): precos, codigos_tendencia e derivas são visões das n primeiras
+        self._precos = np.asarray(precos_iniciais, dtype=np.float64).copy()
+        codigos = np.array([TENDENCIAS.index(t) for t in tendencias], dtype=np.int8)
+        self._codigos = codigos
+        self._derivas = np.array([DERIVA_TENDENCIA[t] for t in TENDENCIAS])[codigos]
+        self._num_acoes = len(self._precos)
+        self._fatiar()
+        # Histórico em linhas de dias: historico[d, i] = preço da ação i no dia d.
+        # Com max_dias vira buffer circular com escrita dupla (igual a HistoricoPrecos),
+        # então a janela dos últimos dias de uma ação é sempre uma fatia sem cópia.
+        self.max_dias = max_dias
+        linhas = 2 * max_dias if max_dias else max(capacidade_dias, 1)
+        self._historico = np.empty((linhas, len(self._precos)), dtype=np.float64)
+        self.num_dias = 0                   # Dias já registrados (inclui os descartados)
+        self._gravar_dia(self.precos)
+
+    def __len__(self):
+        return self._num_acoes
+
+    def _fatiar(self):
+        n = self._num_acoes
+        self.precos = self._precos[:n]
+        self.codigos_tendencia = self._codigos[:n]
+        self.derivas = self._derivas[:n]
+
+    def _gravar_dia(self, precos):
+        n = self._num_acoes
+        if self.max_dias:
+            p = self.num_dias % self.max_dias
+            self._historico[p, :n] = precos
+            self._historico[p + self.max_dias, :n] = precos
+        else:
+            self._historico[self.num_dias, :n] = precos
+        self.num_dias += 1
+
+    def _garantir_capacidade(self, dias_extras):
+        if self.max_dias:
+            return
+        necessario = self.num_dias + dias_extras
+        if necessario <= self._historico.shape[0]:
+            return
+        nova_capacidade = max(necessario, self._historico.shape[0] * 2)  # Crescimento geométrico
+        novo = np.empty((nova_capacidade, self._historico.shape[1]), dtype=np.float64)
+        novo[:self.num_dias, :self._num_acoes] = self._historico[:self.num_dias, :self._num_acoes]
+        self._historico = novo
+
+    def avancar(self, dias=1):
+        """Avança `dias` dias para todas as ações e retorna o bloco de preços (dias x ações)."""
+        if dias <= 0:
+            return self._janela(0)
+        self._garantir_capacidade(dias)
+        variacoes = self.rng.uniform(-0.05, 0.05, size=(dias, len(self.precos)))
+        variacoes += self.derivas
+        precos = self.precos
+        for d in range(dias):
+            # Arredondamento e piso dependem do dia anterior, então só os dias são sequenciais
+            precos = np.maximum(np.round(precos * (1 + variacoes[d]), 2), PRECO_MINIMO)
+            self._gravar_dia(precos)
+        self.precos[:] = precos
+        return self._janela(dias)
+
+    def adicionar(self, preco, tendencia):
+        # Nova coluna no fim; dias anteriores à listagem ficam como NaN no histórico.
+        # Com capacidade sobrando custa O(dias) (só a coluna nova); cheia, a capacidade
+        # dobra e tudo é copiado uma vez, O(dias) amortizado por ação listada.
+        n = self._num_acoes
+        if n == len(self._precos):
+            self._crescer_acoes(max(2 * n, 1))
+        self._precos[n] = preco
+        self._codigos[n] = TENDENCIAS.index(tendencia)
+        self._derivas[n] = DERIVA_TENDENCIA[tendencia]
+        self._historico[:, n] = np.nan
+        ultimo = (self.num_dias - 1) % self.max_dias if self.max_dias else self.num_dias - 1
+        self._historico[ultimo, n] = preco
+        if self.max_dias:
+            self._historico[ultimo + self.max_dias, n] = preco
+        self._num_acoes += 1
+        self._fatiar()
+        return n
+
+    def _crescer_acoes(self, capacidade):
+        n = self._num_acoes
+        for nome in ('_precos', '_codigos', '_derivas'):
+            antigo = getattr(self, nome)
+            novo = np.zeros(capacidade, dtype=antigo.dtype)
+            novo[:n] = antigo[:n]
+            setattr(self, nome, novo)
+        historico = np.empty((self._historico.shape[0], capacidade), dtype=np.float64)
+        historico[:, :n] = self._historico[:, :n]
+        self._historico = historico
+
+    def remover(self, i):
+        # Remove a ação i trocando-a com a última: O(1) por array, O(dias) no histórico
+        # (a coluna liberada fica como capacidade para a próxima listagem)
+        ultimo = self._num_acoes - 1
+        if i != ultimo:
+            self._precos[i] = self._precos[ultimo]
+            self._codigos[i] = self._codigos[ultimo]
+            self._derivas[i] = self._derivas[ultimo]
+            self._historico[:, i] = self._historico[:, ultimo]
+        self._num_acoes = ultimo
+        self._fatiar()
+
+    @property
+    def dias_disponiveis(self):
+        return min(self.num_dias, self.max_dias) if self.max_dias else self.num_dias
+
+    def _janela(self, n):
+        # Linhas dos últimos n dias disponíveis (fatia contígua do buffer)
+        n = max(0, min(n, self.dias_disponiveis))
+        if self.max_dias:
+            fim = (self.num_dias - 1) % self.max_dias + self.max_dias + 1
+        else:
+            fim = self.num_dias
+        return self._historico[fim - n:fim, :self._num_acoes]
+
+    def historico_de(self, i, n=None):
+        # Visão (sem cópia) da coluna da ação i nos últimos n dias
+        return self._janela(self.dias_disponiveis if n is None else n)[:, i]
+
+    # --- SNAPSHOT (ver sessao.py) ---
+    def estado(self):
+        # O histórico é copiado inteiro, O(dias x ações) na thread de quem captura:
+        # remover() reescreve colunas no lugar e o buffer circular reescreve linhas.
+        # A seção reserva todas as linhas do buffer para o motor restaurado crescer sem copiar.
+        linhas = self._historico.shape[0]
+        usadas = linhas if self.max_dias else self.num_dias
+        n = self._num_acoes
+        meta = {'max_dias': self.max_dias, 'num_dias': self.num_dias, 'linhas': linhas,
+                'acoes': n, 'rng': self.rng.bit_generator.state}
+        secoes = {'precos': self.precos.tobytes(), 'tendencias': self.codigos_tendencia.tobytes(),
+                  'historico': (self._historico[:usadas, :n].tobytes(), self._historico.itemsize * linhas * n)}
+        return meta, secoes
+
+    @classmethod
+    def restaurar(cls, meta, secoes):
+        """Motor que usa o histórico direto do buffer (memoryview gravável de um mmap)."""
+        codigos = np.frombuffer(secoes['tendencias'], dtype=np.int8)
+        motor = cls(np.frombuffer(secoes['precos'], dtype=np.float64), [TENDENCIAS[c] for c in codigos],
+                    capacidade_dias=1, max_dias=meta['max_dias'])
+        motor.rng.bit_generator.state = meta['rng']
+        motor._historico = np.frombuffer(secoes['historico'], dtype=np.float64,
+                                         count=meta['linhas'] * meta['acoes']).reshape(meta['linhas'], meta['acoes'])
+        motor.num_dias = meta['num_dias']
+        return motor
+
+
+class AcaoVetorizada:
+    """Visão leve de uma ação armazenada no MotorPrecos (mesma interface de Acao)."""
+    __slots__ = ('motor', 'indice', 'nome')
+
+    def __init__(self, motor, indice, nome):
+        self.motor = motor
+        self.indice = indice                # None depois de deslistada (Mercado.remover_acao)
+        self.nome = nome
+
+    def _coluna(self):
+        # A coluna de uma ação deslistada passa a ser de outra: a visão não lê mais nada
+        if self.indice is None:
+            raise RuntimeError(f"A ação {self.nome} foi deslistada; seus preços não estão mais no motor.")
+        return self.indice
+
+    @property
+    def preco_atual(self):
+        return float(self.motor.precos[self._coluna()])
+
+    @preco_atual.setter
+    def preco_atual(self, valor):
+        self.motor.precos[self._coluna()] = valor
+
+    @property
+    def tendencia(self):
+        return TENDENCIAS[self.motor.codigos_tendencia[self._coluna()]]
+
+    @property
+    def historico(self):
+        return self.motor.historico_de(self._coluna())
+
+    def atualizar_preco(self):
+        # O histórico do motor é por dia inteiro: uma ação sozinha não tem como gravar
+        # o novo preço, então o avanço é sempre de todas (Mercado.avancar_dia)
+        raise RuntimeError("No modo vetorizado os preços avançam juntos: use Mercado.avancar_dia ou MotorPrecos.avancar.")
+
+    def get_historico(self, n=None):
+        return self.motor.historico_de(self._coluna(), n)
+
+    @property
+    def dias_registrados(self):
+        return self.motor.num_dias
+
+
+def _preco(par):
+    return par[0]
+
 
 class Mercado:
-    def __init__(self):
+    NOMES_PADRAO = [
+        'TechWave', 'AgroPlus', 'BankNow', 'HealthMax', 'GreenEnergy',
+        'EduSmart', 'Foodies', 'TravelNow', 'BuildIt', 'FashionX',
+        'PetLovers', 'AutoDrive', 'MobiPay', 'BioGen', 'CloudNet'
+    ]
+
+    def __init__(self, vetorizado=False, num_acoes=None, seed=None, max_historico=None, niveis_historico=None):
+        # vetorizado=True usa o MotorPrecos (NumPy); num_acoes gera mercados grandes.
+        # max_historico limita os dias guardados por ação; niveis_historico cria barras OHLC
+        # (ex.: {'semanal': 5, 'mensal': 21}) no modo por objeto.
         self.acoes = []
+        self._indice = {}                   # Índice hash: nome -> posição em self.acoes
+        self.indice_nomes = IndiceSubstring()  # Índice de substrings dos nomes
+        self._aproximado = None             # IndiceAproximado, criado na primeira busca aproximada
         self.dia = 0
-        self.gerar_acoes_iniciais()
-
-    def gerar_acoes_iniciais(self):
-        nomes = [
-            'TechWave', 'AgroPlus', 'BankNow', 'HealthMax', 'GreenEnergy',
-            'EduSmart', 'Foodies', 'TravelNow', 'BuildIt', 'FashionX',
-            'PetLovers', 'AutoDrive', 'MobiPay', 'BioGen', 'CloudNet'
-        ]
+        self.vetorizado = vetorizado
+        self.motor = None
+        self.seed = seed
+        self.max_historico = max_historico
+        self.niveis_historico = niveis_historico
+        self.ordens = MotorOrdens(self)     # Livros de ofertas (ordens limitadas)
+        self._carteiras = []                # Jogadores avisados quando os preços mudam
+        self._por_nome = None               # Visões ordenadas em cache (ver ordenadas_por_nome)
+        self._por_preco = None
+        self.gerar_acoes_iniciais(num_acoes)
+
+    @staticmethod
+    def gerar_nomes(num_acoes):
+        nomes = list(Mercado.NOMES_PADRAO[:num_acoes])
+        for i in range(len(nomes), num_acoes):
+            nomes.append(f"Acao{i:07d}")
+        return nomes
+
+    def gerar_acoes_iniciais(self, num_acoes=None):
+        nomes = self.NOMES_PADRAO if num_acoes is None else self.gerar_nomes(num_acoes)
+        if not self.vetorizado:
+            for nome in nomes:
+                preco_inicial = round(random.uniform(10, 100), 2)
+                self.adicionar_acao(Acao(nome, preco_inicial, self.max_historico, self.niveis_historico))
+            return
+        if np is None:
+            raise RuntimeError("O modo vetorizado requer NumPy instalado.")
+        rng = np.random.default_rng(self.seed)
+        precos = np.round(rng.uniform(10, 100, size=len(nomes)), 2)
+        tendencias = [TENDENCIAS[c] for c in rng.integers(0, len(TENDENCIAS), size=len(nomes))]
+        self.motor = MotorPrecos(precos, tendencias, seed=rng.integers(2**63), max_dias=self.max_historico)
+        self.listar_vetorizadas(nomes)
+
+    def listar_vetorizadas(self, nomes):
+        # Visões das colunas do motor atual, na ordem de `nomes`
+        self.acoes = [AcaoVetorizada(self.motor, i, nome) for i, nome in enumerate(nomes)]
+        self._indice = {nome: i for i, nome in enumerate(nomes)}
+        self._listagem_mudou()
+        self._aproximado = None
+        self.indice_nomes = IndiceSubstring()
         for nome in nomes:
-            preco_inicial = round(random.uniform(10, 100), 2)
-            self.acoes.append(Acao(nome, preco_inicial))
+            self.indice_nomes.adicionar(nome)
 
+    @perf.medido('mercado.avancar_dia')
     def avancar_dia(self):
         self.dia += 1
-        for acao in self.acoes:
-            acao.atualizar_preco()
+        if self.motor is not None:
+            self.motor.avancar(1)
+        else:
+            for acao in self.acoes:
+                acao.atualizar_preco()
+        self._precos_mudaram()
+        if self.ordens:
+            self.ordens.casar()             # Só visita ações com ordens abertas
+
+    @perf.medido('mercado.avancar_dias')
+    def avancar_dias(self, dias):
+        """Avança um bloco de dias; no modo vetorizado é uma única chamada em lote.
+
+        Nesse caso as ordens limitadas são casadas uma vez, com os preços do fim do bloco.
+        """
+        if self.motor is not None:
+            self.dia += dias
+            bloco = self.motor.avancar(dias)
+            self._precos_mudaram()
+            if self.ordens:
+                self.ordens.casar()
+            return bloco
+        for _ in range(dias):
+            self.avancar_dia()
+        return None
+
+    def gerar_noticia(self, chance=0.3):
+        # Notícia aleatória que afeta o preço de uma ação (±5% a ±20%).
+        # Retorna (acao, impacto) ou None se não houve notícia no dia.
+        if random.random() < chance:
+            if not self.acoes:
+                return None
+            acao = random.choice(self.acoes)
+            impacto = random.choice([-1, 1]) * random.uniform(0.05, 0.2)
+            acao.preco_atual = max(1, round(acao.preco_atual * (1 + impacto), 2))
+            self._precos_mudaram([acao.nome])
+            if self.ordens:
+                self.ordens.casar([acao.nome])
+            return acao, impacto
+        return None
+
+    # --- CARTEIRAS OBSERVADAS ---
+    # Jogadores que mantêm o valor da carteira por diferenças se registram aqui
+    # (Jogador.acompanhar) e são avisados a cada movimento de preço.
+    def observar_carteira(self, jogador):
+        if jogador not in self._carteiras:
+            self._carteiras.append(jogador)
+
+    def deixar_de_observar(self, jogador):
+        if jogador in self._carteiras:
+            self._carteiras.remove(jogador)
+
+    def aplicar_choque(self, indices, novos_precos):
+        """Preços alterados de fora do mercado (ex.: impacto dos agentes): a ação na
+        posição indices[k] passa a valer novos_precos[k]; carteiras e visões são avisadas
+        e as ordens limitadas que o novo preço alcançou são executadas, como nas notícias."""
+        if self.motor is not None:
+            self.motor.precos[indices] = novos_precos
+        else:
+            for i, preco in zip(indices, novos_precos):
+                self.acoes[i].preco_atual = preco
+        nomes = [self.acoes[i].nome for i in indices]
+        self._precos_mudaram(nomes)
+        if self.ordens:
+            self.ordens.casar(nomes)
+
+    def _precos_mudaram(self, nomes=None):
+        # Todo movimento de preço passa por aqui (inclusive os choques de aplicar_choque)
+        self._por_preco = None
+        for jogador in self._carteiras:
+            jogador.remarcar(self, nomes)
 
     def listar_acoes(self):
+        if self.motor is not None:
+            precos = self.motor.precos.tolist()
+            return [(acao.nome, precos[i]) for i, acao in enumerate(self.acoes)]
         return [(acao.nome, acao.preco_atual) for acao in self.acoes]
 
+    # --- ÍNDICE DE AÇÕES ---
+    # self._indice (hash nome -> posição) e a própria lista self.acoes (posição -> ação)
+    # são mantidos juntos: listar e deslistar são O(1) e as buscas por nome também.
+    # No modo vetorizado o motor ainda escreve a coluna da ação no histórico, O(dias).
+    def adicionar_acao(self, acao, tendencia=None):
+        """Lista uma ação nova. No modo vetorizado `acao` pode ser (nome, preco)."""
+        nome = acao[0] if isinstance(acao, tuple) else acao.nome
+        if nome in self._indice:
+            raise ValueError(f"Ação já listada: {nome}")
+        if self.motor is not None:
+            preco = acao[1] if isinstance(acao, tuple) else acao.preco_atual
+            tendencia = tendencia or (getattr(acao, 'tendencia', None) or random.choice(TENDENCIAS))
+            acao = AcaoVetorizada(self.motor, self.motor.adicionar(preco, tendencia), nome)
+        elif isinstance(acao, tuple):
+            acao = Acao(nome, acao[1], self.max_historico, self.niveis_historico)
+            if tendencia:
+                acao.tendencia = tendencia
+        self._indice[nome] = len(self.acoes)
+        self.acoes.append(acao)
+        self.indice_nomes.adicionar(nome)
+        if self._aproximado is not None:
+            self._aproximado.adicionar(nome)
+        self._listagem_mudou()
+        return acao
+
+    def remover_acao(self, nome):
+        """Deslista uma ação: a última ocupa a posição liberada (a ordem não é preservada).
+
+        No modo vetorizado a visão retornada fica desligada do motor (ler preço ou
+        histórico dela levanta RuntimeError), pois a coluna passa a ser de outra ação.
+        """
+        i = self._indice.pop(nome, None)
+        if i is None:
+            return None
+        removida = self.acoes[i]
+        self.indice_nomes.remover(nome)
+        if self._aproximado is not None:
+            self._aproximado.remover(nome)
+        self._listagem_mudou()
+        self.ordens.cancelar_acao(nome)
+        ultima = self.acoes.pop()
+        if self.motor is not None:
+            self.motor.remover(i)
+            removida.indice = None
+        if ultima is not removida:
+            self.acoes[i] = ultima
+            self._indice[ultima.nome] = i
+            if self.motor is not None:
+                ultima.indice = i
+        return removida
+
+    def indice_de(self, nome):
+        # Posição ordinal da ação em self.acoes (ou -1)
+        return self._indice.get(nome, -1)
+
+    def get_acao_por_indice(self, i):
+        return self.acoes[i]
+
+    def filtrar_por_substring(self, padrao, ignorar_maiusculas=True):
+        """Nomes das ações que contêm `padrao`, na ordem do mercado (custo ~ nº de resultados)."""
+        encontrados = self.indice_nomes.buscar(padrao, ignorar_maiusculas)
+        return sorted(encontrados, key=self._indice.__getitem__)
+
+    # --- VISÕES ORDENADAS ---
+    # Listas ordenadas por nome e por preço, montadas na primeira consulta e guardadas
+    # até a próxima mudança: a de nomes só muda ao listar/deslistar, a de preços a cada
+    # movimento de preço. Entre mudanças, buscas exatas, por prefixo e por faixa de
+    # preço são binárias (O(log n) + resultados). As listas devolvidas não devem ser alteradas.
+    def _listagem_mudou(self):
+        self._por_nome = None
+        self._por_preco = None
+
+    def ordenadas_por_nome(self):
+        """Nomes das ações em ordem alfabética."""
+        if self._por_nome is None:
+            self._por_nome = sorted(self._indice)
+        return self._por_nome
+
+    def ordenadas_por_preco(self):
+        """Pares (preco, nome) em ordem crescente de preço."""
+        if self._por_preco is None:
+            nomes = [acao.nome for acao in self.acoes]
+            precos = self.motor.precos.tolist() if self.motor is not None else [acao.preco_atual for acao in self.acoes]
+            self._por_preco = sorted(zip(precos, nomes))
+        return self._por_preco
+
+    def buscar_prefixo(self, prefixo):
+        """Nomes que começam com `prefixo` (diferencia maiúsculas), em ordem alfabética."""
+        nomes = self.ordenadas_por_nome()
+        inicio, fim = faixa_prefixo(nomes, prefixo)
+        return nomes[inicio:fim]
+
+    def faixa_de_preco(self, minimo=None, maximo=None):
+        """[(nome, preco)] com minimo <= preco <= maximo (None = sem limite), do mais barato ao mais caro."""
+        precos = self.ordenadas_por_preco()
+        inicio, fim = faixa_binaria(precos, minimo, maximo, chave=_preco)
+        return [(nome, preco) for preco, nome in precos[inicio:fim]]
+
+    def buscar_aproximado(self, nome, k=5, max_distancia=None):
+        """Até k pares (distância, nome) mais parecidos com `nome`, tolerando erros de digitação."""
+        if self._aproximado is None:
+            # Só quem usa paga pela trie; daí em diante acompanha listar/deslistar
+            self._aproximado = IndiceAproximado(self._indice)
+        return self._aproximado.proximos(nome, k, max_distancia)
+
     def get_acao_por_nome(self, nome):
-        for acao in self.acoes:
-            if acao.nome == nome:
-                return acao
-        return None
+        i = self._indice.get(nome)
+        return self.acoes[i] if i is not None else None
+
+    def __contains__(self, nome):
+        return nome in self._indice
+
+    def __len__(self):
+        return len(self.acoes)
@@ -0,0 +1,235 @@
+# ordens.py
+# Livro de ofertas com ordens limitadas por ação e casamento por prioridade preço-tempo.
+import heapq
+import itertools
+
+COMPRA = 'compra'
+VENDA = 'venda'
+
+
+class Ordem:
+    __slots__ = ('id', 'dono', 'acao', 'lado', 'preco_limite', 'quantidade', 'restante', 'seq', 'dia', 'status')
+
+    def __init__(self, id_ordem, dono, acao, lado, preco_limite, quantidade, seq, dia):
+        self.id = id_ordem
+        self.dono = dono                    # Jogador que enviou a ordem
+        self.acao = acao                    # Nome da ação
+        self.lado = lado                    # COMPRA ou VENDA
+        self.preco_limite = preco_limite
+        self.quantidade = quantidade
+        self.restante = quantidade
+        self.seq = seq                      # Ordem de chegada (desempate por tempo)
+        self.dia = dia
+        self.status = 'aberta'              # aberta, executada, cancelada ou rejeitada
+
+    @property
+    def ativa(self):
+        return self.status == 'aberta'
+
+    def __repr__(self):
+        return f"Ordem({self.id}, {self.lado} {self.restante}/{self.quantidade} {self.acao} @ {self.preco_limite:.2f}, {self.status})"
+
+
+# --- LIVRO DE OFERTAS DE UMA AÇÃO ---
+# Dois heaps: compras com chave (-preço, seq), a melhor oferta é a de maior preço, e
+# vendas com chave (preço, seq), a melhor é a de menor preço; empates saem por ordem
+# de chegada. Cancelar só marca a ordem; ela é descartada quando chega ao topo
+# (remoção preguiçosa), então inserir, cancelar e casar custam O(log n).
+class LivroOfertas:
+    def __init__(self, acao):
+        self.acao = acao
+        self.compras = []                   # heap de (-preço, seq, ordem)
+        self.vendas = []                    # heap de (preço, seq, ordem)
+        self.abertas = 0                    # Ordens ativas no livro
+
+    def adicionar(self, ordem):
+        if ordem.lado == COMPRA:
+            heapq.heappush(self.compras, (-ordem.preco_limite, ordem.seq, ordem))
+        else:
+            heapq.heappush(self.vendas, (ordem.preco_limite, ordem.seq, ordem))
+        self.abertas += 1
+
+    def _limpar_topo(self, heap):
+        while heap and not heap[0][2].ativa:
+            heapq.heappop(heap)
+
+    def melhor_compra(self):
+        self._limpar_topo(self.compras)
+        return self.compras[0][2] if self.compras else None
+
+    def melhor_venda(self):
+        self._limpar_topo(self.vendas)
+        return self.vendas[0][2] if self.vendas else None
+
+    def retirar(self, ordem):
+        # Chamado quando a ordem deixa de estar ativa (executada/cancelada)
+        self.abertas -= 1
+
+    def __len__(self):
+        return self.abertas
+
+
+# --- MOTOR DE ORDENS DO MERCADO ---
+# Mantém um livro por ação e só visita, a cada movimento de preço, os livros que
+# têm ordens abertas. A liquidação usa Jogador.comprar_acao/vender_acao com o preço
+# da execução; se o dono não tiver saldo (ou ações) a ordem é rejeitada.
+class MotorOrdens:
+    def __init__(self, mercado):
+        self.mercado = mercado
+        self.livros = {}                    # nome da ação -> LivroOfertas
+        self.ordens = {}                    # id -> Ordem aberta
+        self.execucoes = []                 # (ordem, quantidade, preço, dia) do último casamento
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+
+    def livro(self, acao):
+        livro = self.livros.get(acao)
+        if livro is None:
+            livro = self.livros[acao] = LivroOfertas(acao)
+        return livro
+
+    def enviar(self, dono, acao, lado, quantidade, preco_limite):
+        """Envia uma ordem limitada; casa o que for possível na hora e deixa o resto no livro."""
+        if lado not in (COMPRA, VENDA):
+            raise ValueError("lado deve ser 'compra' ou 'venda'.")
+        if quantidade <= 0 or preco_limite <= 0:
+            raise ValueError("quantidade e preço limite devem ser positivos.")
+        if acao not in self.mercado:
+            raise ValueError(f"Ação não listada: {acao}")
+        ordem = Ordem(next(self._ids), dono, acao, lado, preco_limite, quantidade, next(self._seq), self.mercado.dia)
+        self.execucoes = []
+        acao_obj = self.mercado.get_acao_por_nome(acao)
+        self._casar_entre_ordens(self.livro(acao), ordem, acao_obj.preco_atual)
+        if ordem.ativa:
+            self._casar_com_preco(ordem, acao_obj)
+        if ordem.ativa:
+            self.livro(acao).adicionar(ordem)   # O livro pode ter sido esvaziado no casamento
+            self.ordens[ordem.id] = ordem
+        return ordem
+
+    def cancelar(self, id_ordem):
+        ordem = self.ordens.get(id_ordem)
+        if ordem is None:
+            return False
+        self._encerrar(ordem, 'cancelada')
+        return True
+
+    def cancelar_acao(self, acao):
+        # Cancela todas as ordens de uma ação (usado ao deslistá-la)
+        livro = self.livros.get(acao)
+        if livro is None:
+            return 0
+        ordens = [o for _, _, o in livro.compras + livro.vendas if o.ativa]
+        for ordem in ordens:
+            self._encerrar(ordem, 'cancelada')
+        return len(ordens)
+
+    def ordens_de(self, dono):
+        return [o for o in self.ordens.values() if o.dono is dono]
+
+    def _encerrar(self, ordem, status):
+        ordem.status = status
+        if self.ordens.pop(ordem.id, None) is not None:
+            livro = self.livros[ordem.acao]
+            livro.retirar(ordem)
+            if not livro:
+                # Livro vazio sai do dicionário: avancar_dia só visita livros com ordens
+                del self.livros[ordem.acao]
+
+    def _liquidar(self, ordem, quantidade, preco):
+        acao = self.mercado.get_acao_por_nome(ordem.acao)
+        dia = self.mercado.dia
+        if ordem.lado == COMPRA:
+            ok = ordem.dono.comprar_acao(acao, quantidade, dia, preco=preco)
+        else:
+            ok = ordem.dono.vender_acao(acao, quantidade, dia, preco=preco)
+        if not ok:
+            self._encerrar(ordem, 'rejeitada')
+            return False
+        ordem.restante -= quantidade
+        self.execucoes.append((ordem, quantidade, preco, dia))
+        if ordem.restante == 0:
+            self._encerrar(ordem, 'executada')
+        return True
+
+    def _pode_liquidar(self, ordem, quantidade, preco):
+        if ordem.lado == COMPRA:
+            return ordem.dono.saldo >= quantidade * preco
+        return ordem.dono.carteira.get(ordem.acao, (0, 0))[0] >= quantidade
+
+    def _casar_entre_ordens(self, livro, ordem, preco_mercado):
+        # A ordem nova cruza com as do lado oposto, ao preço da ordem que já estava no livro.
+        # Ofertas do mesmo dono são puladas (ninguém negocia consigo mesmo) e voltam ao heap
+        # no fim; se o preço do mercado for melhor que a melhor oferta, o casamento para
+        # aqui e o resto executa a esse preço em _casar_com_preco.
+        heap = livro.vendas if ordem.lado == COMPRA else livro.compras
+        puladas = []
+        while ordem.ativa:
+            oposta = livro.melhor_venda() if ordem.lado == COMPRA else livro.melhor_compra()
+            if oposta is None:
+                break
+            if oposta.dono is ordem.dono:
+                puladas.append(heapq.heappop(heap))
+                continue
+            if ordem.lado == COMPRA:
+                cruza = oposta.preco_limite <= ordem.preco_limite and oposta.preco_limite <= preco_mercado
+            else:
+                cruza = oposta.preco_limite >= ordem.preco_limite and oposta.preco_limite >= preco_mercado
+            if not cruza:
+                break
+            quantidade = min(ordem.restante, oposta.restante)
+            preco = oposta.preco_limite
+            if not self._pode_liquidar(oposta, quantidade, preco):
+                self._encerrar(oposta, 'rejeitada')
+                continue
+            if not self._pode_liquidar(ordem, quantidade, preco):
+                ordem.status = 'rejeitada'
+                break
+            self._liquidar(oposta, quantidade, preco)
+            self._liquidar(ordem, quantidade, preco)
+        for entrada in puladas:
+            heapq.heappush(heap, entrada)
+
+    def _casar_com_preco(self, ordem, acao):
+        # Ordem que cruza o preço atual do mercado executa inteira a esse preço
+        preco = acao.preco_atual
+        if (ordem.lado == COMPRA and preco <= ordem.preco_limite) or (ordem.lado == VENDA and preco >= ordem.preco_limite):
+            self._liquidar(ordem, ordem.restante, preco)
+
+    def casar(self, acoes=None):
+        """Executa as ordens que o novo preço alcançou (todas as ações com livro, ou só `acoes`).
+
+        Retorna a lista de execuções (ordem, quantidade, preço, dia).
+        """
+        self.execucoes = []
+        nomes = list(self.livros) if acoes is None else [a for a in acoes if a in self.livros]
+        for nome in nomes:
+            livro = self.livros.get(nome)
+            if livro is None:
+                continue
+            preco = self.mercado.get_acao_por_nome(nome).preco_atual
+            # Melhor preço primeiro e, no mesmo preço, a ordem mais antiga
+            while (ordem := livro.melhor_compra()) is not None and ordem.preco_limite >= preco:
+                self._liquidar(ordem, ordem.restante, preco)
+            while (ordem := livro.melhor_venda()) is not None and ordem.preco_limite <= preco:
+                self._liquidar(ordem, ordem.restante, preco)
+        return self.execucoes
+
+    # --- SNAPSHOT (ver sessao.py) ---
+    def estado(self, dono):
+        """Ordens abertas de `dono` como listas simples (para o cabeçalho do snapshot)."""
+        return [[o.id, o.acao, o.lado, o.preco_limite, o.quantidade, o.restante, o.seq, o.dia]
+                for o in sorted(self.ordens_de(dono), key=lambda o: o.seq)]
+
+    def restaurar(self, estado, dono):
+        for id_ordem, acao, lado, preco_limite, quantidade, restante, seq, dia in estado:
+            ordem = Ordem(id_ordem, dono, acao, lado, preco_limite, quantidade, seq, dia)
+            ordem.restante = restante
+            self.livro(acao).adicionar(ordem)
+            self.ordens[id_ordem] = ordem
+        if estado:
+            self._ids = itertools.count(max(o[0] for o in estado) + 1)
+            self._seq = itertools.count(max(o[6] for o in estado) + 1)
+
+    def __len__(self):
+        return len(self.ordens)
@@ -0,0 +1,136 @@
+# perf.py
+# Instrumentação opcional dos caminhos críticos: contadores, tempos e percentis.
+# Desligada por padrão; nesse estado cada função medida custa só um teste de booleano.
+import cProfile
+import csv
+import io
+import json
+import pstats
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+_ativo = False
+AMOSTRAS_MAX = 10_000                       # Últimas amostras guardadas por medição
+
+
+class Estatistica:
+    __slots__ = ('nome', 'chamadas', 'total', 'maximo', 'amostras')
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.chamadas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.amostras = deque(maxlen=AMOSTRAS_MAX)
+
+    def registrar(self, segundos):
+        self.chamadas += 1
+        self.total += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+        self.amostras.append(segundos)
+
+    def percentil(self, p):
+        if not self.amostras:
+            return 0.0
+        ordenadas = sorted(self.amostras)
+        return ordenadas[min(len(ordenadas) - 1, int(p / 100 * len(ordenadas)))]
+
+    def resumo(self):
+        return {
+            'nome': self.nome,
+            'chamadas': self.chamadas,
+            'total_ms': self.total * 1e3,
+            'media_ms': self.total / self.chamadas * 1e3 if self.chamadas else 0.0,
+            'p50_ms': self.percentil(50) * 1e3,
+            'p99_ms': self.percentil(99) * 1e3,
+            'max_ms': self.maximo * 1e3,
+        }
+
+
+_estatisticas = {}                          # nome -> Estatistica
+
+
+def ativar(ligado=True):
+    global _ativo
+    _ativo = ligado
+
+
+def ativo():
+    return _ativo
+
+
+def zerar():
+    _estatisticas.clear()
+
+
+def registrar(nome, segundos):
+    est = _estatisticas.get(nome)
+    if est is None:
+        est = _estatisticas[nome] = Estatistica(nome)
+    est.registrar(segundos)
+
+
+def medido(nome):
+    """Decorador: mede cada chamada com o nome dado quando a instrumentação está ativa."""
+    def decorador(funcao):
+        @wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if not _ativo:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registrar(nome, time.perf_counter() - inicio)
+        return envoltorio
+    return decorador
+
+
+@contextmanager
+def medir(nome):
+    # Mede um bloco de código: with perf.medir('nome'): ...
+    if not _ativo:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(nome, time.perf_counter() - inicio)
+
+
+def resumo():
+    """Lista de dicionários (um por medição), do maior tempo total para o menor."""
+    return sorted((est.resumo() for est in _estatisticas.values()), key=lambda r: r['total_ms'], reverse=True)
+
+
+CAMPOS = ['nome', 'chamadas', 'total_ms', 'media_ms', 'p50_ms', 'p99_ms', 'max_ms']
+
+
+def exportar_csv(caminho):
+    with open(caminho, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS)
+        escritor.writeheader()
+        escritor.writerows(resumo())
+
+
+def exportar_json(caminho):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(resumo(), f, indent=2, ensure_ascii=False)
+
+
+def capturar_cprofile(funcao, *args, linhas=25, caminho=None, **kwargs):
+    """Roda `funcao` sob cProfile; retorna (resultado, relatório em texto das funções mais caras).
+
+    Com `caminho`, grava também o .prof para abrir no snakeviz/pstats.
+    """
+    perfil = cProfile.Profile()
+    resultado = perfil.runcall(funcao, *args, **kwargs)
+    if caminho:
+        perfil.dump_stats(caminho)
+    saida = io.StringIO()
+    pstats.Stats(perfil, stream=saida).sort_stats('cumulative').print_stats(linhas)
+    return resultado, saida.getvalue()
@@ -1,60 +1,144 @@
+import perf
+from diario import Diario, COMPRA, VENDA, NOTICIA
+
 class Jogador:
-    def __init__(self, nome):
+    def __init__(self, nome, caminho_diario=None):
         self.nome = nome
         self.saldo = 1000.0  # Saldo inicial
         self.carteira = {}   # {nome_acao: (quantidade, preco_medio)}
-        self.historico = []  # Lista de operações realizadas
+        self.diario = Diario(caminho_diario)  # Registros binários das operações
+        self.historico = self.diario.textos()  # Visão em texto do diário (só leitura)
+        # Valor da carteira mantido por diferenças (ver AVALIAÇÃO INCREMENTAL)
+        self._valor = 0.0                   # Σ quantidade × último preço marcado
+        self._custo = 0.0                   # Σ quantidade × preço médio
+        self._marcas = {}                   # nome_acao -> preço usado em self._valor
+        self._mercado = None                # Mercado que avisa das mudanças de preço
 
-    def comprar_acao(self, acao, quantidade):
-        custo_total = acao.preco_atual * quantidade
-        if self.saldo >= custo_total:
+    @perf.medido('jogador.comprar_acao')
+    def comprar_acao(self, acao, quantidade, dia=0, preco=None):
+        # preco: preço de execução (ordens limitadas); por padrão o preço atual
+        preco = acao.preco_atual if preco is None else preco
+        custo_total = preco * quantidade
+        if quantidade > 0 and self.saldo >= custo_total:
             self.saldo -= custo_total
+            self._marcar(acao.nome, acao.preco_atual)
+            self._valor += quantidade * acao.preco_atual
+            self._custo += quantidade * preco
             
             if acao.nome in self.carteira:
                 # Atualiza quantidade e preço médio
                 qtd_atual, preco_medio_atual = self.carteira[acao.nome]
                 nova_qtd = qtd_atual + quantidade
-                novo_preco_medio = ((qtd_atual * preco_medio_atual) + (quantidade * acao.preco_atual)) / nova_qtd
+                novo_preco_medio = ((qtd_atual * preco_medio_atual) + (quantidade * preco)) / nova_qtd
                 self.carteira[acao.nome] = (nova_qtd, novo_preco_medio)
             else:
                 # Primeira compra desta ação
-                self.carteira[acao.nome] = (quantidade, acao.preco_atual)
+                self.carteira[acao.nome] = (quantidade, preco)
             
-            # Registra no histórico
-            self.historico.append(f"Comprou {quantidade} de {acao.nome} por ${acao.preco_atual:.2f} cada")
+            # Registra no diário
+            self.diario.registrar(dia, acao.nome, COMPRA, quantidade, preco)
             return True
         return False
 
-    def vender_acao(self, acao, quantidade):
-        if acao.nome in self.carteira:
+    @perf.medido('jogador.vender_acao')
+    def vender_acao(self, acao, quantidade, dia=0, preco=None):
+        preco = acao.preco_atual if preco is None else preco
+        if quantidade > 0 and acao.nome in self.carteira:
             qtd_atual, preco_medio = self.carteira[acao.nome]
             if qtd_atual >= quantidade:
                 # Vende as ações
-                valor_venda = acao.preco_atual * quantidade
+                valor_venda = preco * quantidade
                 self.saldo += valor_venda
+                self._marcar(acao.nome, acao.preco_atual)
+                self._valor -= quantidade * acao.preco_atual
+                self._custo -= quantidade * preco_medio
                 
                 # Atualiza a carteira
                 nova_qtd = qtd_atual - quantidade
                 if nova_qtd == 0:
                     del self.carteira[acao.nome]
+                    del self._marcas[acao.nome]
                 else:
                     self.carteira[acao.nome] = (nova_qtd, preco_medio)
                 
-                # Registra no histórico
-                lucro = (acao.preco_atual - preco_medio) * quantidade
-                self.historico.append(f"Vendeu {quantidade} de {acao.nome} por ${acao.preco_atual:.2f} cada (Lucro: ${lucro:.2f})")
+                # Registra no diário
+                lucro = (preco - preco_medio) * quantidade
+                self.diario.registrar(dia, acao.nome, VENDA, quantidade, preco, lucro)
                 return True
         return False
 
-    def get_valor_carteira(self, mercado):
-        """Calcula o valor total da carteira no mercado atual"""
-        valor_total = 0
-        for nome_acao, (quantidade, _) in self.carteira.items():
+    def registrar_noticia(self, acao, impacto, dia=0):
+        self.diario.registrar(dia, acao.nome, NOTICIA, 0, acao.preco_atual, impacto)
+
+    # --- AVALIAÇÃO INCREMENTAL ---
+    # Em vez de percorrer a carteira a cada leitura, o valor de mercado e o custo das
+    # posições são atualizados por diferenças: nas operações e quando o Mercado avisa
+    # que o preço de ações em carteira mudou (avancar_dia, notícias). Ler valor,
+    # lucro e patrimônio custa O(1); o custo de cada dia é O(posições abertas).
+    def _marcar(self, nome_acao, preco):
+        # Leva a posição de nome_acao ao novo preço, somando a diferença em self._valor
+        anterior = self._marcas.get(nome_acao)
+        if anterior is not None and anterior != preco:
+            self._valor += self.carteira[nome_acao][0] * (preco - anterior)
+        self._marcas[nome_acao] = preco
+
+    def remarcar(self, mercado, nomes=None):
+        """Chamado pelo Mercado depois de mover preços (todas as posições ou só `nomes`)."""
+        for nome_acao in (self.carteira if nomes is None else nomes):
+            if nome_acao in self.carteira:
+                acao = mercado.get_acao_por_nome(nome_acao)
+                if acao is not None:
+                    self._marcar(nome_acao, acao.preco_atual)
+
+    def acompanhar(self, mercado):
+        # Passa a receber os avisos de preço de `mercado` (recalcula tudo uma vez)
+        if self._mercado is mercado:
+            return
+        if self._mercado is not None:
+            self._mercado.deixar_de_observar(self)
+        self._mercado = mercado
+        mercado.observar_carteira(self)
+        self._valor, lucro = self._recalcular(mercado)
+        self._custo = self._valor - lucro
+        for nome_acao in self.carteira:
             acao = mercado.get_acao_por_nome(nome_acao)
-            if acao:
-                valor_total += acao.preco_atual * quantidade
-        return valor_total
+            self._marcas[nome_acao] = acao.preco_atual if acao else self._marcas.get(nome_acao, self.carteira[nome_acao][1])
+
+    def preco_de(self, mercado, nome_acao):
+        # Preço de uma posição: o atual ou, se a ação foi deslistada, o último marcado
+        acao = mercado.get_acao_por_nome(nome_acao)
+        if acao is not None:
+            return acao.preco_atual
+        return self._marcas.get(nome_acao, self.carteira[nome_acao][1])
+
+    def _recalcular(self, mercado):
+        # Cálculo completo (valor, lucro não realizado), percorrendo toda a carteira
+        valor_total = 0.0
+        lucro = 0.0
+        for nome_acao, (quantidade, preco_medio) in self.carteira.items():
+            preco = self.preco_de(mercado, nome_acao)
+            valor_total += preco * quantidade
+            lucro += (preco - preco_medio) * quantidade
+        return valor_total, lucro
+
+    def verificar_consistencia(self, mercado, tolerancia=1e-6):
+        """Confere os valores incrementais contra o cálculo completo; True se baterem."""
+        self.acompanhar(mercado)
+        valor_total, lucro = self._recalcular(mercado)
+        escala = max(1.0, abs(valor_total))
+        return (abs(self._valor - valor_total) <= tolerancia * escala and
+                abs(self.get_lucro_nao_realizado(mercado) - lucro) <= tolerancia * escala)
+
+    def get_valor_carteira(self, mercado):
+        """Valor total da carteira no mercado atual"""
+        self.acompanhar(mercado)
+        return self._valor
+
+    def get_lucro_nao_realizado(self, mercado):
+        """Lucro/prejuízo das posições abertas pelo preço atual"""
+        self.acompanhar(mercado)
+        return self._valor - self._custo
 
     def get_patrimonio_total(self, mercado):
         """Retorna saldo + valor da carteira"""
-        return self.saldo + self.get_valor_carteira(mercado)
\ No newline at end of file
+        return self.saldo + self.get_valor_carteira(mercado)
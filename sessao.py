@@ -0,0 +1,201 @@
+# sessao.py
+# Snapshot binário de uma sessão inteira (mercado, jogador, diário, ordens e desafios).
+#
+# Formato: MAGICO | deslocamento e tamanho do cabeçalho ('<QQ') | seções | cabeçalho JSON.
+# Cada seção (preços, históricos, registros do diário...) começa alinhada em 64 bytes e
+# pode reservar espaço além dos bytes usados (buracos esparsos no arquivo). Na carga o
+# arquivo é mapeado com mmap em modo cópia-na-escrita: os buffers grandes são usados
+# direto do mapa, só as páginas lidas entram na memória e o jogo continua gravando
+# neles sem alterar o arquivo. Enquanto o mapa estiver aberto o arquivo não pode ser
+# substituído em todos os sistemas (no Windows os.replace falha): quem vai gravar de
+# novo no mesmo caminho carrega com mapear=False, que lê o arquivo inteiro para a memória.
+import json
+import mmap
+import os
+import random
+import struct
+import threading
+from collections import namedtuple
+
+from challenges import MotorDesafios
+from diario import Diario
+from historico import HistoricoPrecos
+from market import Acao, Mercado, MotorPrecos
+from player import Jogador
+
+MAGICO = b'BOLSA\x00\x01\x00'
+PREFIXO = struct.Struct('<8sQQ')
+ALINHAMENTO = 64
+
+Sessao = namedtuple('Sessao', ['mercado', 'jogador', 'desafios', 'extras'])
+
+
+# --- CAPTURA ---
+# Feita na thread da interface: guarda o cabeçalho já serializado e referências aos
+# buffers. Os trechos que nunca são reescritos vão sem cópia, o resto já vem copiado
+# de estado(), então gravar() pode rodar em outra thread enquanto o jogo continua.
+# Só o modo por objeto (históricos sem max_dias) e o diário saem sem cópia; no modo
+# vetorizado a matriz de histórico do motor é copiada aqui, O(dias x ações).
+class Captura:
+    def __init__(self):
+        self.secoes = []                    # (nome, buffer, bytes reservados)
+        self.cabecalho = None
+
+    def adicionar(self, prefixo, secoes):
+        for nome, dados in secoes.items():
+            dados, reserva = dados if isinstance(dados, tuple) else (dados, None)
+            dados = memoryview(dados).cast('B')
+            self.secoes.append((prefixo + nome, dados, max(reserva or 0, dados.nbytes)))
+
+    @property
+    def tamanho(self):
+        return sum(reserva for _, _, reserva in self.secoes)
+
+
+def capturar(mercado, jogador, desafios=None, extras=None):
+    captura = Captura()
+    meta_mercado = {'dia': mercado.dia, 'vetorizado': mercado.motor is not None, 'seed': mercado.seed,
+                    'max_historico': mercado.max_historico, 'niveis_historico': mercado.niveis_historico,
+                    'acoes': [acao.nome for acao in mercado.acoes]}
+    if mercado.motor is not None:
+        meta_mercado['motor'], secoes = mercado.motor.estado()
+        captura.adicionar('motor/', secoes)
+    else:
+        meta_mercado['precos'] = [acao.preco_atual for acao in mercado.acoes]
+        meta_mercado['tendencias'] = [acao.tendencia for acao in mercado.acoes]
+        meta_mercado['historicos'] = []
+        for i, acao in enumerate(mercado.acoes):
+            meta, secoes = acao.historico.estado()
+            meta_mercado['historicos'].append(meta)
+            captura.adicionar(f'acao/{i}/', secoes)
+    meta_diario, secoes = jogador.diario.estado()
+    captura.adicionar('diario/', secoes)
+    cabecalho = {
+        'mercado': meta_mercado,
+        'ordens': mercado.ordens.estado(jogador),
+        'jogador': {'nome': jogador.nome, 'saldo': jogador.saldo,
+                    'carteira': [[nome, qtd, preco_medio] for nome, (qtd, preco_medio) in jogador.carteira.items()],
+                    'diario': meta_diario},
+        'desafios': desafios.estado() if desafios is not None else None,
+        'random': random.getstate(),        # Notícias e preços do modo por objeto usam o random global
+        'extras': extras or {},
+    }
+    captura.cabecalho = json.dumps(cabecalho).encode('utf-8')
+    return captura
+
+
+# --- GRAVAÇÃO ---
+def _alinhar(posicao):
+    return -(-posicao // ALINHAMENTO) * ALINHAMENTO
+
+def gravar(captura, caminho):
+    """Grava a captura em `caminho` (arquivo temporário + os.replace: nunca fica pela metade)."""
+    temporario = caminho + '.tmp'
+    posicao = _alinhar(PREFIXO.size)
+    tabela = {}
+    with open(temporario, 'wb') as f:
+        f.seek(posicao)
+        for nome, dados, reserva in captura.secoes:
+            f.write(dados)
+            tabela[nome] = [posicao, dados.nbytes, reserva]
+            posicao = _alinhar(posicao + reserva)
+            f.seek(posicao)                 # A reserva vira buraco esparso
+        cabecalho = json.dumps({'secoes': tabela}).encode('utf-8') + b'\n' + captura.cabecalho
+        f.write(cabecalho)
+        f.seek(0)
+        f.write(PREFIXO.pack(MAGICO, posicao, len(cabecalho)))
+    os.replace(temporario, caminho)
+
+def salvar_sessao(caminho, mercado, jogador, desafios=None, extras=None):
+    gravar(capturar(mercado, jogador, desafios, extras), caminho)
+
+
+# --- CARGA ---
+def carregar_sessao(caminho, mapear=True):
+    """Reconstrói a sessão gravada; retorna Sessao(mercado, jogador, desafios, extras).
+
+    O diário volta sempre em memória, mesmo que tenha sido gravado de um arquivo.
+    Com mapear=False o arquivo é lido por inteiro e fica livre para ser regravado.
+    """
+    with open(caminho, 'rb') as f:
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) if mapear else bytearray(f.read())
+    magico, inicio, tamanho = PREFIXO.unpack_from(mapa, 0)
+    if magico != MAGICO:
+        raise ValueError("Arquivo não é um snapshot de sessão.")
+    tabela, cabecalho = bytes(mapa[inicio:inicio + tamanho]).split(b'\n', 1)
+    tabela = json.loads(tabela)['secoes']
+    cabecalho = json.loads(cabecalho)
+    visao = memoryview(mapa)                # Mantém o mapa vivo enquanto houver buffers em uso
+
+    # Seções agrupadas por dono ('motor', 'diario', 'acao/<i>'), numa única passada
+    grupos = {}
+    for nome, (p, _, reserva) in tabela.items():
+        grupo, _, resto = nome.partition('/')
+        if grupo == 'acao':
+            i, _, resto = resto.partition('/')
+            grupo = f'acao/{i}'
+        grupos.setdefault(grupo, {})[resto] = visao[p:p + reserva]
+
+    meta = cabecalho['mercado']
+    mercado = Mercado(vetorizado=meta['vetorizado'], num_acoes=0, seed=meta['seed'],
+                      max_historico=meta['max_historico'], niveis_historico=meta['niveis_historico'])
+    mercado.dia = meta['dia']
+    if meta['vetorizado']:
+        mercado.motor = MotorPrecos.restaurar(meta['motor'], grupos['motor'])
+        mercado.listar_vetorizadas(meta['acoes'])
+    else:
+        for i, nome in enumerate(meta['acoes']):
+            acao = Acao(nome, meta['precos'][i])
+            acao.tendencia = meta['tendencias'][i]
+            acao.historico = HistoricoPrecos.restaurar(meta['historicos'][i], grupos[f'acao/{i}'])
+            mercado.adicionar_acao(acao)
+
+    dados = cabecalho['jogador']
+    jogador = Jogador(dados['nome'])
+    jogador.saldo = dados['saldo']
+    jogador.carteira = {nome: (qtd, preco_medio) for nome, qtd, preco_medio in dados['carteira']}
+    jogador.diario = Diario.restaurar(dados['diario'], grupos['diario'])
+    jogador.historico = jogador.diario.textos()
+    mercado.ordens.restaurar(cabecalho['ordens'], jogador)
+
+    desafios = None
+    if cabecalho.get('desafios') is not None:   # Snapshots antigos (um só desafio) voltam sem desafios
+        desafios = MotorDesafios.restaurar(cabecalho['desafios'])
+
+    versao, estado, gauss = cabecalho['random']
+    random.setstate((versao, tuple(estado), gauss))
+    return Sessao(mercado, jogador, desafios, cabecalho['extras'])
+
+
+# --- GRAVAÇÃO EM SEGUNDO PLANO ---
+class AutoSalvamento:
+    """Grava capturas numa thread própria; uma gravação por vez, as pedidas no meio são puladas."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._thread = None
+        self.erro = None                    # Última exceção da gravação (lida pela interface)
+        self.gravacoes = 0
+
+    @property
+    def ocupado(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def salvar(self, captura):
+        if self.ocupado:
+            return False
+        self._thread = threading.Thread(target=self._gravar, args=(captura,), daemon=True)
+        self._thread.start()
+        return True
+
+    def _gravar(self, captura):
+        try:
+            gravar(captura, self.caminho)
+            self.gravacoes += 1
+            self.erro = None
+        except Exception as erro:           # Repassa para a interface em vez de morrer em silêncio
+            self.erro = erro
+
+    def aguardar(self):
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,192 @@
+# simulacao.py
+# Execução sem interface (sem Tk) dos desafios, para Monte Carlo em paralelo.
+# Uso: python simulacao.py --episodios 5000 --estrategia tendencia --processos 8
+#      python simulacao.py --agentes 10000 --acoes 500 --impacto 0.0001
+import argparse
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from agentes import PopulacaoAgentes
+from challenges import CONCLUIDO, DESAFIOS, EM_ANDAMENTO, FALHOU, MotorDesafios, Retrato, retrato_de
+from market import Mercado
+from player import Jogador
+
+SALDO_INICIAL = 1000.0
+
+
+# --- ESTRATÉGIAS ---
+# Cada estratégia recebe (mercado, jogador, rng) e faz as operações do dia,
+# usando as mesmas regras de compra/venda de Jogador que a interface usa.
+def estrategia_parada(mercado, jogador, rng):
+    pass
+
+
+def estrategia_aleatoria(mercado, jogador, rng):
+    acao = rng.choice(mercado.acoes)
+    if rng.random() < 0.5:
+        jogador.comprar_acao(acao, 1, mercado.dia)
+    else:
+        jogador.vender_acao(acao, 1, mercado.dia)
+
+
+def estrategia_comprar_e_segurar(mercado, jogador, rng):
+    # Gasta o saldo no primeiro dia, dividido igualmente entre 3 ações
+    if jogador.carteira or mercado.dia > 0:
+        return
+    for acao in rng.sample(mercado.acoes, 3):
+        jogador.comprar_acao(acao, int(jogador.saldo / 3 // acao.preco_atual), mercado.dia)
+
+
+def estrategia_tendencia(mercado, jogador, rng):
+    # Compra o que subiu no último dia e vende o que caiu
+    for acao in mercado.acoes:
+        ultimos = acao.get_historico(2)
+        if len(ultimos) < 2:
+            continue
+        if ultimos[-1] > ultimos[-2]:
+            jogador.comprar_acao(acao, 1, mercado.dia)
+        elif ultimos[-1] < ultimos[-2] and acao.nome in jogador.carteira:
+            jogador.vender_acao(acao, jogador.carteira[acao.nome][0], mercado.dia)
+
+
+ESTRATEGIAS = {
+    'parada': estrategia_parada,
+    'aleatoria': estrategia_aleatoria,
+    'comprar_e_segurar': estrategia_comprar_e_segurar,
+    'tendencia': estrategia_tendencia,
+}
+
+
+# --- EPISÓDIO ---
+def rodar_episodio(indice_desafio, estrategia, seed):
+    """Joga um desafio do início ao fim, como a interface faria, e retorna o resultado."""
+    random.seed(seed)                       # Mercado e notícias usam o random global
+    rng = random.Random(seed ^ 0x5EED)      # Decisões da estratégia
+    mercado = Mercado()
+    jogador = Jogador("Bot")
+    desafios = MotorDesafios()
+    desafio = desafios.iniciar(DESAFIOS[indice_desafio], retrato_de(jogador, mercado))
+    operar = ESTRATEGIAS[estrategia]
+
+    while desafio.ativo:
+        operar(mercado, jogador, rng)
+        noticia = mercado.gerar_noticia()
+        if noticia:
+            jogador.registrar_noticia(*noticia, mercado.dia)
+        mercado.avancar_dia()
+        desafios.atualizar(retrato_de(jogador, mercado))
+
+    return {
+        'seed': seed,
+        'status': desafio.status,
+        'dias': desafio.dia_fim - desafio.dia_inicio,
+        'pnl': jogador.get_patrimonio_total(mercado) - SALDO_INICIAL,
+    }
+
+
+def _rodar_lote(args):
+    indice_desafio, estrategia, seeds = args
+    return [rodar_episodio(indice_desafio, estrategia, s) for s in seeds]
+
+
+# --- MONTE CARLO ---
+def percentil(valores_ordenados, p):
+    if not valores_ordenados:
+        return 0.0
+    k = min(len(valores_ordenados) - 1, max(0, round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[k]
+
+
+def agregar(resultados):
+    pnls = sorted(r['pnl'] for r in resultados)
+    concluidos = sum(1 for r in resultados if r['status'] == "concluido")
+    return {
+        'episodios': len(resultados),
+        'taxa_sucesso': concluidos / len(resultados) if resultados else 0.0,
+        'dias_medio': statistics.fmean(r['dias'] for r in resultados) if resultados else 0.0,
+        'pnl_medio': statistics.fmean(pnls) if pnls else 0.0,
+        'pnl_desvio': statistics.pstdev(pnls) if pnls else 0.0,
+        'pnl_p5': percentil(pnls, 5),
+        'pnl_p50': percentil(pnls, 50),
+        'pnl_p95': percentil(pnls, 95),
+    }
+
+
+def rodar_monte_carlo(indice_desafio, estrategia='aleatoria', episodios=1000, seed=0, processos=None, lote=250):
+    """Roda `episodios` episódios com seeds seed..seed+episodios-1 em um pool de processos.
+
+    O resultado não depende do número de processos: cada episódio tem sua própria seed.
+    """
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Estratégia desconhecida: {estrategia}")
+    seeds = list(range(seed, seed + episodios))
+    lotes = [(indice_desafio, estrategia, seeds[i:i + lote]) for i in range(0, len(seeds), lote)]
+    if processos == 1:
+        partes = map(_rodar_lote, lotes)
+        resultados = [r for parte in partes for r in parte]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            resultados = [r for parte in pool.map(_rodar_lote, lotes) for r in parte]
+    return agregar(resultados)
+
+
+# --- POPULAÇÃO DE AGENTES ---
+def rodar_populacao(num_agentes, dias=10, seed=0, num_acoes=None, vetorizado=False, impacto=0.0):
+    """Milhares de agentes no mesmo mercado por exatamente `dias` dias; retorna o resumo
+    por estratégia e, para cada desafio, a fração de agentes que o concluíram, falharam
+    ou ainda estão em andamento (prazo maior que `dias`). Todos os desafios correm ao
+    mesmo tempo para cada agente, avaliados pelo MotorDesafios com o retrato diário.
+    """
+    random.seed(seed)
+    mercado = Mercado(vetorizado=vetorizado, num_acoes=num_acoes, seed=seed)
+    populacao = PopulacaoAgentes(mercado, num_agentes, SALDO_INICIAL, seed=seed, impacto=impacto)
+    desafios = MotorDesafios()
+    por_meta = [[] for _ in DESAFIOS]
+    for agente, (saldo, patrimonio) in enumerate(zip(populacao.saldo.tolist(), populacao.patrimonio().tolist())):
+        for i, meta in enumerate(DESAFIOS):
+            por_meta[i].append(desafios.iniciar(meta, Retrato(populacao.dias, saldo, patrimonio), agente))
+    for _ in range(dias):
+        populacao.dia()
+        for agente, (saldo, patrimonio) in enumerate(zip(populacao.saldo.tolist(), populacao.patrimonio().tolist())):
+            desafios.atualizar(Retrato(populacao.dias, saldo, patrimonio), agente)
+    return {
+        'dias': populacao.dias,
+        'estrategias': populacao.resumo(),
+        'desafios': {meta.descricao: {status: sum(d.status == status for d in por_meta[i]) / num_agentes
+                                      for status in (CONCLUIDO, FALHOU, EM_ANDAMENTO)}
+                     for i, meta in enumerate(DESAFIOS)},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo dos desafios (sem interface)")
+    parser.add_argument('--episodios', type=int, default=1000)
+    parser.add_argument('--estrategia', choices=sorted(ESTRATEGIAS), default='aleatoria')
+    parser.add_argument('--desafio', type=int, nargs='*', help="índices em DESAFIOS (padrão: todos)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--agentes', type=int, default=0, help="simula N agentes no mesmo mercado (requer NumPy)")
+    parser.add_argument('--dias', type=int, default=10, help="dias da simulação com --agentes")
+    parser.add_argument('--acoes', type=int, default=None, help="número de ações do mercado com --agentes")
+    parser.add_argument('--impacto', type=float, default=0.0, help="impacto no preço por ação de saldo líquido")
+    args = parser.parse_args()
+
+    if args.agentes:
+        r = rodar_populacao(args.agentes, args.dias, args.seed, args.acoes, vetorizado=True, impacto=args.impacto)
+        print(f"{r['dias']} dias")
+        print(f"{'estratégia':<20} {'agentes':>8} {'média':>10} {'p5':>10} {'p50':>10} {'p95':>10}")
+        for nome, e in r['estrategias'].items():
+            print(f"{nome:<20} {e['agentes']:>8} {e['media']:>10.2f} {e['p5']:>10.2f} {e['p50']:>10.2f} {e['p95']:>10.2f}")
+        print()
+        print(f"{'desafio':<46} {'concluído':>10} {'falhou':>8} {'em andamento':>13}")
+        for descricao, taxas in r['desafios'].items():
+            print(f"{descricao:<46} {taxas[CONCLUIDO]:>10.1%} {taxas[FALHOU]:>8.1%} {taxas[EM_ANDAMENTO]:>13.1%}")
+        raise SystemExit(0)
+
+    indices = args.desafio if args.desafio else range(len(DESAFIOS))
+    print(f"{'desafio':<46} {'sucesso':>8} {'dias':>6} {'P&L médio':>10} {'p5':>9} {'p50':>9} {'p95':>9}")
+    for i in indices:
+        r = rodar_monte_carlo(i, args.estrategia, args.episodios, args.seed, args.processos)
+        print(f"{DESAFIOS[i].descricao:<46} {r['taxa_sucesso']:>7.1%} {r['dias_medio']:>6.1f} "
+              f"{r['pnl_medio']:>10.2f} {r['pnl_p5']:>9.2f} {r['pnl_p50']:>9.2f} {r['pnl_p95']:>9.2f}")
@@ -0,0 +1,53 @@
+# telas.py
+# Montagem (sem Tk) do conteúdo exibido pela interface. A App só aplica o resultado
+# nos widgets; os benchmarks usam as mesmas funções para medir uma atualização de tela.
+
+
+def acoes_listadas(mercado, filtro=""):
+    # (nome, preço) das ações na ordem da lista do Mercado, já filtradas
+    # ALGORITMO: Índice de n-gramas do Mercado - filtra ações por substring
+    if filtro:
+        return [(nome, mercado.get_acao_por_nome(nome).preco_atual) for nome in mercado.filtrar_por_substring(filtro)]
+    return mercado.listar_acoes()
+
+
+def linhas_mercado(mercado, carteira, filtro=""):
+    # Linhas (iid, valores, tags) da lista de ações, já filtradas
+    return [(nome, (nome, f"${preco:.2f}", carteira.get(nome, (0,))[0]), ()) for nome, preco in acoes_listadas(mercado, filtro)]
+
+
+def linhas_carteira(mercado, jogador, filtro=""):
+    carteira_itens = list(jogador.carteira.items())
+
+    # ALGORITMO: Índice de n-gramas do Mercado - filtra carteira
+    # (ações deslistadas saíram do índice: para elas o filtro compara o nome direto)
+    if filtro:
+        encontrados = mercado.indice_nomes.buscar(filtro)
+        padrao = filtro.lower()
+        carteira_itens = [(nome, v) for nome, v in carteira_itens
+                          if nome in encontrados or (nome not in mercado and padrao in nome.lower())]
+
+    # Cada ação da carteira com lucro/prejuízo (deslistada: último preço marcado)
+    linhas = []
+    for nome, (qtd, preco_medio) in carteira_itens:
+        preco = jogador.preco_de(mercado, nome)
+        lucro = round((preco - preco_medio) * qtd, 2)
+        valores = (nome, qtd, f"${preco_medio:.2f}", f"${preco:.2f}", f"${lucro:.2f}")
+        linhas.append((nome, valores, ('lucro' if lucro >= 0 else 'prejuizo',)))
+    return linhas
+
+
+def texto_status(mercado, jogador, lucro_total):
+    return f"Dia: {mercado.dia} | Saldo: ${jogador.saldo:.2f} | Lucro Total: ${lucro_total:.2f}"
+
+
+def montar_tela(mercado, jogador, filtro_mercado="", filtro_carteira="", linhas_historico_exibidas=0):
+    """Equivalente sem Tk de App.atualizar_tela: tudo o que seria desenhado."""
+    lucro_total = jogador.get_lucro_nao_realizado(mercado)
+    return {
+        'mercado': linhas_mercado(mercado, jogador.carteira, filtro_mercado),
+        'carteira': linhas_carteira(mercado, jogador, filtro_carteira),
+        'status': texto_status(mercado, jogador, lucro_total),
+        'historico_novo': jogador.historico[linhas_historico_exibidas:],
+        'lucro_total': lucro_total,
+    }
@@ -0,0 +1,68 @@
+# tempo_real.py
+# Avanço automático do mercado numa thread própria, no ritmo configurado.
+# A thread só produz atualizações numa fila; quem desenha (a interface) retira tudo
+# o que acumulou de uma vez e redesenha uma única vez, por mais dias que tenham passado.
+import queue
+import threading
+import time
+
+
+class AvancoAutomatico:
+    def __init__(self, passo, dias_por_segundo=2.0, max_pendentes=1000):
+        self.passo = passo                  # Avança um dia e retorna a atualização a enfileirar
+        self.dias_por_segundo = dias_por_segundo
+        self.fila = queue.Queue(max_pendentes)  # Cheia: a thread espera a interface alcançar
+        self.erro = None                    # Exceção que parou a thread, se houver
+        self.dias = 0                       # Dias avançados desde iniciar()
+        self._parar = threading.Event()
+        self._thread = None
+
+    @property
+    def rodando(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def iniciar(self):
+        if self.rodando:
+            return
+        self._parar.clear()
+        self.erro = None
+        self.dias = 0
+        self._thread = threading.Thread(target=self._laco, daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _laco(self):
+        proximo = time.perf_counter()
+        while not self._parar.is_set():
+            try:
+                atualizacao = self.passo()
+            except Exception as erro:       # Repassa para a interface em vez de morrer em silêncio
+                self.erro = erro
+                return
+            self.dias += 1
+            while not self._parar.is_set():
+                try:
+                    self.fila.put(atualizacao, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            proximo += 1.0 / self.dias_por_segundo
+            espera = proximo - time.perf_counter()
+            if espera > 0:
+                self._parar.wait(espera)
+            else:
+                proximo = time.perf_counter()  # Atrasado: segue do agora, sem rajada para compensar
+
+    def drenar(self):
+        """Retira todas as atualizações pendentes (lista, do dia mais antigo ao mais novo)."""
+        atualizacoes = []
+        while True:
+            try:
+                atualizacoes.append(self.fila.get_nowait())
+            except queue.Empty:
+                return atualizacoes
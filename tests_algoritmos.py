@@ -1,5 +1,5 @@
 # tests_algoritmos.py
-from algorithms import busca_sequencial, busca_binaria, rabin_karp
+from algorithms import busca_sequencial, busca_binaria, faixa_binaria, faixa_prefixo, rabin_karp, aho_corasick, IndiceAproximado
 
 print("== Testes de Algoritmos de Busca ==")
 
@@ -13,8 +13,140 @@ lista_ordenada = sorted([10, 20, 30, 40, 50])
 print("Busca Binária - Procurando 30:")
 print("Índice encontrado:", busca_binaria(lista_ordenada, 30))
 
+# Busca Binária por faixa e por prefixo
+inicio, fim = faixa_binaria(lista_ordenada, 20, 40)
+print("Busca Binária - Entre 20 e 40:", lista_ordenada[inicio:fim])
+nomes_ordenados = sorted(lista + ['BioGen', 'BioTech'])
+inicio, fim = faixa_prefixo(nomes_ordenados, 'Bio')
+print("Busca Binária - Começam com 'Bio':", nomes_ordenados[inicio:fim])
+
+# Busca aproximada (erros de digitação)
+print("Busca Aproximada - Procurando 'Tehcwave' e 'biogne':")
+indice = IndiceAproximado(nomes_ordenados)
+print("Mais próximos:", indice.proximos('Tehcwave', 2), indice.proximos('biogne', 2))
+
 # Rabin-Karp
 texto = "O mercado financeiro está em alta com a TechWave liderando."
 padrao = "TechWave"
 print("Rabin-Karp - Procurando 'TechWave':")
 print("Posição encontrada:", rabin_karp(texto, padrao))
+
+print("Rabin-Karp - Todas as ocorrências de 'a':")
+print("Posições encontradas:", rabin_karp(texto, "a", todas=True))
+
+# Aho-Corasick
+noticias = "TechWave sobe 5%. BankNow cai. TechWave e BioGen anunciam parceria."
+print("Aho-Corasick - Procurando TechWave, BankNow e BioGen:")
+print("Posições encontradas:", aho_corasick(noticias, ['TechWave', 'BankNow', 'BioGen']))
+
+# Compressão de Huffman (ida e volta)
+from compressao import comprimir, descomprimir, huffman_compress, huffman_decompress
+comprimido, codigos = huffman_compress(noticias)
+print("Huffman -", len(noticias.encode('utf-8')), "bytes ->", len(comprimido), "bytes")
+print("Texto recuperado:", huffman_decompress(comprimido))
+
+
+# --- CONFERÊNCIA ---
+# Os mesmos algoritmos comparados com o resultado óbvio (força bruta): uma regressão
+# faz o script parar com AssertionError em vez de só imprimir um valor diferente.
+import random
+
+rng = random.Random(13)
+
+
+def ocorrencias_diretas(texto, padrao):
+    # Todas as posições, inclusive sobrepostas, com str.find
+    posicoes = []
+    i = texto.find(padrao)
+    while i != -1:
+        posicoes.append(i)
+        i = texto.find(padrao, i + 1)
+    return posicoes
+
+
+def distancia_direta(a, b):
+    # Damerau-Levenshtein restrita (transposição de vizinhos), por programação dinâmica
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+def texto_aleatorio(tamanho, alfabeto='abc'):
+    return ''.join(rng.choice(alfabeto) for _ in range(tamanho))
+
+
+# Exemplos acima
+assert busca_sequencial(lista, 'BankNow') == 2 and busca_sequencial(lista, 'Nada') == -1
+assert busca_binaria(lista_ordenada, 30) == 2 and busca_binaria(lista_ordenada, 35) == -1
+assert nomes_ordenados[slice(*faixa_prefixo(nomes_ordenados, 'Bio'))] == ['BioGen', 'BioTech']
+assert [nome for _, nome in indice.proximos('Tehcwave', 1)] == ['TechWave']
+assert rabin_karp(texto, padrao) == texto.find(padrao)
+assert rabin_karp(texto, "a", todas=True) == ocorrencias_diretas(texto, "a")
+assert aho_corasick(noticias, ['TechWave', 'BankNow', 'BioGen']) == {p: ocorrencias_diretas(noticias, p) for p in ['TechWave', 'BankNow', 'BioGen']}
+assert huffman_decompress(comprimido) == noticias
+
+# Buscas em listas aleatórias (com repetidos)
+for _ in range(300):
+    valores = sorted(rng.randint(0, 30) for _ in range(rng.randint(0, 20)))
+    alvo = rng.randint(-1, 31)
+    esperado = valores.index(alvo) if alvo in valores else -1
+    assert busca_sequencial(valores, alvo) == esperado
+    assert busca_binaria(valores, alvo) == esperado, (valores, alvo)
+    minimo, maximo = rng.choice([None, rng.randint(-1, 31)]), rng.choice([None, rng.randint(-1, 31)])
+    inicio, fim = faixa_binaria(valores, minimo, maximo)
+    assert valores[inicio:fim] == [v for v in valores
+                                   if (minimo is None or v >= minimo) and (maximo is None or v <= maximo)], (valores, minimo, maximo)
+
+for _ in range(300):
+    nomes = sorted(texto_aleatorio(rng.randint(0, 5)) for _ in range(rng.randint(0, 20)))
+    prefixo = texto_aleatorio(rng.randint(0, 3))
+    inicio, fim = faixa_prefixo(nomes, prefixo)
+    assert nomes[inicio:fim] == [n for n in nomes if n.startswith(prefixo)], (nomes, prefixo)
+    # Com chave: lista de pares ordenada pelo nome
+    pares = [(n, i) for i, n in enumerate(nomes)]
+    inicio, fim = faixa_prefixo(pares, prefixo, chave=lambda par: par[0])
+    assert [n for n, _ in pares[inicio:fim]] == [n for n in nomes if n.startswith(prefixo)]
+
+# Busca aproximada: distâncias e os k mais próximos
+for _ in range(100):
+    nomes = {texto_aleatorio(rng.randint(1, 6), 'abcd') for _ in range(rng.randint(1, 25))}
+    indice = IndiceAproximado(nomes)
+    consulta = texto_aleatorio(rng.randint(0, 6), 'abcdAB')
+    k = rng.randint(1, 6)
+    max_distancia = rng.choice([None, 0, 1, 2])
+    distancias = sorted(distancia_direta(consulta.lower(), n.lower()) for n in nomes)
+    if max_distancia is not None:
+        distancias = [d for d in distancias if d <= max_distancia]
+    resultado = indice.proximos(consulta, k, max_distancia)
+    assert [d for d, _ in resultado] == distancias[:k], (consulta, sorted(nomes), resultado)
+    for d, nome in resultado:
+        assert d == distancia_direta(consulta.lower(), nome.lower())
+    assert len({nome for _, nome in resultado}) == len(resultado)
+# Depois de remover, o nome não volta mais
+indice = IndiceAproximado(['TechWave', 'TechWay', 'BankNow'])
+indice.remover('TechWave')
+assert [nome for _, nome in indice.proximos('techwave', 5)] == ['TechWay', 'BankNow'] and len(indice) == 2
+
+# Rabin-Karp e Aho-Corasick (ocorrências sobrepostas)
+for _ in range(300):
+    texto_teste = texto_aleatorio(rng.randint(0, 40), 'ab')
+    padroes = list({texto_aleatorio(rng.randint(1, 4), 'ab') for _ in range(rng.randint(1, 5))})
+    for p in padroes:
+        assert rabin_karp(texto_teste, p) == texto_teste.find(p)
+        assert rabin_karp(texto_teste, p, todas=True) == ocorrencias_diretas(texto_teste, p), (texto_teste, p)
+    assert aho_corasick(texto_teste, padroes) == {p: ocorrencias_diretas(texto_teste, p) for p in padroes}, (texto_teste, padroes)
+
+# Huffman: ida e volta com textos, bytes e casos de borda
+for dados in ['', 'a', 'aaaa', 'ação em alta', noticias * 50, bytes(range(256)) * 3,
+              bytes(rng.randrange(256) for _ in range(5000)), texto_aleatorio(3000, 'ab')]:
+    comprimido = comprimir(dados)
+    original = dados.encode('utf-8') if isinstance(dados, str) else dados
+    assert descomprimir(comprimido) == original, dados[:20]
+    if isinstance(dados, str):
+        assert huffman_decompress(huffman_compress(dados)[0]) == dados
+
+print("Conferência contra força bruta: ok")
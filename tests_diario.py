@@ -0,0 +1,126 @@
+# tests_diario.py
+# Verificações do diário de operações (diario.py). Rode com `python tests_diario.py`.
+import os
+import random
+import tempfile
+
+from diario import COMPRA, FORMATO, NOTICIA, VENDA, Diario
+
+
+def testar_reabrir_apos_gravacao_interrompida():
+    pasta = tempfile.mkdtemp()
+    caminho = os.path.join(pasta, 'diario.bin')
+    diario = Diario(caminho)
+    diario.registrar(1, 'TechWave', COMPRA, 3, 10.0)
+    diario.registrar(2, 'BankNow', VENDA, 1, 20.0, 5.0)
+    diario.fechar()
+    # Simula uma queda no meio da gravação: meio registro e meio nome no fim dos arquivos
+    with open(caminho, 'ab') as f:
+        f.write(FORMATO.pack(3, 0, COMPRA, 1, 11.0, 0.0)[:FORMATO.size // 2])
+    with open(caminho + '.nomes', 'ab') as f:
+        f.write('BioG'.encode('utf-8'))
+
+    diario = Diario(caminho)
+    assert len(diario) == 2 and diario.nomes == ['TechWave', 'BankNow']
+    assert os.path.getsize(caminho) == 2 * FORMATO.size
+    diario.registrar(4, 'BioGen', COMPRA, 2, 30.0)
+    diario.registrar(5, 'TechWave', VENDA, 3, 12.0, 6.0)
+    esperado = [(1, 'TechWave', COMPRA, 3, 10.0, 0.0), (2, 'BankNow', VENDA, 1, 20.0, 5.0),
+                (4, 'BioGen', COMPRA, 2, 30.0, 0.0), (5, 'TechWave', VENDA, 3, 12.0, 6.0)]
+    assert [tuple(r) for r in diario] == esperado
+    diario.fechar()
+
+    # Reaberto de novo, os registros acrescentados continuam alinhados
+    diario = Diario(caminho)
+    assert [tuple(r) for r in diario] == esperado
+    assert diario.nomes == ['TechWave', 'BankNow', 'BioGen']
+    assert diario.lucro_realizado == 11.0
+    diario.fechar()
+
+
+def testar_dia_decrescente_nao_grava():
+    for caminho in (None, os.path.join(tempfile.mkdtemp(), 'diario.bin')):
+        diario = Diario(caminho)
+        diario.registrar(5, 'TechWave', COMPRA, 1, 10.0)
+        try:
+            diario.registrar(4, 'NovaAcao', COMPRA, 1, 10.0)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("dia decrescente deveria ser recusado")
+        # Nada do registro recusado fica no arquivo, nos nomes ou no índice
+        assert len(diario) == 1 and diario.nomes == ['TechWave']
+        diario.registrar(6, 'BankNow', VENDA, 1, 20.0)
+        esperado = [(5, 'TechWave', COMPRA, 1, 10.0, 0.0), (6, 'BankNow', VENDA, 1, 20.0, 0.0)]
+        assert [tuple(r) for r in diario] == esperado
+        assert diario.buscar('BankNow')[0] == esperado[1:]
+        diario.fechar()
+        if caminho:
+            assert os.path.getsize(caminho) == 2 * FORMATO.size
+            assert [tuple(r) for r in Diario(caminho)] == esperado
+
+
+def diario_aleatorio(caminho=None, registros=2000, seed=1):
+    rng = random.Random(seed)
+    nomes = ['TechWave', 'techwave', 'BankNow', 'BioGen', 'AgroPlus', 'CloudNet']
+    diario = Diario(caminho)
+    dia = 0
+    for _ in range(registros):
+        dia += rng.random() < 0.3           # Vários registros por dia
+        lado = rng.choice((COMPRA, VENDA, NOTICIA))
+        diario.registrar(dia, rng.choice(nomes), lado, rng.randint(1, 9), round(rng.uniform(1, 100), 2))
+    return diario, nomes, dia
+
+
+def testar_buscar_contra_varredura():
+    rng = random.Random(2)
+    for caminho in (None, os.path.join(tempfile.mkdtemp(), 'diario.bin')):
+        diario, nomes, ultimo_dia = diario_aleatorio(caminho)
+        todos = list(diario)
+        for _ in range(300):
+            acoes = rng.choice([None, rng.choice(nomes), rng.sample(nomes, rng.randint(0, 4)), ['NaoExiste']])
+            lado = rng.choice([None, COMPRA, VENDA, NOTICIA])
+            inicio = rng.choice([None, rng.randint(0, ultimo_dia)])
+            fim = rng.choice([None, rng.randint(0, ultimo_dia)])
+            pagina, por_pagina = rng.randint(0, 5), rng.choice([1, 7, 50])
+            alvo = None if acoes is None else ({acoes} if isinstance(acoes, str) else set(acoes))
+            esperado = [r for r in todos
+                        if (alvo is None or r.acao in alvo) and (lado is None or r.lado == lado)
+                        and (inicio is None or r.dia >= inicio) and (fim is None or r.dia <= fim)]
+            registros, total = diario.buscar(acoes, lado, inicio, fim, pagina, por_pagina)
+            assert total == len(esperado), (acoes, lado, inicio, fim)
+            assert registros == esperado[pagina * por_pagina:(pagina + 1) * por_pagina], (acoes, lado, inicio, fim, pagina)
+        diario.fechar()
+
+
+def testar_ids_por_nome():
+    diario, _, _ = diario_aleatorio()
+    assert sorted(diario.nomes[i] for i in diario.ids_por_nome('TECHWAVE')) == ['TechWave', 'techwave']
+    assert [diario.nomes[i] for i in diario.ids_por_nome('biogen')] == ['BioGen']
+    assert diario.ids_por_nome('NaoExiste') == []
+    # O diário restaurado de um snapshot também responde pelo índice
+    meta, secoes = diario.estado()
+    secoes = {nome: dados[0] if isinstance(dados, tuple) else dados for nome, dados in secoes.items()}
+    restaurado = Diario.restaurar(meta, {nome: memoryview(bytearray(dados)) for nome, dados in secoes.items()})
+    assert restaurado.ids_por_nome('techWAVE') == diario.ids_por_nome('TECHWAVE')
+
+
+def testar_restaurar_diario_vazio():
+    # Diário em arquivo sem registros: o buffer adotado é vazio e precisa crescer
+    for caminho in (None, os.path.join(tempfile.mkdtemp(), 'diario.bin')):
+        diario = Diario(caminho)
+        meta, secoes = diario.estado()
+        secoes = {nome: dados[0] if isinstance(dados, tuple) else dados for nome, dados in secoes.items()}
+        restaurado = Diario.restaurar(meta, {nome: memoryview(bytearray(dados)) for nome, dados in secoes.items()})
+        for dia in range(100):
+            restaurado.registrar(dia, 'TechWave', COMPRA, 1, 10.0 + dia)
+        assert len(restaurado) == 100 and [r.preco for r in restaurado] == [10.0 + dia for dia in range(100)]
+        diario.fechar()
+
+
+if __name__ == "__main__":
+    print("== Testes do Diário ==")
+    for nome, teste in list(globals().items()):
+        if nome.startswith('testar_'):
+            teste()
+            print(f"{nome}: ok")
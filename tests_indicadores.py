@@ -0,0 +1,137 @@
+# tests_indicadores.py
+# Confere o índice de intervalos e os indicadores móveis (indicadores.py) contra o
+# cálculo direto sobre a lista de preços. Rode com `python tests_indicadores.py`.
+import math
+import random
+
+from historico import HistoricoPrecos
+from indicadores import IndiceIntervalos, MediaExponencial, MediaMovel, VolatilidadeMovel
+
+
+def volatilidade_direta(precos):
+    retornos = [b / a - 1.0 for a, b in zip(precos, precos[1:])]
+    if not retornos:
+        return 0.0
+    media = sum(retornos) / len(retornos)
+    return math.sqrt(sum((r - media) ** 2 for r in retornos) / len(retornos))
+
+
+def proximo(a, b, tolerancia=1e-9):
+    return abs(a - b) <= tolerancia * max(1.0, abs(a), abs(b))
+
+
+def precos_aleatorios(rng, n):
+    preco = rng.uniform(10, 100)
+    precos = []
+    for _ in range(n):
+        preco = max(1.0, round(preco * (1 + rng.uniform(-0.2, 0.2)), 2))
+        precos.append(preco)
+    return precos
+
+
+def conferir_faixas(indice, precos, primeiro_dia, rng, consultas=200):
+    # precos: os preços consultáveis, do dia primeiro_dia em diante
+    inicio_indice, fim_indice = indice.faixa()
+    assert (inicio_indice, fim_indice) == (primeiro_dia, primeiro_dia + len(precos)), indice.faixa()
+    for _ in range(consultas):
+        a = rng.randrange(len(precos))
+        b = rng.randint(a + 1, len(precos))
+        trecho = precos[a:b]
+        inicio, fim = primeiro_dia + a, primeiro_dia + b
+        assert indice.minimo(inicio, fim) == min(trecho)
+        assert indice.maximo(inicio, fim) == max(trecho)
+        assert proximo(indice.soma(inicio, fim), sum(trecho))
+        assert proximo(indice.media(inicio, fim), sum(trecho) / len(trecho))
+        assert proximo(indice.volatilidade(inicio, fim), volatilidade_direta(trecho)), (a, b)
+    for inicio, fim in ((primeiro_dia - 1, primeiro_dia + 1), (primeiro_dia, primeiro_dia), (fim_indice - 1, fim_indice + 1)):
+        try:
+            indice.minimo(inicio, fim)
+        except IndexError:
+            pass
+        else:
+            raise AssertionError(f"faixa [{inicio}, {fim}) deveria ser recusada")
+
+
+def testar_indice_contra_calculo_direto():
+    rng = random.Random(1)
+    for max_dias in (None, 1, 7, 64):
+        for n in (1, 2, 15, 300):
+            precos = precos_aleatorios(rng, n)
+            # Acrescentando um a um
+            indice = IndiceIntervalos(max_dias)
+            for preco in precos:
+                indice.adicionar(preco)
+            janela = precos[-max_dias:] if max_dias else precos
+            conferir_faixas(indice, janela, n - len(janela), rng)
+            # Carregado de uma vez e depois acrescentado
+            historico = HistoricoPrecos(max_dias=max_dias)
+            for preco in precos[:n // 2]:
+                historico.append(preco)
+            indice = historico.intervalos()
+            for preco in precos[n // 2:]:
+                historico.append(preco)
+            conferir_faixas(indice, janela, n - len(janela), rng)
+
+
+def testar_volatilidade_sem_variacao():
+    # Retornos iguais: a volatilidade tem de ser ~0 em qualquer trecho, mesmo num
+    # histórico longo e com retornos grandes (o cancelamento de E[x²] - E[x]² falhava aqui)
+    for fator in (1.0, 1.5, 0.6):
+        indice = IndiceIntervalos()
+        preco = 1.0
+        for _ in range(500):
+            indice.adicionar(preco)
+            preco *= fator
+        for inicio, fim in ((0, 500), (490, 500), (250, 260), (5, 7)):
+            assert indice.volatilidade(inicio, fim) < 1e-12, (fator, inicio, fim, indice.volatilidade(inicio, fim))
+        for periodo in (2, 20, 499):
+            volatilidade = VolatilidadeMovel(periodo)
+            preco = 1.0
+            for _ in range(500):
+                volatilidade.adicionar(preco)
+                preco *= fator
+            assert volatilidade.valor < 1e-12, (fator, periodo, volatilidade.valor)
+
+
+def testar_volatilidades_concordam():
+    # Janela móvel e consulta por faixa sobre os mesmos dias dão o mesmo valor
+    rng = random.Random(3)
+    precos = precos_aleatorios(rng, 400)
+    indice = IndiceIntervalos()
+    for periodo in (1, 5, 30):
+        volatilidade = VolatilidadeMovel(periodo)
+        for dia, preco in enumerate(precos):
+            if periodo == 1:
+                indice.adicionar(preco)
+            volatilidade.adicionar(preco)
+            if dia:
+                inicio = max(0, dia - periodo)
+                assert proximo(volatilidade.valor, indice.volatilidade(inicio, dia + 1), 1e-7), (periodo, dia)
+
+
+def testar_indicadores_moveis():
+    rng = random.Random(2)
+    precos = precos_aleatorios(rng, 500)
+    for periodo in (1, 3, 20):
+        media, exponencial, volatilidade = MediaMovel(periodo), MediaExponencial(periodo), VolatilidadeMovel(periodo)
+        esperada = None
+        for i, preco in enumerate(precos):
+            media.adicionar(preco)
+            exponencial.adicionar(preco)
+            volatilidade.adicionar(preco)
+            janela = precos[max(0, i + 1 - periodo):i + 1]
+            esperada = preco if esperada is None else esperada + 2.0 / (periodo + 1) * (preco - esperada)
+            assert proximo(media.valor, sum(janela) / len(janela))
+            assert proximo(exponencial.valor, esperada)
+            if i:
+                assert proximo(volatilidade.valor, volatilidade_direta(precos[max(0, i - periodo):i + 1]), 1e-7)
+            else:
+                assert volatilidade.valor is None
+
+
+if __name__ == "__main__":
+    print("== Testes dos Indicadores ==")
+    for nome, teste in list(globals().items()):
+        if nome.startswith('testar_'):
+            teste()
+            print(f"{nome}: ok")
@@ -0,0 +1,128 @@
+# tests_jogador.py
+# Verifica o valor da carteira mantido por diferenças (Jogador._valor/_custo) contra
+# o cálculo completo, depois de cada compra, venda, movimento de preço e deslistagem,
+# nos dois modos do mercado. Rode com `python tests_jogador.py`.
+import random
+
+from market import Mercado, np
+from player import Jogador
+from telas import linhas_carteira
+
+
+def valor_esperado(jogador, mercado, ultimos_precos):
+    # Cálculo independente: ações deslistadas ficam com o último preço conhecido
+    valor = lucro = 0.0
+    for nome, (quantidade, preco_medio) in jogador.carteira.items():
+        acao = mercado.get_acao_por_nome(nome)
+        preco = acao.preco_atual if acao else ultimos_precos[nome]
+        valor += quantidade * preco
+        lucro += quantidade * (preco - preco_medio)
+    return valor, lucro
+
+
+def conferir(jogador, mercado, ultimos_precos, passo):
+    assert jogador.verificar_consistencia(mercado), passo
+    valor, lucro = valor_esperado(jogador, mercado, ultimos_precos)
+    escala = max(1.0, valor)
+    assert abs(jogador.get_valor_carteira(mercado) - valor) <= 1e-6 * escala, (passo, jogador.get_valor_carteira(mercado), valor)
+    assert abs(jogador.get_lucro_nao_realizado(mercado) - lucro) <= 1e-6 * escala, passo
+    assert abs(jogador.get_patrimonio_total(mercado) - (jogador.saldo + valor)) <= 1e-6 * escala, passo
+    # A tela da carteira lista todas as posições, deslistadas inclusive, com o mesmo preço
+    linhas = linhas_carteira(mercado, jogador)
+    assert sorted(nome for nome, _, _ in linhas) == sorted(jogador.carteira), passo
+    for nome, valores, _ in linhas:
+        acao = mercado.get_acao_por_nome(nome)
+        assert valores[3] == f"${acao.preco_atual if acao else ultimos_precos[nome]:.2f}", (passo, valores)
+    for nome in jogador.carteira:
+        assert nome in [n for n, _, _ in linhas_carteira(mercado, jogador, nome[1:4])], (passo, nome)
+
+
+def testar_carteira_incremental(vetorizado, passos=400, seed=7):
+    rng = random.Random(seed)
+    random.seed(seed)                       # Preços e notícias do modo por objeto
+    mercado = Mercado(vetorizado=vetorizado, num_acoes=30, seed=seed)
+    jogador = Jogador("Teste")
+    jogador.saldo = 50_000.0
+    jogador.acompanhar(mercado)
+    ultimos_precos = {}
+    novas = 0
+    for passo in range(passos):
+        operacao = rng.random()
+        acoes = mercado.acoes
+        if operacao < 0.35:
+            acao = rng.choice(acoes)
+            jogador.comprar_acao(acao, rng.randint(1, 5), mercado.dia)
+        elif operacao < 0.6 and jogador.carteira:
+            nome = rng.choice(sorted(jogador.carteira))
+            acao = mercado.get_acao_por_nome(nome)
+            if acao is not None:
+                jogador.vender_acao(acao, rng.randint(1, jogador.carteira[nome][0]), mercado.dia)
+        elif operacao < 0.8:
+            mercado.avancar_dia()
+        elif operacao < 0.9:
+            mercado.gerar_noticia(chance=1.0)
+        elif operacao < 0.95 and len(acoes) > 5:
+            # Deslista uma ação (de preferência uma em carteira) e lista outra no lugar
+            nome = rng.choice(sorted(jogador.carteira) or [a.nome for a in acoes])
+            acao = mercado.get_acao_por_nome(nome)
+            if acao is not None:
+                ultimos_precos[nome] = acao.preco_atual
+                mercado.remover_acao(nome)
+                mercado.adicionar_acao((f"Nova{novas}", round(rng.uniform(10, 100), 2)))
+                novas += 1
+        else:
+            mercado.avancar_dias(rng.randint(2, 5))
+        conferir(jogador, mercado, ultimos_precos, passo)
+    return jogador
+
+
+def testar_impacto_dos_agentes():
+    from agentes import PopulacaoAgentes
+    mercado = Mercado(vetorizado=True, num_acoes=50, seed=3)
+    jogador = Jogador("Teste")
+    jogador.saldo = 50_000.0
+    for acao in mercado.acoes[:20]:
+        jogador.comprar_acao(acao, 3)
+    jogador.acompanhar(mercado)
+    populacao = PopulacaoAgentes(mercado, 500, seed=3, impacto=0.001)
+    iniciais = mercado.motor.precos.tolist()
+    mercado.avancar_dia()
+    assert populacao._precos_anteriores.tolist() == iniciais   # Cópia, não a visão do motor
+    for passo in range(20):
+        populacao.dia()                     # Impacto nos preços + notícia + avanço
+        conferir(jogador, mercado, {}, passo)
+
+
+def testar_remover_acao_vetorizada():
+    mercado = Mercado(vetorizado=True, num_acoes=5, seed=4)
+    mercado.avancar_dias(3)
+    primeira, ultima = mercado.acoes[0], mercado.acoes[-1]
+    historico_ultima = list(ultima.get_historico())
+    removida = mercado.remover_acao(primeira.nome)
+    # A última ação ocupa a coluna liberada e continua com os próprios preços
+    assert mercado.acoes[0] is ultima and list(ultima.get_historico()) == historico_ultima
+    # A visão deslistada não lê a coluna que agora é de outra ação
+    for leitura in (lambda: removida.preco_atual, lambda: removida.get_historico(), lambda: removida.tendencia):
+        try:
+            leitura()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("a ação deslistada ainda lê o motor")
+    # Removendo a última (sem troca de coluna) também desliga a visão
+    assert mercado.remover_acao(mercado.acoes[-1].nome).indice is None
+
+
+if __name__ == "__main__":
+    print("== Testes da Carteira Incremental ==")
+    testar_carteira_incremental(vetorizado=False)
+    print("modo por objeto: ok")
+    if np is not None:
+        testar_carteira_incremental(vetorizado=True)
+        print("modo vetorizado: ok")
+        testar_impacto_dos_agentes()
+        print("impacto dos agentes: ok")
+        testar_remover_acao_vetorizada()
+        print("deslistagem vetorizada: ok")
+    else:
+        print("modo vetorizado: pulado (NumPy não instalado)")
@@ -0,0 +1,201 @@
+# tests_ordens.py
+# Verificações do livro de ofertas (ordens.py): preço de execução, prioridade
+# preço-tempo, execução parcial, cancelamento e rejeições. Rode com `python tests_ordens.py`.
+from market import Mercado
+from player import Jogador
+
+
+def novo_mercado(preco=50.0):
+    mercado = Mercado(num_acoes=3)
+    for acao in mercado.acoes:
+        acao.preco_atual = preco
+    return mercado
+
+
+def com_acoes(mercado, nome, quantidade, nome_jogador="Vendedor"):
+    jogador = Jogador(nome_jogador)
+    jogador.saldo = 10_000.0
+    assert jogador.comprar_acao(mercado.get_acao_por_nome(nome), quantidade)
+    return jogador
+
+
+def testar_ordem_que_nao_cruza_fica_no_livro():
+    mercado = novo_mercado()
+    jogador = Jogador("A")
+    ordem = mercado.ordens.enviar(jogador, 'TechWave', 'compra', 2, 40.0)
+    assert ordem.ativa and ordem.restante == 2
+    assert mercado.ordens.execucoes == []
+    assert jogador.saldo == 1000.0 and jogador.carteira == {}
+    assert mercado.ordens.ordens_de(jogador) == [ordem]
+    assert len(mercado.ordens.livros['TechWave']) == 1
+
+
+def testar_prioridade_preco_tempo_e_preco_da_oferta():
+    mercado = novo_mercado()
+    a, b = Jogador("A"), Jogador("B")
+    a40 = mercado.ordens.enviar(a, 'TechWave', 'compra', 2, 40.0)
+    b40 = mercado.ordens.enviar(b, 'TechWave', 'compra', 2, 40.0)   # Mesmo preço, chegou depois
+    a45 = mercado.ordens.enviar(a, 'TechWave', 'compra', 1, 45.0)   # Melhor preço
+    vendedor = com_acoes(mercado, 'TechWave', 4)
+    saldo_vendedor = vendedor.saldo
+    mercado.get_acao_por_nome('TechWave').preco_atual = 30.0  # Mercado pior que as ofertas do livro
+    venda = mercado.ordens.enviar(vendedor, 'TechWave', 'venda', 4, 39.0)
+
+    # Melhor preço primeiro; no mesmo preço, a mais antiga; executa ao preço de quem estava no livro
+    execucoes = [(o.id, qtd, preco) for o, qtd, preco, _ in mercado.ordens.execucoes]
+    assert execucoes == [(a45.id, 1, 45.0), (venda.id, 1, 45.0),
+                         (a40.id, 2, 40.0), (venda.id, 2, 40.0),
+                         (b40.id, 1, 40.0), (venda.id, 1, 40.0)], execucoes
+    assert venda.status == 'executada' and venda.restante == 0
+    assert a45.status == a40.status == 'executada'
+    assert vendedor.saldo == saldo_vendedor + 45.0 + 2 * 40.0 + 40.0
+    assert 'TechWave' not in vendedor.carteira
+    assert a.saldo == 1000.0 - 45.0 - 80.0 and a.carteira['TechWave'][0] == 3
+    assert abs(a.carteira['TechWave'][1] - 125.0 / 3) < 1e-9   # Preço médio pelos preços executados
+
+    # Execução parcial: o resto continua no livro
+    assert b40.ativa and b40.restante == 1 and b.carteira['TechWave'] == (1, 40.0)
+    assert mercado.ordens.ordens_de(b) == [b40]
+    assert len(mercado.ordens.livros['TechWave']) == 1
+
+
+def testar_casar_usa_o_preco_do_mercado():
+    mercado = novo_mercado()
+    jogador = Jogador("A")
+    compra = mercado.ordens.enviar(jogador, 'TechWave', 'compra', 3, 40.0)
+    mercado.get_acao_por_nome('TechWave').preco_atual = 38.5
+    execucoes = mercado.ordens.casar(['TechWave'])
+    assert [(o.id, qtd, preco) for o, qtd, preco, _ in execucoes] == [(compra.id, 3, 38.5)]
+    assert compra.status == 'executada' and jogador.saldo == 1000.0 - 3 * 38.5
+    assert 'TechWave' not in mercado.ordens.livros          # Livro vazio sai do motor
+    assert len(mercado.ordens) == 0
+
+    # Ordem que já cruza o preço atual executa inteira na hora, a esse preço
+    venda = mercado.ordens.enviar(jogador, 'TechWave', 'venda', 3, 30.0)
+    assert venda.status == 'executada'
+    assert [(qtd, preco) for _, qtd, preco, _ in mercado.ordens.execucoes] == [(3, 38.5)]
+
+
+def testar_preco_do_mercado_melhor_que_o_livro():
+    # Compra nova com oferta de venda a 45 no livro e mercado a 42: executa a 42
+    mercado = novo_mercado()
+    vendedor = com_acoes(mercado, 'TechWave', 2)
+    mercado.get_acao_por_nome('TechWave').preco_atual = 42.0
+    oferta = mercado.ordens.enviar(vendedor, 'TechWave', 'venda', 2, 45.0)
+    comprador = Jogador("A")
+    compra = mercado.ordens.enviar(comprador, 'TechWave', 'compra', 2, 46.0)
+    assert [(o.id, qtd, preco) for o, qtd, preco, _ in mercado.ordens.execucoes] == [(compra.id, 2, 42.0)]
+    assert compra.status == 'executada' and oferta.ativa and oferta.restante == 2
+    assert comprador.saldo == 1000.0 - 2 * 42.0
+
+    # No mesmo preço, a oferta do livro tem prioridade
+    mercado.get_acao_por_nome('TechWave').preco_atual = 45.0
+    outra = mercado.ordens.enviar(Jogador("B"), 'TechWave', 'compra', 1, 46.0)
+    assert [(o.id, qtd, preco) for o, qtd, preco, _ in mercado.ordens.execucoes] == [(oferta.id, 1, 45.0), (outra.id, 1, 45.0)]
+
+
+def testar_nao_negocia_consigo_mesmo():
+    mercado = novo_mercado()
+    jogador = com_acoes(mercado, 'TechWave', 2, "A")
+    mercado.get_acao_por_nome('TechWave').preco_atual = 20.0
+    propria = mercado.ordens.enviar(jogador, 'TechWave', 'venda', 2, 42.0)
+    outro = com_acoes(mercado, 'TechWave', 1, "B")
+    alheia = mercado.ordens.enviar(outro, 'TechWave', 'venda', 1, 44.0)
+    mercado.get_acao_por_nome('TechWave').preco_atual = 60.0   # Só o livro cruza com a compra
+    # A compra pula a própria venda (melhor preço) e executa com a de B
+    saldo = jogador.saldo
+    compra = mercado.ordens.enviar(jogador, 'TechWave', 'compra', 2, 45.0)
+    assert [(o.id, qtd, preco) for o, qtd, preco, _ in mercado.ordens.execucoes] == [(alheia.id, 1, 44.0), (compra.id, 1, 44.0)]
+    assert propria.ativa and propria.restante == 2 and jogador.saldo == saldo - 44.0
+    assert compra.ativa and compra.restante == 1
+    # A oferta pulada volta ao livro e continua sendo a melhor venda
+    assert mercado.ordens.livros['TechWave'].melhor_venda() is propria
+    terceiro = Jogador("C")
+    mercado.ordens.enviar(terceiro, 'TechWave', 'compra', 1, 50.0)
+    assert mercado.ordens.execucoes[0][:3] == (propria, 1, 42.0)
+
+
+def testar_choque_de_preco_casa_as_ordens():
+    # Impacto dos agentes (Mercado.aplicar_choque) executa na hora o que alcançou
+    mercado = novo_mercado()
+    jogador = Jogador("A")
+    compra = mercado.ordens.enviar(jogador, 'TechWave', 'compra', 2, 45.0)
+    outra = mercado.ordens.enviar(jogador, 'BankNow', 'compra', 1, 45.0)
+    mercado.aplicar_choque([mercado.indice_de('TechWave'), mercado.indice_de('AgroPlus')], [44.0, 30.0])
+    assert [(o.id, qtd, preco) for o, qtd, preco, _ in mercado.ordens.execucoes] == [(compra.id, 2, 44.0)]
+    assert compra.status == 'executada' and outra.ativa and jogador.saldo == 1000.0 - 88.0
+
+
+def testar_cancelamento_nao_altera_saldo_nem_carteira():
+    # As ordens não reservam saldo nem ações: ambos só mudam na execução
+    mercado = novo_mercado()
+    jogador = com_acoes(mercado, 'BankNow', 5, "A")
+    saldo, carteira = jogador.saldo, dict(jogador.carteira)
+    compra = mercado.ordens.enviar(jogador, 'TechWave', 'compra', 3, 30.0)
+    venda = mercado.ordens.enviar(jogador, 'BankNow', 'venda', 5, 80.0)
+    assert jogador.saldo == saldo and jogador.carteira == carteira
+    assert mercado.ordens.cancelar(compra.id)
+    assert not mercado.ordens.cancelar(compra.id)          # Já cancelada
+    assert not mercado.ordens.cancelar(999)
+    assert compra.status == 'cancelada' and 'TechWave' not in mercado.ordens.livros
+    assert jogador.saldo == saldo and jogador.carteira == carteira
+
+    # Cancelada não executa mesmo que o preço a alcance (remoção preguiçosa do heap)
+    mercado.get_acao_por_nome('TechWave').preco_atual = 10.0
+    assert mercado.ordens.casar() == []
+
+    # Deslistar a ação cancela todas as suas ordens
+    outra = mercado.ordens.enviar(Jogador("B"), 'BankNow', 'compra', 2, 20.0)
+    mercado.remover_acao('BankNow')
+    assert venda.status == outra.status == 'cancelada'
+    assert len(mercado.ordens) == 0 and mercado.ordens.livros == {}
+    assert mercado.ordens.cancelar_acao('BankNow') == 0
+    assert jogador.saldo == saldo and jogador.carteira == carteira
+
+
+def testar_rejeicoes():
+    mercado = novo_mercado()
+    jogador = Jogador("A")
+    for lado, quantidade, preco, acao in (('troca', 1, 10.0, 'TechWave'), ('compra', 0, 10.0, 'TechWave'),
+                                          ('compra', 1, 0.0, 'TechWave'), ('compra', 1, 10.0, 'NaoExiste')):
+        try:
+            mercado.ordens.enviar(jogador, acao, lado, quantidade, preco)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"enviar deveria rejeitar {lado} {quantidade} {acao} @ {preco}")
+    assert len(mercado.ordens) == 0
+
+    # Cruza o preço atual sem saldo / sem ações: rejeitada e fora do livro
+    compra = mercado.ordens.enviar(jogador, 'TechWave', 'compra', 100, 60.0)
+    venda = mercado.ordens.enviar(jogador, 'TechWave', 'venda', 1, 10.0)
+    assert compra.status == venda.status == 'rejeitada'
+    assert len(mercado.ordens) == 0 and jogador.saldo == 1000.0 and jogador.carteira == {}
+
+    # Oferta do livro cujo dono ficou sem saldo é rejeitada e a próxima é usada
+    pobre, rico = Jogador("Pobre"), Jogador("Rico")
+    sem_saldo = mercado.ordens.enviar(pobre, 'TechWave', 'compra', 1, 45.0)
+    com_saldo = mercado.ordens.enviar(rico, 'TechWave', 'compra', 1, 44.0)
+    pobre.saldo = 0.0
+    vendedor = com_acoes(mercado, 'TechWave', 1)
+    mercado.get_acao_por_nome('TechWave').preco_atual = 30.0
+    venda = mercado.ordens.enviar(vendedor, 'TechWave', 'venda', 1, 40.0)
+    assert sem_saldo.status == 'rejeitada' and com_saldo.status == 'executada'
+    assert venda.status == 'executada' and mercado.ordens.execucoes[-1][2] == 44.0
+
+    # Ordem nova sem saldo para cruzar com o livro é rejeitada sem mexer na oferta
+    vendedor = com_acoes(mercado, 'AgroPlus', 2)
+    oferta = mercado.ordens.enviar(vendedor, 'AgroPlus', 'venda', 2, 55.0)
+    falido = Jogador("Falido")
+    falido.saldo = 10.0
+    mercado.get_acao_por_nome('AgroPlus').preco_atual = 70.0
+    compra = mercado.ordens.enviar(falido, 'AgroPlus', 'compra', 2, 60.0)
+    assert compra.status == 'rejeitada' and oferta.ativa and oferta.restante == 2
+
+
+if __name__ == "__main__":
+    print("== Testes do Livro de Ofertas ==")
+    for nome, teste in list(globals().items()):
+        if nome.startswith('testar_'):
+            teste()
+            print(f"{nome}: ok")